@@ -13,3 +13,7 @@ python manage.py collectstatic --no-input
 
 # Apply any outstanding database migrations
 python manage.py migrate
+
+
+# Create the table of the shared cache, if missing
+python manage.py createcachetable
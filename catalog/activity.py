@@ -0,0 +1,228 @@
+from collections import Counter, defaultdict
+from functools import reduce
+from operator import or_
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Max, Q, Value, When
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from catalog import counters
+from catalog.models import Newspaper, Redactor, RedactorMonthlyActivity, RedactorTopicActivity
+
+
+RELATIONS = {"publishers": "redactor_id", "topics": "topic_id"}
+
+
+def get_current_month():
+    return timezone.localdate().replace(day=1)
+
+
+def month_of(published_date):
+    # Matches TruncMonth in the current time zone.
+    return timezone.localtime(published_date).date().replace(day=1)
+
+
+def links(relation, newspaper_ids=None, other_ids=None):
+    """(newspaper id, redactor or topic id) pairs of the existing ``relation`` links."""
+    through = getattr(Newspaper, relation).through
+    target = RELATIONS[relation]
+    queryset = through.objects.all()
+    if newspaper_ids is not None:
+        queryset = queryset.filter(newspaper_id__in=newspaper_ids)
+    if other_ids is not None:
+        queryset = queryset.filter(**{f"{target}__in": other_ids})
+    return list(queryset.values_list("newspaper_id", target))
+
+
+def grouped(relation, newspaper_ids):
+    found = defaultdict(list)
+    for newspaper_id, other_id in links(relation, newspaper_ids):
+        found[newspaper_id].append(other_id)
+    return found
+
+
+def adjust(queryset, field, delta):
+    # Never below zero, should the maintained values have drifted.
+    return queryset.update(
+        **{field: Case(When(**{f"{field}__gte": -delta}, then=F(field) + delta), default=Value(0))}
+    )
+
+
+def add_counts(model, key_fields, deltas):
+    """Add each delta to the article_count of its row, creating rows as needed and removing empty ones."""
+    emptied = []
+    for key, delta in deltas.items():
+        if not delta:
+            continue
+        filters = dict(zip(key_fields, key))
+        updated = adjust(model.objects.filter(**filters), "article_count", delta)
+        if delta < 0:
+            emptied.append(Q(**filters))
+        elif not updated:
+            try:
+                with transaction.atomic():
+                    model.objects.create(article_count=delta, **filters)
+            except IntegrityError:
+                adjust(model.objects.filter(**filters), "article_count", delta)
+    if emptied:
+        model.objects.filter(reduce(or_, emptied), article_count=0).delete()
+
+
+def apply(articles=None, months=None, topics=None, latest=None, removed_latest=None):
+    redactor_ids = set()
+    for redactor_id, delta in (articles or {}).items():
+        if delta:
+            adjust(Redactor.all_objects.filter(pk=redactor_id), "article_count", delta)
+            redactor_ids.add(redactor_id)
+    add_counts(RedactorMonthlyActivity, ("redactor_id", "month"), months or {})
+    add_counts(RedactorTopicActivity, ("redactor_id", "topic_id"), topics or {})
+    topic_redactors = {redactor_id for (redactor_id, _), delta in (topics or {}).items() if delta}
+    for redactor_id in topic_redactors:
+        Redactor.all_objects.filter(pk=redactor_id).update(
+            topic_count=RedactorTopicActivity.objects.filter(redactor_id=redactor_id).count()
+        )
+    for redactor_id, published_date in (latest or {}).items():
+        Redactor.all_objects.filter(
+            Q(last_published_at__isnull=True) | Q(last_published_at__lt=published_date), pk=redactor_id
+        ).update(last_published_at=published_date)
+    stale = set()
+    for redactor_id, published_date in (removed_latest or {}).items():
+        if Redactor.all_objects.filter(pk=redactor_id, last_published_at__lte=published_date).exists():
+            stale.add(redactor_id)
+    if stale:
+        # The previous latest newspaper is only known once the links are gone.
+        from catalog.tasks import refresh_redactor_last_published
+
+        for redactor_id in stale:
+            refresh_redactor_last_published.enqueue(redactor_id)
+    if redactor_ids | topic_redactors | set(latest or {}) | stale:
+        counters.bump_generation(Redactor)
+
+
+def apply_publisher_links(pairs, sign):
+    """
+    Count (newspaper id, redactor id) publisher links in (``sign`` 1) or out
+    (-1): the article, its month and each of the newspaper's topics.
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return
+    newspaper_ids = {newspaper_id for newspaper_id, _ in pairs}
+    dates = dict(Newspaper.objects.filter(pk__in=newspaper_ids).values_list("pk", "published_date"))
+    topics = grouped("topics", newspaper_ids)
+    articles, months, topic_counts, newest = Counter(), Counter(), Counter(), {}
+    for newspaper_id, redactor_id in pairs:
+        if newspaper_id not in dates:
+            continue
+        articles[redactor_id] += sign
+        months[redactor_id, month_of(dates[newspaper_id])] += sign
+        for topic_id in topics.get(newspaper_id, ()):
+            topic_counts[redactor_id, topic_id] += sign
+        newest[redactor_id] = max(newest.get(redactor_id, dates[newspaper_id]), dates[newspaper_id])
+    apply(
+        articles,
+        months,
+        topic_counts,
+        latest=newest if sign > 0 else None,
+        removed_latest=newest if sign < 0 else None,
+    )
+
+
+def apply_topic_links(pairs, sign):
+    """Count (newspaper id, topic id) topic links in or out for the newspapers' publishers."""
+    pairs = set(pairs)
+    if not pairs:
+        return
+    publishers = grouped("publishers", {newspaper_id for newspaper_id, _ in pairs})
+    topic_counts = Counter()
+    for newspaper_id, topic_id in pairs:
+        for redactor_id in publishers.get(newspaper_id, ()):
+            topic_counts[redactor_id, topic_id] += sign
+    apply(topics=topic_counts)
+
+
+def apply_links(relation, pairs, sign):
+    if relation == "publishers":
+        apply_publisher_links(pairs, sign)
+    else:
+        apply_topic_links(pairs, sign)
+
+
+def forget(newspaper_ids):
+    """Count out newspapers about to be deleted, while their links still exist."""
+    apply_publisher_links(links("publishers", newspaper_ids), -1)
+
+
+def refresh_last_published(redactor_id):
+    Redactor.all_objects.filter(pk=redactor_id).update(
+        last_published_at=Newspaper.objects.filter(publishers=redactor_id).aggregate(last=Max("published_date"))["last"]
+    )
+
+
+def refresh_redactor_activity(redactor_id):
+    """
+    Recompute the activity columns and monthly and topic rows of one redactor.
+
+    Writes keep them up to date by deltas, see ``apply``; this full
+    recomputation backs ``rebuild``. Only the redactor's own newspapers are
+    read, through the publishers index.
+    """
+    newspapers = Newspaper.objects.filter(publishers=redactor_id)
+    totals = newspapers.aggregate(count=Count("pk"), last=Max("published_date"))
+    months = (
+        newspapers.annotate(month=TruncMonth("published_date"))
+        .values("month")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    topics = list(
+        Newspaper.topics.through.objects.filter(newspaper__publishers=redactor_id)
+        .values("topic_id")
+        .annotate(count=Count("newspaper_id"))
+        .order_by()
+    )
+    with transaction.atomic():
+        Redactor.all_objects.filter(pk=redactor_id).update(
+            article_count=totals["count"],
+            last_published_at=totals["last"],
+            topic_count=len(topics),
+        )
+        counters.bump_generation(Redactor)
+        RedactorMonthlyActivity.objects.filter(redactor_id=redactor_id).delete()
+        RedactorTopicActivity.objects.filter(redactor_id=redactor_id).delete()
+        if Redactor.all_objects.filter(pk=redactor_id).exists():
+            RedactorMonthlyActivity.objects.bulk_create(
+                [
+                    RedactorMonthlyActivity(
+                        redactor_id=redactor_id,
+                        month=row["month"].date(),
+                        article_count=row["count"],
+                    )
+                    for row in months
+                ]
+            )
+            RedactorTopicActivity.objects.bulk_create(
+                [
+                    RedactorTopicActivity(
+                        redactor_id=redactor_id,
+                        topic_id=row["topic_id"],
+                        article_count=row["count"],
+                    )
+                    for row in topics
+                ]
+            )
+
+
+def publisher_ids(newspaper_ids):
+    through = Newspaper.publishers.through
+    return set(
+        through.objects.filter(newspaper_id__in=newspaper_ids)
+        .values_list("redactor_id", flat=True)
+        .distinct()
+    )
+
+
+def rebuild():
+    for redactor_id in Redactor.all_objects.values_list("pk", flat=True).iterator():
+        refresh_redactor_activity(redactor_id)
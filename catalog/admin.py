@@ -1,10 +1,60 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.views.main import ChangeList
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.contrib.auth import get_user_model
 from django.contrib.auth.admin import UserAdmin
+from django.db.models import Prefetch
+from django.template.response import TemplateResponse
 
+from . import archive, bulk, counters, purge
+from .admin_filters import AutocompleteFilter
 from .models import Topic, Redactor, Newspaper
+from .pagination import EstimatedCountPaginator
+from .search import has_full_text_search, search_newspaper_titles
+
+
+class NewspaperActionForm(ActionForm):
+    topic = forms.ModelChoiceField(queryset=Topic.objects.all(), required=False)
+    publisher = forms.ModelChoiceField(queryset=get_user_model().objects.all(), required=False)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        for name, relation in (("topic", "topics"), ("publisher", "publishers")):
+            self.fields[name].widget = AutocompleteSelect(
+                Newspaper._meta.get_field(relation), admin.site
+            )
+            self.fields[name].widget.choices = self.fields[name].choices
+
+
+class NewspaperChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        queryset = super().get_queryset(request, exclude_parameters)
+        # Article bodies are never shown in the list and publishers are
+        # fetched once per page for the publishers column.
+        return queryset.defer("content").prefetch_related(
+            Prefetch("publishers", queryset=Redactor.objects.only("username"))
+        )
+
+
+class SoftDeleteAdminMixin:
+    """Deletes through ``catalog.purge`` instead of the deletion collector."""
+
+    def get_deleted_objects(self, objs, request):
+        # The collector would load every newspaper link of the objects.
+        return [str(obj) for obj in objs], {}, set(), []
+
+    def delete_model(self, request, obj):
+        purge.soft_delete(obj)
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            purge.soft_delete(obj)
+
 
 @admin.register(Redactor)
-class RedactorAdmin(UserAdmin):
+class RedactorAdmin(SoftDeleteAdminMixin, UserAdmin):
     list_display = UserAdmin.list_display + ("years_of_experience",)
     fieldsets = UserAdmin.fieldsets + (
         ("Additional info", {"fields": ("years_of_experience",)}),
@@ -26,13 +76,112 @@ class RedactorAdmin(UserAdmin):
     )
 
 @admin.register(Topic)
-class TopicAdmin(admin.ModelAdmin):
+class TopicAdmin(SoftDeleteAdminMixin, admin.ModelAdmin):
     list_display = ("name",)
     search_fields = ("name",)
 
 @admin.register(Newspaper)
 class NewspaperAdmin(admin.ModelAdmin):
-    list_display = ("title", "published_date")
-    list_filter = ("published_date", "topics", "publishers")
-    search_fields = ("title", "content")
-    filter_horizontal = ("topics", "publishers")
+    list_display = ("title", "publisher_names", "published_date")
+    list_filter = (
+        "published_date",
+        ("topics", AutocompleteFilter),
+        ("publishers", AutocompleteFilter),
+    )
+    search_fields = ("title",)
+    autocomplete_fields = ("topics", "publishers")
+    ordering = ("-published_date",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    action_form = NewspaperActionForm
+    actions = (
+        "delete_newspapers",
+        "add_topic",
+        "remove_topic",
+        "add_publisher",
+        "remove_publisher",
+    )
+
+    @property
+    def media(self):
+        autocomplete = AutocompleteSelect(Newspaper._meta.get_field("topics"), self.admin_site)
+        return super().media + autocomplete.media + forms.Media(js=["js/autocomplete_filter.js"])
+
+    def get_changelist(self, request, **kwargs):
+        return NewspaperChangeList
+
+    def get_object(self, request, object_id, from_field=None):
+        obj = super().get_object(request, object_id, from_field)
+        return obj if obj is None else archive.load(obj)
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return self.paginator(
+            queryset, per_page, orphans, allow_empty_first_page, counter_name=counters.NEWSPAPER_COUNT
+        )
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term or not has_full_text_search(queryset.db):
+            return super().get_search_results(request, queryset, search_term)
+        return search_newspaper_titles(queryset, search_term), False
+
+    @admin.display(description="Publishers")
+    def publisher_names(self, obj):
+        return ", ".join(publisher.username for publisher in obj.publishers.all())
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        # Replaced by delete_newspapers, which does not load every object.
+        actions.pop("delete_selected", None)
+        return actions
+
+    @admin.action(description="Delete selected newspapers", permissions=["delete"])
+    def delete_newspapers(self, request, queryset):
+        if request.POST.get("post"):
+            count = bulk.delete_newspapers(queryset.values_list("pk", flat=True))
+            self.message_user(request, f"Deleted {count} newspapers.", messages.SUCCESS)
+            return None
+        # With "select all" the confirmation posts the changelist filters back
+        # instead of one hidden input per matching newspaper; the admin only
+        # runs actions with at least one selected row, so one is kept.
+        select_across = request.POST.get("select_across") == "1"
+        selected = request.POST.getlist(admin.helpers.ACTION_CHECKBOX_NAME)
+        return TemplateResponse(
+            request,
+            "admin/catalog/newspaper/bulk_delete_confirmation.html",
+            {
+                **self.admin_site.each_context(request),
+                "title": "Are you sure?",
+                "opts": self.model._meta,
+                "count": queryset.count(),
+                "select_across": select_across,
+                "ids": selected[:1] if select_across else list(queryset.values_list("pk", flat=True)),
+                "action_checkbox_name": admin.helpers.ACTION_CHECKBOX_NAME,
+            },
+        )
+
+    @admin.action(description="Add topic to selected newspapers", permissions=["change"])
+    def add_topic(self, request, queryset):
+        self.change_related(request, queryset, "topics", "topic", bulk.add_related, "Added")
+
+    @admin.action(description="Remove topic from selected newspapers", permissions=["change"])
+    def remove_topic(self, request, queryset):
+        self.change_related(request, queryset, "topics", "topic", bulk.remove_related, "Removed")
+
+    @admin.action(description="Add publisher to selected newspapers", permissions=["change"])
+    def add_publisher(self, request, queryset):
+        self.change_related(request, queryset, "publishers", "publisher", bulk.add_related, "Added")
+
+    @admin.action(description="Remove publisher from selected newspapers", permissions=["change"])
+    def remove_publisher(self, request, queryset):
+        self.change_related(request, queryset, "publishers", "publisher", bulk.remove_related, "Removed")
+
+    def change_related(self, request, queryset, relation, field, func, verb):
+        form = self.action_form(request.POST)
+        form.fields["action"].choices = self.get_action_choices(request)
+        if not form.is_valid() or form.cleaned_data[field] is None:
+            self.message_user(request, f"Choose a {field} for this action.", messages.WARNING)
+            return
+        obj = form.cleaned_data[field]
+        count = func(relation, queryset.values_list("pk", flat=True), obj)
+        self.message_user(request, f"{verb} {field} \"{obj}\" on {count} newspapers.", messages.SUCCESS)
@@ -0,0 +1,43 @@
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """
+    Related-field filter rendered as an admin autocomplete box.
+
+    Unlike RelatedFieldListFilter it never lists every related object, only
+    the selected one is fetched to render the widget.
+    """
+
+    template = "admin/catalog/autocomplete_filter.html"
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f"{field_path}__{field.target_field.name}__exact"
+        self.lookup_val = params.get(self.lookup_kwarg)
+        super().__init__(field, request, params, model, model_admin, field_path)
+        value = self.lookup_val[-1] if isinstance(self.lookup_val, list) else self.lookup_val
+        formfield = forms.ModelChoiceField(
+            queryset=field.remote_field.model._default_manager.all(),
+            widget=AutocompleteSelect(field, model_admin.admin_site),
+            required=False,
+        )
+        self.rendered_widget = formfield.widget.render(
+            self.lookup_kwarg,
+            value,
+            attrs={"id": f"id_filter_{field_path}", "data-lookup-kwarg": self.lookup_kwarg},
+        )
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        yield {
+            "selected": self.lookup_val is None,
+            "query_string": changelist.get_query_string(remove=[self.lookup_kwarg]),
+            "display": "All",
+        }
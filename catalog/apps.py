@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class CatalogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "catalog"
+
+    def ready(self):
+        from catalog import metrics, signals  # noqa: F401
+
+        if metrics.is_enabled():
+            # Before any cache connection exists, so all of them are counted.
+            metrics.install()
@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from catalog.models import Newspaper, NewspaperArchive
+
+
+def get_archive_after_days():
+    return getattr(settings, "CATALOG_ARCHIVE_AFTER_DAYS", 365)
+
+
+def get_batch_size():
+    return getattr(settings, "CATALOG_ARCHIVE_BATCH_SIZE", 500)
+
+
+def is_partitioned(using="default"):
+    return connections[using].vendor == "postgresql"
+
+
+def month_of(value):
+    """First instant of the UTC month of ``value``, the partition it belongs to."""
+    value = value.astimezone(dt_timezone.utc)
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def next_month(month):
+    return (month + timedelta(days=32)).replace(day=1)
+
+
+def partition_name(month):
+    return f"{NewspaperArchive._meta.db_table}_p{month:%Y%m}"
+
+
+def ensure_partitions(months, using="default"):
+    """Create the monthly archive partitions that do not exist yet, returning their names."""
+    if not is_partitioned(using):
+        return []
+    table = NewspaperArchive._meta.db_table
+    created = []
+    with connections[using].cursor() as cursor:
+        for month in sorted(set(months)):
+            name = partition_name(month)
+            cursor.execute("SELECT to_regclass(%s)", [name])
+            if cursor.fetchone()[0] is not None:
+                continue
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} "
+                f"FOR VALUES FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+            )
+            created.append(name)
+    return created
+
+
+def archive(cutoff=None, batch_size=None, progress=None):
+    """
+    Move the content of newspapers published before ``cutoff`` to the archive.
+
+    Works oldest first, one transaction per batch. Archived rows keep their
+    title and dates in the newspaper table, so lists and counts are unchanged,
+    but their content column shrinks to a single byte.
+    """
+    if cutoff is None:
+        cutoff = timezone.now() - timedelta(days=get_archive_after_days())
+    batch_size = batch_size or get_batch_size()
+    archived = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Newspaper.objects.select_for_update()
+                .filter(published_date__lt=cutoff, archived_at__isnull=True)
+                .order_by("published_date")
+                .only("content", "published_date")[:batch_size]
+            )
+            if not batch:
+                break
+            ensure_partitions(month_of(newspaper.published_date) for newspaper in batch)
+            NewspaperArchive.objects.bulk_create(
+                [
+                    NewspaperArchive(
+                        newspaper_id=newspaper.pk,
+                        published_date=newspaper.published_date,
+                        content=newspaper.content,
+                    )
+                    for newspaper in batch
+                ]
+            )
+            Newspaper.objects.filter(pk__in=[newspaper.pk for newspaper in batch]).update(
+                content="", archived_at=timezone.now()
+            )
+        archived += len(batch)
+        if progress is not None:
+            progress(archived)
+        if len(batch) < batch_size:
+            break
+    return archived
+
+
+def load(newspaper):
+    """Fill in the content of an archived newspaper; others are left as they are."""
+    if newspaper.archived_at is None:
+        return newspaper
+    # Filtering on the partition key lets PostgreSQL read a single partition.
+    content = (
+        NewspaperArchive.objects.filter(newspaper_id=newspaper.pk, published_date=newspaper.published_date)
+        .values_list("content", flat=True)
+        .first()
+    )
+    newspaper.content = "" if content is None else str(content)
+    newspaper._archive_loaded = True
+    return newspaper
+
+
+def restore(newspaper):
+    """
+    Prepare an archived newspaper to be saved back to the newspaper table.
+
+    Called before the save; ``forget`` drops the archived copy after it.
+    """
+    if not getattr(newspaper, "_archive_loaded", False):
+        raise ValueError(
+            "Load the content of an archived newspaper with catalog.archive.load() before saving it."
+        )
+    newspaper.archived_at = None
+    newspaper._archive_loaded = False
+    newspaper._archive_restored = True
+
+
+def forget(newspaper_ids):
+    NewspaperArchive.objects.filter(newspaper_id__in=newspaper_ids).delete()
@@ -0,0 +1,165 @@
+import random
+import statistics
+import sys
+import time
+
+from django.apps.registry import Apps
+from django.contrib.auth import get_user_model
+from django.db import connection, models, transaction
+from django.db.models import Sum
+from django.db.models.functions import Length
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from catalog import profiling
+from catalog.models import Newspaper, Topic
+from catalog.seed import generate_article
+
+
+def timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+    }
+
+
+def relation_size(model):
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_total_relation_size(%s)", [model._meta.db_table])
+        return cursor.fetchone()[0]
+
+
+def plain_model():
+    """A throwaway newspaper table with content in an ordinary text column, outside the app registry."""
+
+    class Meta:
+        app_label = "catalog"
+        db_table = "catalog_benchmark_plain_newspaper"
+        apps = Apps()
+
+    return type(
+        "PlainNewspaper",
+        (models.Model,),
+        {
+            "__module__": __name__,
+            "Meta": Meta,
+            "title": models.CharField(max_length=255),
+            "content": models.TextField(),
+        },
+    )
+
+
+def bench_storage(newspapers=200, requests=100, paragraphs=20, seed=0):
+    """
+    Stored size of newspaper content and latency of loading it, with content
+    in a text column, uncompressed in the binary column and compressed.
+    """
+    rng = random.Random(seed)
+    articles = [generate_article(rng, paragraphs=paragraphs) for _ in range(newspapers)]
+    logical = sum(len(article.encode("utf-8")) for article in articles)
+    plain = plain_model()
+    with connection.schema_editor() as editor:
+        editor.create_model(plain)
+    results = []
+    try:
+        modes = (
+            ("text", plain, {}),
+            ("uncompressed", Newspaper, {"CATALOG_COMPRESSION_THRESHOLD": sys.maxsize}),
+            ("compressed", Newspaper, {}),
+        )
+        for label, model, overrides in modes:
+            with transaction.atomic(), override_settings(**overrides):
+                size_before = relation_size(model)
+                created = model.objects.bulk_create(
+                    [model(title=f"Benchmark {i}", content=article) for i, article in enumerate(articles)]
+                )
+                pks = [newspaper.pk for newspaper in created]
+                # A text column holds the UTF-8 payload as is; PostgreSQL may still
+                # compress it in TOAST, which only the relation size shows.
+                stored = (
+                    logical
+                    if model is plain
+                    else model.objects.filter(pk__in=pks).aggregate(total=Sum(Length("content")))["total"]
+                )
+                size_after = relation_size(model)
+
+                def load():
+                    model.objects.get(pk=rng.choice(pks)).content
+
+                row = {
+                    "mode": label,
+                    "logical_bytes": logical,
+                    "stored_bytes": stored,
+                    "ratio": round(logical / stored, 2),
+                    "table_bytes": None if size_before is None else size_after - size_before,
+                }
+                row.update(summarize(timed(load, requests)))
+                results.append(row)
+                transaction.set_rollback(True)
+    finally:
+        with connection.schema_editor() as editor:
+            editor.delete_model(plain)
+    return results
+
+
+def bench_templates(newspapers=60, requests=20, top=8, seed=0):
+    """Where template rendering time goes on the main pages, per template, block, include and tag."""
+    rng = random.Random(seed)
+    results = []
+    with transaction.atomic(), override_settings(ALLOWED_HOSTS=["testserver"]):
+        user = get_user_model().objects.create_user(username="benchmark-user", is_staff=True)
+        topics = [Topic.objects.create(name=f"Benchmark topic {i}") for i in range(5)]
+        created = Newspaper.objects.bulk_create(
+            [Newspaper(title=f"Benchmark {i}", content=generate_article(rng)) for i in range(newspapers)]
+        )
+        for newspaper in created:
+            newspaper.topics.set(rng.sample(topics, 2))
+            newspaper.publishers.set([user])
+        client = Client()
+        client.force_login(user)
+        pages = {
+            "index": reverse("catalog:index"),
+            "newspaper-list": reverse("catalog:newspaper-list"),
+            "newspaper-detail": reverse("catalog:newspaper-detail", args=[created[0].pk]),
+            "redactor-list": reverse("catalog:redactor-list"),
+            "newspaper-create": reverse("catalog:newspaper-create"),
+        }
+        for page, url in pages.items():
+
+            def render():
+                response = client.get(url)
+                if response.status_code != 200:
+                    raise RuntimeError(f"{url} answered {response.status_code}.")
+
+            with profiling.collect() as profile:
+                timings = timed(render, requests)
+            for entry in profile.as_list(top):
+                results.append(
+                    {
+                        "page": page,
+                        "name": entry["name"].replace(" ", ":", 1),
+                        "ms_per_request": round(entry["ms"] / requests, 3),
+                        "calls_per_request": entry["calls"] // requests,
+                    }
+                )
+            results.append({"page": page, "name": "total", **summarize(timings)})
+        transaction.set_rollback(True)
+    return results
+
+
+SCENARIOS = {
+    "storage": bench_storage,
+    "templates": bench_templates,
+}
@@ -0,0 +1,130 @@
+from django.conf import settings
+from django.db import connection, transaction
+
+from catalog import activity, archive, duplicates, related, rollups
+from catalog.models import Newspaper, NewspaperRevision
+from catalog.signals import newspapers_bulk_changed
+
+
+RELATIONS = ("topics", "publishers")
+
+
+def get_batch_size():
+    return getattr(settings, "CATALOG_BULK_BATCH_SIZE", 1000)
+
+
+def batched(ids, size):
+    ids = sorted(set(ids))
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def get_through(relation):
+    if relation not in RELATIONS:
+        raise ValueError(f"Unknown relation {relation!r}.")
+    field = Newspaper._meta.get_field(relation)
+    through = field.remote_field.through
+    return through, field.m2m_field_name() + "_id", field.m2m_reverse_field_name() + "_id"
+
+
+def linked_ids(relation, newspaper_ids):
+    through, source, target = get_through(relation)
+    return set(
+        through.objects.filter(**{f"{source}__in": newspaper_ids})
+        .values_list(target, flat=True)
+        .distinct()
+    )
+
+
+def delete_rows(model, pks):
+    # A plain DELETE: QuerySet.delete() would load every row through the
+    # deletion collector and send per-object signals, which the batch's
+    # newspapers_bulk_changed signal replaces. Dependent rows are gone already.
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    placeholders = ", ".join(["%s"] * len(pks))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders})", pks)
+        return cursor.rowcount
+
+
+def delete_newspapers(newspaper_ids, batch_size=None):
+    """
+    Delete newspapers with one DELETE per table and batch.
+
+    Bypasses the deletion collector, so no objects are loaded and no
+    per-object signals are sent; receivers of ``newspapers_bulk_changed``
+    get the affected ids inside each batch's transaction instead.
+    """
+    deleted = 0
+    for batch in batched(newspaper_ids, batch_size or get_batch_size()):
+        with transaction.atomic():
+            topic_ids = linked_ids("topics", batch)
+            redactor_ids = linked_ids("publishers", batch)
+            days = rollups.days_of(batch)
+            activity.forget(batch)
+            for relation in RELATIONS:
+                through, source, target = get_through(relation)
+                through.objects.filter(**{f"{source}__in": batch}).delete()
+            NewspaperRevision.objects.filter(newspaper_id__in=batch).delete()
+            related.forget(batch)
+            archive.forget(batch)
+            duplicates.forget(batch)
+            count = delete_rows(Newspaper, batch)
+            deleted += count
+            newspapers_bulk_changed.send(
+                sender=Newspaper,
+                action="delete",
+                newspaper_ids=batch,
+                topic_ids=topic_ids,
+                redactor_ids=redactor_ids,
+                count=count,
+                days=days,
+            )
+    return deleted
+
+
+def add_related(relation, newspaper_ids, obj, batch_size=None):
+    """Link ``obj`` to every given newspaper that is not linked yet, returning the new link count."""
+    through, source, target = get_through(relation)
+    added = 0
+    for batch in batched(newspaper_ids, batch_size or get_batch_size()):
+        with transaction.atomic():
+            missing = list(
+                Newspaper.objects.filter(pk__in=batch)
+                .exclude(**{relation: obj})
+                .values_list("pk", flat=True)
+            )
+            through.objects.bulk_create(
+                [through(**{source: pk, target: obj.pk}) for pk in missing],
+                ignore_conflicts=True,
+            )
+            added += len(missing)
+            send_link_change(relation, "add", missing, obj)
+    return added
+
+
+def remove_related(relation, newspaper_ids, obj, batch_size=None):
+    through, source, target = get_through(relation)
+    removed = 0
+    for batch in batched(newspaper_ids, batch_size or get_batch_size()):
+        with transaction.atomic():
+            links = through.objects.filter(**{f"{source}__in": batch, target: obj.pk})
+            affected = list(links.values_list(source, flat=True))
+            count, _ = links.delete()
+            removed += count
+            send_link_change(relation, "remove", affected, obj)
+    return removed
+
+
+def send_link_change(relation, action, newspaper_ids, obj):
+    if not newspaper_ids:
+        return
+    newspapers_bulk_changed.send(
+        sender=Newspaper,
+        action=f"{action}_{relation}",
+        newspaper_ids=newspaper_ids,
+        topic_ids={obj.pk} if relation == "topics" else set(),
+        redactor_ids={obj.pk} if relation == "publishers" else set(),
+        count=len(newspaper_ids),
+    )
@@ -0,0 +1,66 @@
+import hashlib
+
+from django.contrib import messages
+from django.views.decorators.http import condition
+
+from catalog import counters
+
+
+def make_etag(*parts):
+    return 'W/"%s"' % hashlib.md5(repr(parts).encode("utf-8")).hexdigest()
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET with 304 Not Modified before any rendering when the client copy is current.
+
+    Subclasses provide ``get_last_modified`` and/or ``get_etag``; both get the
+    request and URL arguments and must be cheap, they run on every request.
+    ``get_etag`` runs second and can use ``self.last_modified``. Requests
+    with pending messages always get the page, which shows them.
+    """
+
+    last_modified = None
+
+    def get_etag(self, request, *args, **kwargs):
+        return None
+
+    def get_last_modified(self, request, *args, **kwargs):
+        return None
+
+    def get(self, request, *args, **kwargs):
+        # Counting loads the messages without marking them as shown.
+        if len(messages.get_messages(request)):
+            return super().get(request, *args, **kwargs)
+        self.last_modified = self.get_last_modified(request, *args, **kwargs)
+        etag = self.get_etag(request, *args, **kwargs)
+        view = condition(
+            etag_func=lambda *args, **kwargs: etag,
+            last_modified_func=lambda *args, **kwargs: self.last_modified,
+        )(super().get)
+        return view(request, *args, **kwargs)
+
+
+class RowETagMixin(ConditionalGetMixin):
+    """Weak ETag for detail pages from their last modification, the user and their CSRF token."""
+
+    def get_etag(self, request, *args, **kwargs):
+        if self.last_modified is None:
+            return None
+        # The sidebar's logout form carries the CSRF token.
+        return make_etag(self.last_modified, request.user.pk, request.META.get("CSRF_COOKIE"))
+
+
+class GenerationETagMixin(ConditionalGetMixin):
+    """Weak ETag for list pages from the generation counters of ``etag_models``."""
+
+    etag_models = ()
+
+    def get_etag(self, request, *args, **kwargs):
+        generations = counters.get_values(
+            [counters.generation_name(model) for model in self.etag_models]
+        )
+        # The page shows the user and carries their CSRF token.
+        return make_etag(
+            generations, request.GET.urlencode(), request.user.pk, request.META.get("CSRF_COOKIE")
+        )
@@ -0,0 +1,39 @@
+from django.db.models import F
+
+from catalog.models import Counter, Newspaper, Redactor, Topic
+
+
+NEWSPAPER_COUNT = "catalog.newspaper.count"
+
+
+def generation_name(model):
+    """Counter bumped on every change to rows of ``model``, used for list ETags."""
+    return f"{model._meta.label_lower}.generation"
+
+
+def increment(name, delta=1):
+    """Add ``delta`` to a counter in the current transaction, if the counter exists."""
+    return Counter.objects.filter(name=name).update(value=F("value") + delta)
+
+
+def get_value(name):
+    return Counter.objects.filter(name=name).values_list("value", flat=True).first()
+
+
+def get_values(names):
+    values = dict(Counter.objects.filter(name__in=names).values_list("name", "value"))
+    return [values.get(name, 0) for name in names]
+
+
+def bump_generation(model):
+    increment(generation_name(model))
+
+
+def set_value(name, value):
+    Counter.objects.update_or_create(name=name, defaults={"value": value})
+
+
+def rebuild():
+    set_value(NEWSPAPER_COUNT, Newspaper.objects.count())
+    for model in (Newspaper, Topic, Redactor):
+        Counter.objects.get_or_create(name=generation_name(model))
@@ -0,0 +1,155 @@
+import hashlib
+import re
+import zlib
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from catalog.models import Newspaper, NewspaperArchive, NewspaperBand, NewspaperSignature
+
+
+# Changing any of these invalidates every stored signature; run
+# build_signatures afterwards.
+SHINGLE_SIZE = 3
+PERMUTATIONS = 128
+BANDS = 16
+ROWS = PERMUTATIONS // BANDS
+
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64((1 << 32) - 1)
+# Fixed seed, so every process computes the same signatures.
+_generator = np.random.default_rng(20240611)
+A = _generator.integers(1, int(MERSENNE_PRIME), PERMUTATIONS, dtype=np.uint64)
+B = _generator.integers(0, int(MERSENNE_PRIME), PERMUTATIONS, dtype=np.uint64)
+
+WORD = re.compile(r"\w+")
+
+
+def get_threshold():
+    return getattr(settings, "CATALOG_DUPLICATE_THRESHOLD", 0.8)
+
+
+def get_batch_size():
+    return getattr(settings, "CATALOG_DUPLICATE_BATCH_SIZE", 500)
+
+
+def shingle_hashes(text):
+    words = WORD.findall(text.lower())
+    if not words:
+        shingles = set()
+    elif len(words) <= SHINGLE_SIZE:
+        shingles = {" ".join(words)}
+    else:
+        shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64)
+
+
+def signature(text):
+    """MinHash signature of the word shingles of ``text``, or None for empty text."""
+    hashes = shingle_hashes(text)
+    if not len(hashes):
+        return None
+    # Products wrap around 2**64, as in the usual 32-bit MinHash implementations.
+    permuted = (np.outer(hashes, A) + B) % MERSENNE_PRIME & MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def band_hashes(values):
+    rows = values.reshape(BANDS, ROWS)
+    return [
+        int.from_bytes(hashlib.blake2b(row.tobytes(), digest_size=8).digest(), "big", signed=True)
+        for row in rows
+    ]
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return float(np.mean(first == second))
+
+
+def find_duplicates(text, exclude=None, threshold=None, limit=5):
+    """
+    Newspapers whose content is a near-duplicate of ``text``, most similar first.
+
+    Candidates share at least one LSH band with ``text``, found through the
+    (band, hash) index; only their signatures are compared.
+    """
+    threshold = get_threshold() if threshold is None else threshold
+    values = signature(text)
+    if values is None:
+        return []
+    lookup = Q()
+    for band, value in enumerate(band_hashes(values)):
+        lookup |= Q(band=band, hash=value)
+    candidates = NewspaperBand.objects.filter(lookup)
+    if exclude is not None:
+        candidates = candidates.exclude(newspaper_id=exclude)
+    scores = {
+        newspaper_id: similarity(values, np.frombuffer(bytes(stored), dtype=np.uint32))
+        for newspaper_id, stored in NewspaperSignature.objects.filter(
+            newspaper_id__in=candidates.values("newspaper_id")
+        ).values_list("newspaper_id", "signature")
+    }
+    matches = sorted(
+        ((score, newspaper_id) for newspaper_id, score in scores.items() if score >= threshold),
+        reverse=True,
+    )[:limit]
+    newspapers = Newspaper.objects.only("title").in_bulk([newspaper_id for _, newspaper_id in matches])
+    return [(newspapers[newspaper_id], score) for score, newspaper_id in matches if newspaper_id in newspapers]
+
+
+def write_signatures(contents):
+    """Replace the signatures and bands of ``{newspaper_id: content}``."""
+    signatures, bands = [], []
+    for newspaper_id, content in contents.items():
+        values = signature(content)
+        if values is None:
+            continue
+        signatures.append(NewspaperSignature(newspaper_id=newspaper_id, signature=values.tobytes()))
+        bands.extend(
+            NewspaperBand(newspaper_id=newspaper_id, band=band, hash=value)
+            for band, value in enumerate(band_hashes(values))
+        )
+    with transaction.atomic():
+        forget(list(contents))
+        NewspaperSignature.objects.bulk_create(signatures)
+        NewspaperBand.objects.bulk_create(bands)
+    return len(signatures)
+
+
+def refresh_many(newspaper_ids):
+    """Recompute the signatures of the given newspapers, archived ones included."""
+    newspapers = Newspaper.objects.filter(pk__in=newspaper_ids).only("content", "archived_at")
+    contents = {newspaper.pk: newspaper.content for newspaper in newspapers}
+    archived = [newspaper.pk for newspaper in newspapers if newspaper.archived_at is not None]
+    for newspaper_id, content in NewspaperArchive.objects.filter(newspaper_id__in=archived).values_list(
+        "newspaper_id", "content"
+    ):
+        contents[newspaper_id] = str(content)
+    return write_signatures(contents)
+
+
+def forget(newspaper_ids):
+    NewspaperBand.objects.filter(newspaper_id__in=newspaper_ids).delete()
+    NewspaperSignature.objects.filter(newspaper_id__in=newspaper_ids).delete()
+
+
+def batches(missing=False, batch_size=None):
+    """Newspaper ids to (re)compute, in batches of ``batch_size``."""
+    batch_size = batch_size or get_batch_size()
+    ids = Newspaper.objects.order_by("pk")
+    if missing:
+        ids = ids.exclude(pk__in=NewspaperSignature.objects.values("newspaper_id"))
+    ids = list(ids.values_list("pk", flat=True))
+    return [ids[start:start + batch_size] for start in range(0, len(ids), batch_size)]
+
+
+def rebuild(progress=None):
+    total = 0
+    for batch in batches():
+        total += refresh_many(batch)
+        if progress is not None:
+            progress(total)
+    return total
@@ -0,0 +1,246 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.template.loader import render_to_string
+
+from catalog.models import Newspaper
+
+
+logger = logging.getLogger(__name__)
+
+_bus = None
+_bus_lock = threading.Lock()
+
+
+def get_heartbeat():
+    return getattr(settings, "CATALOG_EVENTS_HEARTBEAT", 15)
+
+
+def get_history_size():
+    return getattr(settings, "CATALOG_EVENTS_HISTORY", 200)
+
+
+def get_queue_size():
+    return getattr(settings, "CATALOG_EVENTS_QUEUE_SIZE", 100)
+
+
+class Subscription:
+    """Events for one client, handed from any thread to the client's event loop."""
+
+    def __init__(self, loop, maxsize):
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize)
+
+    def deliver(self, event):
+        self.loop.call_soon_threadsafe(self.put, event)
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A client this far behind is cut off; it reconnects with
+            # Last-Event-ID and catches up from the history.
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+
+class LocalBackend:
+    """Delivers events to the subscribers of the publishing process only."""
+
+    def __init__(self, bus):
+        self.bus = bus
+
+    def is_listening(self):
+        return self.bus.has_subscribers()
+
+    def set_listening(self, listening):
+        pass
+
+    def send(self, event):
+        self.bus.dispatch(event)
+
+
+class SocketBackend:
+    """
+    Fans events out to every process through unix datagram sockets.
+
+    Each process binds one socket in ``directory`` and, while it has
+    subscribers, keeps a ``.listening`` marker next to it. Events are sent
+    to the sockets of all marked processes, its own included, and are not
+    built at all when there are none; sockets and markers of processes
+    that are gone are removed on the first failed send.
+    """
+
+    def __init__(self, bus, directory, name=None):
+        self.bus = bus
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self.path = os.path.join(directory, f"{name}.sock")
+        self.marker = os.path.join(directory, f"{name}.listening")
+        for path in (self.path, self.marker):
+            if os.path.exists(path):
+                os.unlink(path)
+        self.receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.receiver.bind(self.path)
+        self.sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        threading.Thread(target=self.receive, name="catalog-events", daemon=True).start()
+
+    def listeners(self):
+        return [name[:-len(".listening")] for name in os.listdir(self.directory) if name.endswith(".listening")]
+
+    def is_listening(self):
+        return bool(self.listeners())
+
+    def set_listening(self, listening):
+        if listening:
+            open(self.marker, "w").close()
+        else:
+            try:
+                os.unlink(self.marker)
+            except FileNotFoundError:
+                pass
+
+    def send(self, event):
+        data = json.dumps(event, separators=(",", ":")).encode("utf-8")
+        for name in self.listeners():
+            path = os.path.join(self.directory, f"{name}.sock")
+            try:
+                self.sender.sendto(data, path)
+            except (ConnectionRefusedError, FileNotFoundError):
+                for stale in (path, os.path.join(self.directory, f"{name}.listening")):
+                    try:
+                        os.unlink(stale)
+                    except FileNotFoundError:
+                        pass
+            except OSError:
+                logger.exception("Could not send catalog event to %s.", path)
+
+    def receive(self):
+        while True:
+            data = self.receiver.recv(1 << 20)
+            try:
+                self.bus.dispatch(json.loads(data))
+            except Exception:
+                logger.exception("Could not dispatch catalog event.")
+
+
+class EventBus:
+    """In-process pub/sub of catalog changes with a short replayable history."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscribers = set()
+        self.history = deque(maxlen=get_history_size())
+        self.last_id = 0
+        self.backend = None
+
+    def has_subscribers(self):
+        return bool(self.subscribers)
+
+    def next_id(self):
+        # Time based, so ids from different processes still sort in order.
+        with self.lock:
+            self.last_id = max(self.last_id + 1, time.time_ns() // 1000)
+            return self.last_id
+
+    def publish(self, model, action, render=None, **data):
+        """Send an event; ``render`` builds extra payload only when someone can receive it."""
+        if not self.backend.is_listening():
+            return None
+        event = {"id": self.next_id(), "model": model, "action": action, **data}
+        if render is not None:
+            event.update(render())
+        self.backend.send(event)
+        return event
+
+    def dispatch(self, event):
+        with self.lock:
+            self.history.append(event)
+            subscribers = list(self.subscribers)
+        for subscription in subscribers:
+            subscription.deliver(event)
+
+    def subscribe(self, last_id=None):
+        """Register the calling event loop, returning the subscription and the events missed since ``last_id``."""
+        subscription = Subscription(asyncio.get_running_loop(), get_queue_size())
+        with self.lock:
+            self.subscribers.add(subscription)
+            if len(self.subscribers) == 1:
+                self.backend.set_listening(True)
+            missed = [] if last_id is None else [event for event in self.history if event["id"] > last_id]
+        return subscription, missed
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            if subscription in self.subscribers:
+                self.subscribers.discard(subscription)
+                if not self.subscribers:
+                    self.backend.set_listening(False)
+
+
+def get_bus():
+    global _bus
+    with _bus_lock:
+        # Forked workers get a bus (and socket) of their own.
+        if _bus is None or _bus.pid != os.getpid():
+            _bus = EventBus()
+            _bus.pid = os.getpid()
+            if getattr(settings, "CATALOG_EVENTS_BACKEND", "local") == "socket":
+                _bus.backend = SocketBackend(_bus, settings.CATALOG_EVENTS_SOCKET_DIR)
+            else:
+                _bus.backend = LocalBackend(_bus)
+        return _bus
+
+
+def publish(model, action, render=None, **data):
+    return get_bus().publish(model, action, render, **data)
+
+
+def render_newspaper_card(newspaper_id):
+    newspaper = (
+        Newspaper.objects.filter(pk=newspaper_id).prefetch_related("topics", "publishers").first()
+    )
+    if newspaper is None:
+        return {}
+    return {"html": render_to_string("includes/newspaper_card.html", {"newspaper": newspaper})}
+
+
+def format_event(event):
+    data = json.dumps(event, separators=(",", ":"))
+    return f"id: {event['id']}\nevent: {event['model']}\ndata: {data}\n\n"
+
+
+def can_stream(request):
+    # Under WSGI a StreamingHttpResponse consumes an async iterator into a
+    # list first, so the never-ending stream would hold its thread forever.
+    return isinstance(request, ASGIRequest)
+
+
+async def stream(last_id=None):
+    """Server-sent events of catalog changes, with comment lines as heartbeats while idle."""
+    bus = get_bus()
+    subscription, missed = bus.subscribe(last_id)
+    try:
+        yield "retry: 5000\n\n"
+        for event in missed:
+            yield format_event(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), get_heartbeat())
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                break
+            yield format_event(event)
+    finally:
+        bus.unsubscribe(subscription)
@@ -0,0 +1,214 @@
+import hashlib
+import uuid
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import parse_http_date_safe
+from django.utils.text import Truncator
+
+from catalog import archive, singleflight
+from catalog.models import Newspaper, Redactor, Topic
+
+
+def get_item_count():
+    return getattr(settings, "CATALOG_FEED_ITEMS", 30)
+
+
+def get_cache_timeout():
+    return getattr(settings, "CATALOG_FEED_CACHE_TIMEOUT", 60 * 60 * 24)
+
+
+def is_public():
+    return getattr(settings, "CATALOG_FEEDS_PUBLIC", False)
+
+
+def scope_key(scope, pk=None):
+    return f"catalog.feed.{scope}" if pk is None else f"catalog.feed.{scope}.{pk}"
+
+
+def invalidate(newspaper_ids=(), topic_ids=(), redactor_ids=()):
+    """
+    Drop the cached feeds that list any of the given newspapers, topics or redactors.
+
+    The global feed is always dropped. Cached renderings are found through
+    a per-scope version, so every host and feed format goes at once.
+    """
+    topic_ids, redactor_ids = set(topic_ids), set(redactor_ids)
+    if newspaper_ids:
+        topic_ids.update(
+            Newspaper.topics.through.objects.filter(newspaper_id__in=newspaper_ids).values_list("topic_id", flat=True)
+        )
+        redactor_ids.update(
+            Newspaper.publishers.through.objects.filter(newspaper_id__in=newspaper_ids).values_list(
+                "redactor_id", flat=True
+            )
+        )
+    scopes = [scope_key("newspapers")]
+    scopes += [scope_key("topic", pk) for pk in topic_ids]
+    scopes += [scope_key("redactor", pk) for pk in redactor_ids]
+    cache.delete_many(scopes)
+
+
+def get_version(scope):
+    version = cache.get(scope)
+    if version is None:
+        # A fresh version also orphans renderings left from before an eviction.
+        version = uuid.uuid4().hex[:12]
+        if not cache.add(scope, version, None):
+            version = cache.get(scope, version)
+    return version
+
+
+class CachedFeed(Feed):
+    """
+    Feed whose rendered XML is kept in the cache until ``invalidate`` drops it.
+
+    Cache hits and conditional GETs (ETag and Last-Modified) are answered
+    without touching the database. Like every other catalog page they need
+    a signed-in user, unless CATALOG_FEEDS_PUBLIC is set.
+    """
+
+    scope = None
+
+    def get_scope(self, **kwargs):
+        return scope_key(self.scope, kwargs.get("pk"))
+
+    def __call__(self, request, *args, **kwargs):
+        if not is_public() and not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        scope = self.get_scope(**kwargs)
+        key = f"{scope}.{type(self).__name__}.{request.scheme}.{request.get_host()}"
+        # One worker renders a dropped feed while the others serve the
+        # previous rendering.
+        cached = singleflight.get_or_compute(
+            "feed",
+            key,
+            partial(self.render_feed, request, *args, **kwargs),
+            get_cache_timeout(),
+            version=get_version(scope),
+        )
+        response = HttpResponse(cached["content"], content_type=cached["content_type"])
+        response.headers["ETag"] = cached["etag"]
+        if cached["last_modified"]:
+            response.headers["Last-Modified"] = cached["last_modified"]
+        return get_conditional_response(
+            request,
+            etag=cached["etag"],
+            last_modified=parse_http_date_safe(cached["last_modified"] or ""),
+            response=response,
+        )
+
+    def render_feed(self, request, *args, **kwargs):
+        response = super().__call__(request, *args, **kwargs)
+        return {
+            "content": response.content,
+            "content_type": response["Content-Type"],
+            "etag": '"%s"' % hashlib.md5(response.content).hexdigest(),
+            "last_modified": response.get("Last-Modified"),
+        }
+
+    def get_queryset(self, obj):
+        return Newspaper.objects.all()
+
+    def items(self, obj):
+        # Newest first through the published_date index; no OFFSET, just the head.
+        return list(
+            self.get_queryset(obj)
+            .order_by("-published_date", "-pk")
+            .prefetch_related("topics", "publishers")[:get_item_count()]
+        )
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return Truncator(archive.load(item).content).words(60)
+
+    def item_link(self, item):
+        return reverse("catalog:newspaper-detail", args=[item.pk])
+
+    def item_pubdate(self, item):
+        return item.published_date
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return ", ".join(publisher.username for publisher in item.publishers.all())
+
+    def item_categories(self, item):
+        return [topic.name for topic in item.topics.all()]
+
+
+class NewspaperFeed(CachedFeed):
+    scope = "newspapers"
+    title = "Editorial: latest newspapers"
+    description = "Newspapers most recently published in the editorial tracker."
+
+    def link(self):
+        return reverse("catalog:newspaper-list")
+
+
+class TopicFeed(CachedFeed):
+    scope = "topic"
+
+    def get_object(self, request, pk):
+        return get_object_or_404(Topic, pk=pk)
+
+    def title(self, obj):
+        return f"Editorial: {obj.name}"
+
+    def description(self, obj):
+        return f"Newspapers most recently published on {obj.name}."
+
+    def link(self, obj):
+        return reverse("catalog:newspaper-list")
+
+    def get_queryset(self, obj):
+        return obj.newspapers.all()
+
+
+class RedactorFeed(CachedFeed):
+    scope = "redactor"
+
+    def get_object(self, request, pk):
+        return get_object_or_404(Redactor, pk=pk)
+
+    def title(self, obj):
+        return f"Editorial: newspapers by {obj.username}"
+
+    def description(self, obj):
+        return f"Newspapers most recently published by {obj.username}."
+
+    def link(self, obj):
+        return reverse("catalog:redactor-detail", args=[obj.pk])
+
+    def get_queryset(self, obj):
+        return obj.newspapers.all()
+
+
+class NewspaperAtomFeed(NewspaperFeed):
+    feed_type = Atom1Feed
+    subtitle = NewspaperFeed.description
+
+
+class TopicAtomFeed(TopicFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+class RedactorAtomFeed(RedactorFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
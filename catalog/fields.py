@@ -0,0 +1,138 @@
+import zlib
+
+from django.conf import settings
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+
+
+def pack_text(text, threshold=None, codec=None, level=None):
+    """Encode ``text`` as a codec byte followed by the (maybe compressed) UTF-8 payload."""
+    if threshold is None:
+        threshold = getattr(settings, "CATALOG_COMPRESSION_THRESHOLD", 512)
+    if codec is None:
+        codec = getattr(settings, "CATALOG_COMPRESSION_CODEC", "zstd")
+    data = text.encode("utf-8")
+    if len(data) < threshold:
+        return bytes([CODEC_RAW]) + data
+    if codec == "zstd" and zstandard is not None:
+        compressor = zstandard.ZstdCompressor() if level is None else zstandard.ZstdCompressor(level=level)
+        code, payload = CODEC_ZSTD, compressor.compress(data)
+    else:
+        code, payload = CODEC_ZLIB, zlib.compress(data, -1 if level is None else min(level, 9))
+    if len(payload) >= len(data):
+        return bytes([CODEC_RAW]) + data
+    return bytes([code]) + payload
+
+
+def unpack_text(data):
+    data = bytes(data)
+    if not data:
+        return ""
+    code, payload = data[0], data[1:]
+    if code == CODEC_RAW:
+        return payload.decode("utf-8")
+    if code == CODEC_ZLIB:
+        return zlib.decompress(payload).decode("utf-8")
+    if code == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("The zstandard package is required to read this value.")
+        return zstandard.ZstdDecompressor().decompress(payload).decode("utf-8")
+    raise ValueError(f"Unknown compression codec {code}.")
+
+
+class PackedText:
+    """Stored bytes of a CompressedTextField, decoded only when asked for."""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = bytes(data)
+
+    def unpack(self):
+        return unpack_text(self.data)
+
+    def __str__(self):
+        return self.unpack()
+
+    def __len__(self):
+        return len(self.data)
+
+
+class CompressedTextDescriptor(DeferredAttribute):
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if isinstance(value, PackedText):
+            value = value.unpack()
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        # A data descriptor, so that __get__ still runs once the value is set.
+        instance.__dict__[self.field.attname] = value
+
+
+class CompressedTextField(models.TextField):
+    """
+    Text stored as a binary column, compressed once it reaches the threshold.
+
+    Values are kept packed after loading and decompressed on first attribute
+    access, so rows that never touch the field never pay for it.
+    """
+
+    descriptor_class = CompressedTextDescriptor
+
+    def __init__(self, *args, compress_threshold=None, codec=None, level=None, **kwargs):
+        self.compress_threshold = compress_threshold
+        self.codec = codec
+        self.level = level
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.compress_threshold is not None:
+            kwargs["compress_threshold"] = self.compress_threshold
+        if self.codec is not None:
+            kwargs["codec"] = self.codec
+        if self.level is not None:
+            kwargs["level"] = self.level
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return "BinaryField"
+
+    def from_db_value(self, value, expression, connection):
+        if value is None:
+            return value
+        return PackedText(value)
+
+    def to_python(self, value):
+        if isinstance(value, PackedText):
+            return value.unpack()
+        if isinstance(value, (bytes, memoryview)):
+            return unpack_text(value)
+        return super().to_python(value)
+
+    def get_prep_value(self, value):
+        if value is None:
+            return value
+        if isinstance(value, PackedText):
+            return value.data
+        return pack_text(str(value), self.compress_threshold, self.codec, self.level)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        value = super().get_db_prep_value(value, connection, prepared)
+        if value is not None:
+            return connection.Database.Binary(value)
+        return value
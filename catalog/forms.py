@@ -2,6 +2,7 @@ from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import UserCreationForm
 
+from catalog import duplicates
 from catalog.models import Redactor, Newspaper, Topic
 
 
@@ -55,7 +56,28 @@ class NewspaperForm(forms.ModelForm):
         queryset=Topic.objects.all(),  
         widget=forms.CheckboxSelectMultiple,
     )
+    confirm_duplicate = forms.BooleanField(
+        required=False,
+        label="Save anyway, this is not a duplicate",
+        widget=forms.CheckboxInput(attrs={"class": "form-check-input"}),
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.duplicates = []
 
+    def clean(self):
+        cleaned_data = super().clean()
+        content = cleaned_data.get("content")
+        if not content or "content" not in self.changed_data or cleaned_data.get("confirm_duplicate"):
+            return cleaned_data
+        self.duplicates = duplicates.find_duplicates(content, exclude=self.instance.pk)
+        if self.duplicates:
+            titles = ", ".join(
+                f"\"{newspaper.title}\" ({score:.0%} similar)" for newspaper, score in self.duplicates
+            )
+            self.add_error("content", f"This looks like a near-duplicate of {titles}.")
+        return cleaned_data
 
     class Meta:
         model = Newspaper
@@ -97,6 +119,17 @@ class RedactorUsernameSearchForm(forms.Form):
             }
         ),
     )
+    sort = forms.ChoiceField(
+        choices=[
+            ("username", "Username"),
+            ("articles", "Most articles"),
+            ("recent", "Recently published"),
+            ("month", "Most active this month"),
+        ],
+        required=False,
+        label="",
+        widget=forms.Select(attrs={"class": "form-select me-2"}),
+    )
 
 
 class TopicNameSearchForm(forms.Form):
@@ -111,3 +144,71 @@ class TopicNameSearchForm(forms.Form):
             }
         ),
     )
+
+
+class IdListField(forms.Field):
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        if not value:
+            return []
+        try:
+            return sorted({int(pk) for pk in value})
+        except (TypeError, ValueError):
+            raise forms.ValidationError("Enter a list of ids.")
+
+
+class NameLookupField(forms.CharField):
+    """An object typed in by name, so that no option is rendered per row of the table."""
+
+    def __init__(self, queryset, lookup, **kwargs):
+        self.queryset = queryset
+        self.lookup = lookup
+        super().__init__(**kwargs)
+
+    def clean(self, value):
+        value = super().clean(value)
+        if not value:
+            return None
+        matches = list(self.queryset.filter(**{self.lookup: value})[:2])
+        if not matches:
+            raise forms.ValidationError(f"No {self.queryset.model._meta.verbose_name} named \"{value}\".")
+        if len(matches) > 1:
+            raise forms.ValidationError(f"Several {self.queryset.model._meta.verbose_name_plural} are named \"{value}\".")
+        return matches[0]
+
+
+class NewspaperBulkActionForm(forms.Form):
+    ACTION_CHOICES = (
+        ("delete", "Delete"),
+        ("add_topic", "Add topic"),
+        ("remove_topic", "Remove topic"),
+        ("add_publisher", "Add publisher"),
+        ("remove_publisher", "Remove publisher"),
+    )
+
+    newspapers = IdListField(error_messages={"required": "Select at least one newspaper."})
+    action = forms.ChoiceField(
+        choices=ACTION_CHOICES,
+        widget=forms.Select(attrs={"class": "form-select form-select-sm"}),
+    )
+    topic = NameLookupField(
+        Topic.objects.all(),
+        "name__iexact",
+        required=False,
+        widget=forms.TextInput(attrs={"class": "form-control form-control-sm", "placeholder": "Topic name"}),
+    )
+    publisher = NameLookupField(
+        get_user_model().objects.all(),
+        "username",
+        required=False,
+        widget=forms.TextInput(attrs={"class": "form-control form-control-sm", "placeholder": "Publisher username"}),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action", "")
+        for field in ("topic", "publisher"):
+            if action.endswith(f"_{field}") and not cleaned_data.get(field) and field not in self.errors:
+                self.add_error(field, f"Choose a {field} for this action.")
+        return cleaned_data
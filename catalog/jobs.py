@@ -0,0 +1,240 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from catalog.models import Job
+
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+_pending = set()
+_pending_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_mode():
+    return getattr(settings, "CATALOG_JOBS_MODE", "immediate")
+
+
+def job(func=None, *, name=None, max_attempts=None):
+    """Register ``func`` as a job and give it an ``enqueue`` shortcut."""
+
+    def register(func):
+        func.job_name = name or f"{func.__module__}.{func.__qualname__}"
+        func.max_attempts = max_attempts or getattr(settings, "CATALOG_JOBS_MAX_ATTEMPTS", 5)
+        func.enqueue = partial(enqueue, func)
+        registry[func.job_name] = func
+        return func
+
+    if func is None:
+        return register
+    return register(func)
+
+
+def get_dedup_key(name, args, kwargs):
+    payload = json.dumps([name, args, kwargs], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def enqueue(func, *args, **kwargs):
+    """
+    Schedule a registered job to run once the current transaction commits.
+
+    Arguments must be JSON-serializable. A job identical to one that is
+    still waiting to run is dropped.
+    """
+    name = func if isinstance(func, str) else func.job_name
+    if name not in registry:
+        raise KeyError(f"Unknown job {name!r}.")
+    args = list(args)
+    transaction.on_commit(partial(dispatch, name, args, kwargs))
+
+
+def dispatch(name, args, kwargs):
+    mode = get_mode()
+    key = get_dedup_key(name, args, kwargs)
+    if mode == "db":
+        Job.objects.bulk_create(
+            [
+                Job(
+                    name=name,
+                    args=args,
+                    kwargs=kwargs,
+                    dedup_key=key,
+                    max_attempts=registry[name].max_attempts,
+                )
+            ],
+            ignore_conflicts=True,
+        )
+        return
+    with _pending_lock:
+        if key in _pending:
+            return
+        _pending.add(key)
+    if mode == "thread":
+        get_executor().submit(run_in_process, name, args, kwargs, key)
+    else:
+        run_in_process(name, args, kwargs, key)
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "CATALOG_JOBS_THREADS", 4),
+                thread_name_prefix="catalog-jobs",
+            )
+        return _executor
+
+
+def get_failed_retention():
+    return getattr(settings, "CATALOG_JOBS_FAILED_RETENTION", 60 * 60 * 24 * 7)
+
+
+def get_retry_delay(attempt):
+    base = getattr(settings, "CATALOG_JOBS_RETRY_DELAY", 10)
+    return min(base * 2 ** (attempt - 1), 3600)
+
+
+def run_in_process(name, args, kwargs, key, attempt=1):
+    func = registry[name]
+    threaded = get_mode() == "thread"
+    with _pending_lock:
+        _pending.discard(key)
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Job %s failed (attempt %d of %d).", name, attempt, func.max_attempts)
+        if threaded and attempt < func.max_attempts:
+            schedule_retry(name, args, kwargs, key, attempt + 1)
+    finally:
+        if threaded:
+            close_old_connections()
+
+
+def schedule_retry(name, args, kwargs, key, attempt):
+    """Submit the next attempt to the pool once its delay has passed, without holding a pool thread."""
+    timer = threading.Timer(
+        get_retry_delay(attempt - 1),
+        get_executor().submit,
+        args=(run_in_process, name, args, kwargs, key, attempt),
+    )
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+def get_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def claim_jobs(worker_id, limit=10):
+    now = timezone.now()
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.PENDING, run_after__lte=now)
+            .order_by("run_after", "pk")[:limit]
+        )
+        if jobs:
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                status=Job.RUNNING, locked_by=worker_id, locked_at=now
+            )
+    return jobs
+
+
+def run_job(job_obj):
+    func = registry.get(job_obj.name)
+    attempts = job_obj.attempts + 1
+    try:
+        if func is None:
+            raise KeyError(f"Unknown job {job_obj.name!r}.")
+        func(*job_obj.args, **job_obj.kwargs)
+    except Exception:
+        logger.exception("Job %s #%s failed (attempt %d).", job_obj.name, job_obj.pk, attempts)
+        error = traceback.format_exc()
+        if func is None or attempts >= job_obj.max_attempts:
+            Job.objects.filter(pk=job_obj.pk).update(
+                status=Job.FAILED, attempts=attempts, last_error=error, finished_at=timezone.now()
+            )
+            return False
+        try:
+            with transaction.atomic():
+                Job.objects.filter(pk=job_obj.pk).update(
+                    status=Job.PENDING,
+                    attempts=attempts,
+                    last_error=error,
+                    locked_by="",
+                    locked_at=None,
+                    run_after=timezone.now() + timedelta(seconds=get_retry_delay(attempts)),
+                )
+        except IntegrityError:
+            # An identical job was queued in the meantime and will do the work.
+            Job.objects.filter(pk=job_obj.pk).delete()
+        return False
+    # Done jobs are of no further use; only failures are kept for a while.
+    Job.objects.filter(pk=job_obj.pk).delete()
+    return True
+
+
+def release_stale_jobs(timeout):
+    """Put jobs of workers that died mid-run back in the queue."""
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    released = 0
+    for job_obj in Job.objects.filter(status=Job.RUNNING, locked_at__lt=cutoff).only("pk"):
+        try:
+            with transaction.atomic():
+                released += Job.objects.filter(pk=job_obj.pk, status=Job.RUNNING).update(
+                    status=Job.PENDING, locked_by="", locked_at=None
+                )
+        except IntegrityError:
+            Job.objects.filter(pk=job_obj.pk).delete()
+    return released
+
+
+def prune_finished_jobs():
+    """Delete failed jobs older than CATALOG_JOBS_FAILED_RETENTION seconds, and any done ones."""
+    cutoff = timezone.now() - timedelta(seconds=get_failed_retention())
+    deleted, _ = Job.objects.filter(
+        Q(status=Job.DONE) | Q(status=Job.FAILED, finished_at__lt=cutoff)
+    ).delete()
+    return deleted
+
+
+def work(once=False, batch_size=10, poll_interval=1.0, stale_timeout=600, stop_event=None):
+    """Process queued jobs until ``stop_event`` is set, or the queue is empty with ``once``."""
+    worker_id = get_worker_id()
+    processed = 0
+    last_release = None
+    while stop_event is None or not stop_event.is_set():
+        close_old_connections()
+        if last_release is None or time.monotonic() - last_release > stale_timeout / 2:
+            release_stale_jobs(stale_timeout)
+            prune_finished_jobs()
+            last_release = time.monotonic()
+        jobs = claim_jobs(worker_id, batch_size)
+        for job_obj in jobs:
+            run_job(job_obj)
+            processed += 1
+        if not jobs:
+            if once:
+                break
+            time.sleep(poll_interval)
+    return processed
@@ -0,0 +1,193 @@
+import http.client
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client
+from django.urls import reverse
+
+from catalog.benchmarks import summarize
+from catalog.models import Newspaper, Topic
+
+GUNICORN_CONFIG = settings.BASE_DIR / "config" / "gunicorn.py"
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def children(pid):
+    found = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as file:
+                # The process name may contain spaces; ppid follows its closing paren.
+                ppid = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == pid:
+            found.append(int(entry))
+    return found
+
+
+def memory_kib(pid):
+    """Resident and proportional set size; PSS splits pages shared copy-on-write between processes."""
+    values = {}
+    for name in (f"/proc/{pid}/smaps_rollup", f"/proc/{pid}/status"):
+        try:
+            with open(name) as file:
+                for line in file:
+                    key, _, rest = line.partition(":")
+                    if key in ("Rss", "Pss", "VmRSS"):
+                        values.setdefault(key, int(rest.split()[0]))
+        except OSError:
+            continue
+    rss = values.get("Rss", values.get("VmRSS", 0))
+    return rss, values.get("Pss", rss)
+
+
+def start_server(mode, port, workers=None, threads=None):
+    env = dict(
+        os.environ,
+        GUNICORN_MODE=mode,
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        PROMETHEUS_MULTIPROC_DIR=tempfile.mkdtemp(prefix="catalog-loadtest-"),
+    )
+    if workers:
+        env["WEB_CONCURRENCY"] = str(workers)
+    if threads:
+        env["GUNICORN_THREADS"] = str(threads)
+    return subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", str(GUNICORN_CONFIG)],
+        cwd=settings.BASE_DIR,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def wait_until_ready(server, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {server.returncode}.")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"gunicorn did not listen on port {port} within {timeout} seconds.")
+
+
+def stop_server(server):
+    server.terminate()
+    try:
+        server.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+def session_cookie():
+    user, _ = get_user_model().objects.get_or_create(username="loadtest-user")
+    client = Client()
+    client.force_login(user)
+    return f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+
+def sample_paths(count=50, seed=0):
+    """A mix of the main read pages over the seeded dataset."""
+    rng = random.Random(seed)
+    ids = list(Newspaper.objects.values_list("pk", flat=True)[:1000])
+    if not ids:
+        raise RuntimeError("No newspapers to load test; run seed_catalog first.")
+    topic = Topic.objects.values_list("name", flat=True).first() or ""
+    paths = [
+        reverse("catalog:index"),
+        reverse("catalog:newspaper-list"),
+        reverse("catalog:newspaper-list") + "?page=3",
+        reverse("catalog:newspaper-list") + "?title=the",
+        reverse("catalog:topic-list") + f"?name={topic[:3]}",
+        reverse("catalog:redactor-list"),
+    ]
+    paths += [reverse("catalog:newspaper-detail", args=[rng.choice(ids)]) for _ in range(count - len(paths))]
+    return paths
+
+
+def generate_load(port, paths, cookie, concurrency, duration):
+    """Keep-alive clients requesting ``paths`` at random for ``duration`` seconds."""
+    timings, errors = [], []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local_timings, local_errors = [], 0
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                connection.request("GET", rng.choice(paths), headers={"Cookie": cookie})
+                response = connection.getresponse()
+                response.read()
+                if response.status != 200:
+                    local_errors += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+                continue
+            local_timings.append((time.perf_counter() - start) * 1000)
+        connection.close()
+        with lock:
+            timings.extend(local_timings)
+            errors.append(local_errors)
+
+    clients = [threading.Thread(target=client, args=(seed,)) for seed in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    return timings, sum(errors)
+
+
+def run(modes, duration=20, concurrency=16, warmup=3, workers=None, threads=None):
+    """Throughput, latency and memory of a gunicorn server per worker mode."""
+    cookie = session_cookie()
+    paths = sample_paths()
+    results = []
+    for mode in modes:
+        port = free_port()
+        server = start_server(mode, port, workers=workers, threads=threads)
+        try:
+            wait_until_ready(server, port)
+            generate_load(port, paths, cookie, concurrency, warmup)
+            timings, errors = generate_load(port, paths, cookie, concurrency, duration)
+            pids = [server.pid] + children(server.pid)
+            usage = [memory_kib(pid) for pid in pids]
+        finally:
+            stop_server(server)
+        row = {
+            "mode": mode,
+            "workers": len(pids) - 1,
+            "requests_per_s": round(len(timings) / duration, 1),
+            "errors": errors,
+        }
+        if timings:
+            row.update(summarize(timings))
+        row["rss_mb"] = round(sum(rss for rss, _ in usage) / 1024, 1)
+        row["pss_mb"] = round(sum(pss for _, pss in usage) / 1024, 1)
+        results.append(row)
+    return results
@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from catalog import archive
+
+
+class Command(BaseCommand):
+    help = "Move the content of old newspapers to the archive, creating its monthly partitions as needed."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=None,
+            help="Archive newspapers published more than this many days ago, CATALOG_ARCHIVE_AFTER_DAYS by default.",
+        )
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        days = options["days"] if options["days"] is not None else archive.get_archive_after_days()
+        archived = archive.archive(
+            cutoff=timezone.now() - timedelta(days=days),
+            batch_size=options["batch_size"],
+            progress=lambda count: self.stdout.write(f"  {count} newspapers archived"),
+        )
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} newspapers older than {days} days."))
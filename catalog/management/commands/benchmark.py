@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog.benchmarks import SCENARIOS
+
+
+class Command(BaseCommand):
+    help = "Run catalog benchmark scenarios and print their results."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "scenarios", nargs="*", metavar="scenario",
+            help=f"Scenarios to run, all by default: {', '.join(sorted(SCENARIOS))}.",
+        )
+
+    def handle(self, *args, **options):
+        names = options["scenarios"] or sorted(SCENARIOS)
+        unknown = set(names) - set(SCENARIOS)
+        if unknown:
+            raise CommandError(f"Unknown scenarios: {', '.join(sorted(unknown))}.")
+        for name in names:
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{name}:"))
+            for row in SCENARIOS[name]():
+                self.stdout.write("  " + "  ".join(f"{key}={value}" for key, value in row.items()))
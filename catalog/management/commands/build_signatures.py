@@ -0,0 +1,32 @@
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from catalog import duplicates
+
+
+class Command(BaseCommand):
+    help = "Compute the MinHash signatures and LSH bands used to detect near-duplicate newspapers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1, help="Number of worker processes.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Newspapers per batch.")
+        parser.add_argument("--missing", action="store_true", help="Only newspapers without a signature.")
+
+    def handle(self, *args, **options):
+        batches = duplicates.batches(missing=options["missing"], batch_size=options["batch_size"])
+        if options["processes"] <= 1:
+            self.collect(map(duplicates.refresh_many, batches))
+            return
+        # Children must not share the parent's database connections.
+        connections.close_all()
+        with multiprocessing.get_context("fork").Pool(options["processes"]) as pool:
+            self.collect(pool.imap_unordered(duplicates.refresh_many, batches))
+
+    def collect(self, results):
+        total = 0
+        for count in results:
+            total += count
+            self.stdout.write(f"  {total} signatures written")
+        self.stdout.write(self.style.SUCCESS(f"Built {total} signatures."))
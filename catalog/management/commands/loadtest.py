@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from catalog import loadtest
+
+
+class Command(BaseCommand):
+    help = "Serve the catalog with gunicorn in each worker mode and compare throughput, latency and memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "modes", nargs="*", metavar="mode",
+            help="Worker modes to compare, all by default: sync, gthread, asgi.",
+        )
+        parser.add_argument("--duration", type=int, default=20, help="Seconds of load per mode.")
+        parser.add_argument("--concurrency", type=int, default=16, help="Concurrent keep-alive clients.")
+        parser.add_argument("--workers", type=int, help="Worker count instead of the CPU-based default.")
+        parser.add_argument("--threads", type=int, help="Threads per gthread worker.")
+
+    def handle(self, *args, **options):
+        modes = options["modes"] or ["sync", "gthread", "asgi"]
+        unknown = set(modes) - {"sync", "gthread", "asgi"}
+        if unknown:
+            raise CommandError(f"Unknown modes: {', '.join(sorted(unknown))}.")
+        try:
+            results = loadtest.run(
+                modes,
+                duration=options["duration"],
+                concurrency=options["concurrency"],
+                workers=options["workers"],
+                threads=options["threads"],
+            )
+        except RuntimeError as error:
+            raise CommandError(str(error))
+        for row in results:
+            self.stdout.write("  ".join(f"{key}={value}" for key, value in row.items()))
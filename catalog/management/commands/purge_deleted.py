@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from catalog import purge
+
+
+class Command(BaseCommand):
+    help = "Purge soft-deleted topics and redactors, reporting progress as links are removed."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=None)
+
+    def handle(self, *args, **options):
+        for model in purge.RELATIONS:
+            for obj in model.all_objects.filter(deleted_at__isnull=False).order_by("pk"):
+                self.stdout.write(f"Purging {model._meta.verbose_name} {obj} (#{obj.pk})")
+                removed = purge.purge(
+                    model,
+                    obj.pk,
+                    batch_size=options["batch_size"],
+                    progress=lambda count: self.stdout.write(f"  {count} links removed"),
+                )
+                self.stdout.write(self.style.SUCCESS(f"  Done, {removed} links removed."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from catalog import activity
+
+
+class Command(BaseCommand):
+    help = "Recompute the activity columns and monthly activity of every redactor."
+
+    def handle(self, *args, **options):
+        activity.rebuild()
+        self.stdout.write(self.style.SUCCESS("Redactor activity rebuilt."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from catalog import counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the maintained catalog counters from the tables."
+
+    def handle(self, *args, **options):
+        counters.rebuild()
+        self.stdout.write(self.style.SUCCESS("Counters rebuilt."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from catalog import related
+
+
+class Command(BaseCommand):
+    help = "Recompute related newspapers, for every newspaper or only those changed since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale", action="store_true", help="Only refresh neighbourhoods affected by changes."
+        )
+
+    def handle(self, *args, **options):
+        if options["stale"]:
+            count = related.refresh_stale()
+            self.stdout.write(self.style.SUCCESS(f"Refreshed {count} newspapers."))
+        else:
+            count = related.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt related newspapers of {count} newspapers."))
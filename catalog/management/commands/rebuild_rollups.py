@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from catalog import rollups
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily publication, topic and redactor rollups behind the dashboard."
+
+    def handle(self, *args, **options):
+        days = rollups.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt rollups of {days} days."))
@@ -0,0 +1,61 @@
+import multiprocessing
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from catalog.jobs import work
+
+
+class Command(BaseCommand):
+    help = "Run workers that process the database-backed job queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=1, help="Number of worker processes.")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty.")
+        parser.add_argument("--batch-size", type=int, default=10, help="Jobs claimed per query.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to sleep when idle.")
+        parser.add_argument(
+            "--stale-timeout", type=int, default=600,
+            help="Seconds after which a running job of a dead worker is requeued.",
+        )
+
+    def handle(self, *args, **options):
+        worker_options = {
+            "once": options["once"],
+            "batch_size": options["batch_size"],
+            "poll_interval": options["poll_interval"],
+            "stale_timeout": options["stale_timeout"],
+        }
+        if options["processes"] <= 1:
+            processed = run_worker(worker_options)
+            self.stdout.write(f"Processed {processed} jobs.")
+            return
+
+        # Children must not share the parent's database connections.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        workers = [
+            context.Process(target=run_worker, args=(worker_options,), daemon=True)
+            for _ in range(options["processes"])
+        ]
+        for process in workers:
+            process.start()
+        try:
+            for process in workers:
+                process.join()
+        except KeyboardInterrupt:
+            for process in workers:
+                process.terminate()
+            for process in workers:
+                process.join()
+
+
+def run_worker(options):
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+    try:
+        return work(stop_event=stop_event, **options)
+    except KeyboardInterrupt:
+        return 0
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from catalog.seed import seed_catalog
+
+
+class Command(BaseCommand):
+    help = "Fill the catalog with generated topics, redactors and newspapers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--newspapers", type=int, default=1000)
+        parser.add_argument("--topics", type=int, default=50)
+        parser.add_argument("--redactors", type=int, default=50)
+        parser.add_argument("--days", type=int, default=365, help="Spread publication dates over this many days.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        count = seed_catalog(
+            newspapers=options["newspapers"],
+            topics=options["topics"],
+            redactors=options["redactors"],
+            days=options["days"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Created {count} newspapers."))
@@ -0,0 +1,202 @@
+import os
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.cache import BaseCache, CacheHandler
+from django.db import connections
+from django.template.base import Template
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+# With PROMETHEUS_MULTIPROC_DIR set before the first import of
+# prometheus_client, every worker writes its samples to mmap'ed files in that
+# directory and render() sums them up; see the README.
+REQUEST_LATENCY = Histogram(
+    "catalog_request_duration_seconds",
+    "Request latency by URL name and method.",
+    ["view", "method"],
+)
+REQUEST_QUERIES = Histogram(
+    "catalog_request_queries",
+    "Database queries per request.",
+    ["view"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+REQUEST_QUERY_TIME = Histogram(
+    "catalog_request_query_duration_seconds",
+    "Time spent in database queries per request.",
+    ["view"],
+)
+DB_CONNECTIONS = Gauge(
+    "catalog_db_connections",
+    "Database connections by alias and state: open in this process, or pool size and available.",
+    ["alias", "state"],
+    multiprocess_mode="livesum",
+)
+CACHE_REQUESTS = Counter(
+    "catalog_cache_requests",
+    "Cache lookups by cache alias and result.",
+    ["cache", "result"],
+)
+TEMPLATE_RENDER = Histogram(
+    "catalog_template_render_seconds",
+    "Render time per template, includes counted inside their parents too.",
+    ["template"],
+)
+RATE_LIMIT_REQUESTS = Counter(
+    "catalog_rate_limit_requests",
+    "Requests checked against a rate limit, by URL name, bucket scope and result.",
+    ["view", "scope", "result"],
+)
+CACHE_COMPUTATIONS = Counter(
+    "catalog_cache_computations",
+    "Single-flight cache lookups that missed a fresh value, by cache name and outcome: computed, or "
+    "coalesced as waited (for another caller's result) or stale (served the previous value); "
+    "timeout when waiting gave up.",
+    ["cache", "result"],
+)
+
+_installed = False
+_install_lock = threading.Lock()
+_missing = object()
+
+
+def is_enabled():
+    return getattr(settings, "CATALOG_METRICS", True)
+
+
+def get_token():
+    return getattr(settings, "CATALOG_METRICS_TOKEN", "")
+
+
+def view_name(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match is not None else "<unresolved>"
+
+
+def instrument_cache(cache, alias):
+    """Count hits and misses of ``get`` (and a native ``get_many``) on one cache connection."""
+    get = cache.get
+    counters = {result: CACHE_REQUESTS.labels(alias, result) for result in ("hit", "miss")}
+
+    def counted_get(key, default=None, version=None):
+        value = get(key, _missing, version=version)
+        if value is _missing:
+            counters["miss"].inc()
+            return default
+        counters["hit"].inc()
+        return value
+
+    cache.get = counted_get
+    # BaseCache.get_many goes through get, which is already counted.
+    if type(cache).get_many is not BaseCache.get_many:
+        get_many = cache.get_many
+
+        def counted_get_many(keys, version=None):
+            keys = list(keys)
+            values = get_many(keys, version=version)
+            counters["hit"].inc(len(values))
+            counters["miss"].inc(len(keys) - len(values))
+            return values
+
+        cache.get_many = counted_get_many
+    return cache
+
+
+def install():
+    """Instrument cache connections and template rendering once per process."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        create_connection = CacheHandler.create_connection
+        template_render = Template.render
+
+        def create_cache_connection(self, alias):
+            return instrument_cache(create_connection(self, alias), alias)
+
+        def render(self, context):
+            name = self.origin.template_name if self.origin else None
+            if name is None:
+                return template_render(self, context)
+            start = time.perf_counter()
+            try:
+                return template_render(self, context)
+            finally:
+                TEMPLATE_RENDER.labels(name).observe(time.perf_counter() - start)
+
+        CacheHandler.create_connection = create_cache_connection
+        Template.render = render
+        _installed = True
+
+
+class QueryMetrics:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+def update_connection_gauges():
+    for connection in connections.all(initialized_only=True):
+        DB_CONNECTIONS.labels(connection.alias, "open").set(int(connection.connection is not None))
+        pool = getattr(connection, "pool", None)
+        if pool is not None:
+            stats = pool.get_stats()
+            DB_CONNECTIONS.labels(connection.alias, "pool_size").set(stats.get("pool_size", 0))
+            DB_CONNECTIONS.labels(connection.alias, "pool_available").set(stats.get("pool_available", 0))
+
+
+def render():
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
+
+def mark_process_dead(pid):
+    """Drop the live gauges of an exited worker; call from the server's child_exit hook."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
+
+
+class MetricsMiddleware:
+    """Latency, query count and query time of every request, labelled by URL name."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not is_enabled():
+            return self.get_response(request)
+        start = time.perf_counter()
+        queries = QueryMetrics()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        view = view_name(request)
+        REQUEST_LATENCY.labels(view, request.method).observe(time.perf_counter() - start)
+        REQUEST_QUERIES.labels(view).observe(queries.count)
+        REQUEST_QUERY_TIME.labels(view).observe(queries.seconds)
+        update_connection_gauges()
+        return response
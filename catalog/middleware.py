@@ -0,0 +1,181 @@
+import logging
+import re
+import time
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = re.compile(r"^(text/|application/(json|javascript|xml|rss\+xml|atom\+xml))")
+
+DEFAULTS = {"min_length": 200, "gzip_level": 6, "brotli_quality": 4}
+
+
+def get_options(view_name):
+    """Compression options of a view, or None when it is not compressed."""
+    options = dict(DEFAULTS, **getattr(settings, "CATALOG_RESPONSE_COMPRESSION", {}))
+    override = getattr(settings, "CATALOG_RESPONSE_COMPRESSION_VIEWS", {}).get(view_name)
+    if override is False:
+        return None
+    if override:
+        options.update(override)
+    return options
+
+
+def parse_accept_encoding(header):
+    accepted = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        match = re.search(r"q=([0-9.]+)", params)
+        if match:
+            try:
+                quality = float(match.group(1))
+            except ValueError:
+                quality = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = quality
+    return accepted
+
+
+def choose_encoding(header):
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0)
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+class Compressor:
+    """Incremental br/gzip encoder that tracks sizes and CPU time spent."""
+
+    def __init__(self, encoding, options):
+        self.encoding = encoding
+        if encoding == "br":
+            self.encoder = brotli.Compressor(quality=options["brotli_quality"])
+        else:
+            self.encoder = zlib.compressobj(options["gzip_level"], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        self.raw_size = 0
+        self.size = 0
+        self.cpu_time = 0.0
+
+    def run(self, func, *args):
+        started = time.thread_time()
+        data = func(*args)
+        self.cpu_time += time.thread_time() - started
+        self.size += len(data)
+        return data
+
+    def compress(self, data):
+        self.raw_size += len(data)
+        if self.encoding == "br":
+            return self.run(self.encoder.process, data)
+        return self.run(self.encoder.compress, data)
+
+    def flush(self):
+        # Sends what has been compressed so far, so streamed chunks are not held back.
+        if self.encoding == "br":
+            return self.run(self.encoder.flush)
+        return self.run(self.encoder.flush, zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == "br":
+            return self.run(self.encoder.finish)
+        return self.run(self.encoder.flush, zlib.Z_FINISH)
+
+    @property
+    def ratio(self):
+        return self.raw_size / self.size if self.size else 0.0
+
+
+class CompressionMiddleware:
+    """
+    Compress text responses with brotli or gzip, whichever the client prefers.
+
+    Streaming responses are compressed chunk by chunk and flushed as they go.
+    Per-view options and opt-outs come from CATALOG_RESPONSE_COMPRESSION_VIEWS,
+    keyed by namespaced URL name. The compression ratio and CPU time are
+    logged and, for regular responses, sent in a Server-Timing header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if response.status_code != 200 or response.has_header("Content-Encoding"):
+            return response
+        if not COMPRESSIBLE_TYPES.match(response.get("Content-Type", "")):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        match = getattr(request, "resolver_match", None)
+        options = get_options(match.view_name if match else None)
+        if options is None:
+            return response
+        encoding = choose_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+        if not response.streaming and len(response.content) < options["min_length"]:
+            return response
+
+        compressor = Compressor(encoding, options)
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self.compress_async(compressor, response.streaming_content, request)
+            else:
+                response.streaming_content = self.compress_stream(compressor, response.streaming_content, request)
+            del response.headers["Content-Length"]
+        else:
+            response.content = compressor.compress(response.content) + compressor.finish()
+            response.headers["Content-Length"] = str(len(response.content))
+            response.headers["Server-Timing"] = (
+                f'compress;dur={compressor.cpu_time * 1000:.2f};desc="{encoding} {compressor.ratio:.1f}x"'
+            )
+            self.report(request, compressor)
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def compress_stream(self, compressor, content, request):
+        for chunk in content:
+            data = compressor.compress(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        self.report(request, compressor)
+
+    async def compress_async(self, compressor, content, request):
+        async for chunk in content:
+            data = compressor.compress(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        self.report(request, compressor)
+
+    def report(self, request, compressor):
+        logger.debug(
+            "Compressed %s with %s: %d -> %d bytes (%.1fx) in %.2f ms CPU.",
+            request.path,
+            compressor.encoding,
+            compressor.raw_size,
+            compressor.size,
+            compressor.ratio,
+            compressor.cpu_time * 1000,
+        )
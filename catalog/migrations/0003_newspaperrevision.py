@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0002_alter_redactor_options_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewspaperRevision",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("number", models.PositiveIntegerField()),
+                ("is_snapshot", models.BooleanField(default=False)),
+                ("depth", models.PositiveSmallIntegerField(default=0)),
+                ("body", models.TextField()),
+                ("length", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("newspaper", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="revisions", to="catalog.newspaper")),
+            ],
+            options={
+                "ordering": ["-number"],
+                "constraints": [models.UniqueConstraint(fields=("newspaper", "number"), name="unique_newspaper_revision")],
+            },
+        ),
+    ]
@@ -0,0 +1,70 @@
+from django.db import migrations, models, transaction
+
+import catalog.fields
+
+
+BATCH_SIZE = 500
+
+
+def copy_in_batches(apps, schema_editor, source, target):
+    # The migration is not atomic: each batch commits on its own, so row
+    # locks and WAL are bounded by the batch rather than the table.
+    Newspaper = apps.get_model("catalog", "Newspaper")
+    using = schema_editor.connection.alias
+    last_pk = 0
+    while True:
+        with transaction.atomic(using=using):
+            batch = list(
+                Newspaper.objects.using(using)
+                .filter(pk__gt=last_pk)
+                .order_by("pk")
+                .only("pk", source)[:BATCH_SIZE]
+            )
+            if not batch:
+                break
+            for newspaper in batch:
+                setattr(newspaper, target, getattr(newspaper, source))
+            Newspaper.objects.using(using).bulk_update(batch, [target])
+        last_pk = batch[-1].pk
+
+
+def pack_content(apps, schema_editor):
+    copy_in_batches(apps, schema_editor, "content", "packed_content")
+
+
+def unpack_content(apps, schema_editor):
+    copy_in_batches(apps, schema_editor, "packed_content", "content")
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("catalog", "0003_newspaperrevision"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspaper",
+            name="packed_content",
+            field=catalog.fields.CompressedTextField(default=""),
+            preserve_default=False,
+        ),
+        migrations.RunPython(pack_content, unpack_content),
+        # Gives the plain column a default so that unapplying can re-add it.
+        migrations.AlterField(
+            model_name="newspaper",
+            name="content",
+            field=models.TextField(default=""),
+        ),
+        migrations.RemoveField(
+            model_name="newspaper",
+            name="content",
+        ),
+        migrations.RenameField(
+            model_name="newspaper",
+            old_name="packed_content",
+            new_name="content",
+        ),
+    ]
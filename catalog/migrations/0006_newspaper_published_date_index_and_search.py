@@ -0,0 +1,38 @@
+from django.db import migrations, models
+
+from catalog.search import TITLE_SEARCH_CONFIG
+
+
+TITLE_SEARCH_INDEX = "newspaper_title_search_idx"
+
+
+def create_title_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    # Same expression as SearchVector("title", config=TITLE_SEARCH_CONFIG)
+    # compiles to, so catalog.search.search_newspaper_titles can use the index.
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {TITLE_SEARCH_INDEX} ON catalog_newspaper "
+        f"USING gin (to_tsvector('{TITLE_SEARCH_CONFIG}'::regconfig, COALESCE(title, '')))"
+    )
+
+
+def drop_title_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {TITLE_SEARCH_INDEX}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0005_job"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(fields=["-published_date"], name="newspaper_published_idx"),
+        ),
+        migrations.RunPython(create_title_search_index, drop_title_search_index),
+    ]
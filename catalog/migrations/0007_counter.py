@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:46
+
+from django.db import migrations, models
+
+
+def create_newspaper_counter(apps, schema_editor):
+    Counter = apps.get_model("catalog", "Counter")
+    Newspaper = apps.get_model("catalog", "Newspaper")
+    Counter.objects.create(name="catalog.newspaper.count", value=Newspaper.objects.count())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0006_newspaper_published_date_index_and_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Counter",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("value", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_newspaper_counter, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:52
+
+import django.contrib.auth.models
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0007_counter"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="redactor",
+            managers=[
+                ("objects", django.db.models.manager.Manager()),
+                ("all_objects", django.contrib.auth.models.UserManager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="redactor",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="topic",
+            name="deleted_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AlterField(
+            model_name="topic",
+            name="name",
+            field=models.CharField(max_length=255),
+        ),
+        migrations.AddConstraint(
+            model_name="topic",
+            constraint=models.UniqueConstraint(condition=models.Q(("deleted_at__isnull", True)), fields=("name",), name="unique_active_topic_name", violation_error_message="Topic with this Name already exists."),
+        ),
+    ]
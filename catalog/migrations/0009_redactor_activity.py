@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("catalog", "0008_soft_delete"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RedactorMonthlyActivity",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("month", models.DateField()),
+                ("article_count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="redactor",
+            name="article_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="redactor",
+            name="last_published_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="redactor",
+            name="topic_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="redactor",
+            index=models.Index(fields=["-article_count"], name="redactor_article_count_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="redactor",
+            index=models.Index(fields=["-last_published_at"], name="redactor_last_published_idx"),
+        ),
+        migrations.AddField(
+            model_name="redactormonthlyactivity",
+            name="redactor",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="monthly_activity", to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name="redactormonthlyactivity",
+            index=models.Index(fields=["month", "-article_count"], name="redactor_month_activity_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="redactormonthlyactivity",
+            constraint=models.UniqueConstraint(fields=("redactor", "month"), name="unique_redactor_month"),
+        ),
+    ]
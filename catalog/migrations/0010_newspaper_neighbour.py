@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-19 15:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0009_redactor_activity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewspaperNeighbour",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("rank", models.PositiveSmallIntegerField()),
+                ("score", models.FloatField()),
+            ],
+            options={
+                "ordering": ["rank"],
+            },
+        ),
+        migrations.AddField(
+            model_name="newspaper",
+            name="related_stale",
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="newspaper",
+            index=models.Index(condition=models.Q(("related_stale", True)), fields=["related_stale"], name="newspaper_related_stale_idx"),
+        ),
+        migrations.AddField(
+            model_name="newspaperneighbour",
+            name="neighbour",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="catalog.newspaper"),
+        ),
+        migrations.AddField(
+            model_name="newspaperneighbour",
+            name="newspaper",
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="neighbours", to="catalog.newspaper"),
+        ),
+        migrations.AddConstraint(
+            model_name="newspaperneighbour",
+            constraint=models.UniqueConstraint(fields=("newspaper", "rank"), name="unique_newspaper_neighbour_rank"),
+        ),
+    ]
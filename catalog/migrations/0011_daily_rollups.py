@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:01
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0010_newspaper_neighbour"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyPublicationCount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField(unique=True)),
+                ("count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="DailyRedactorCount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("redactor", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("day", "redactor"), name="unique_daily_redactor")],
+            },
+        ),
+        migrations.CreateModel(
+            name="DailyTopicCount",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("count", models.PositiveIntegerField(default=0)),
+                ("topic", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="catalog.topic")),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("day", "topic"), name="unique_daily_topic")],
+            },
+        ),
+    ]
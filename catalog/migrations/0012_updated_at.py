@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:03
+
+from django.db import migrations, models
+
+
+def create_generation_counters(apps, schema_editor):
+    Counter = apps.get_model("catalog", "Counter")
+    for model in ("newspaper", "topic", "redactor"):
+        Counter.objects.get_or_create(name=f"catalog.{model}.generation")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0011_daily_rollups"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspaper",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="redactor",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="topic",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(create_generation_counters, migrations.RunPython.noop),
+    ]
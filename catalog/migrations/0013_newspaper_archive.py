@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:13
+
+import catalog.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+ARCHIVE_TABLE = "catalog_newspaperarchive"
+
+
+def partition_archive_table(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    # The table is still empty; recreate it range-partitioned by month, the
+    # partitions themselves are created by catalog.archive.ensure_partitions.
+    schema_editor.execute(f"DROP TABLE {ARCHIVE_TABLE}")
+    schema_editor.execute(
+        f"CREATE TABLE {ARCHIVE_TABLE} ("
+        "newspaper_id bigint NOT NULL REFERENCES catalog_newspaper (id) DEFERRABLE INITIALLY DEFERRED, "
+        "published_date timestamp with time zone NOT NULL, "
+        "content bytea NOT NULL, "
+        "PRIMARY KEY (newspaper_id, published_date)"
+        ") PARTITION BY RANGE (published_date)"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0012_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="newspaper",
+            name="archived_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name="NewspaperArchive",
+            fields=[
+                ("pk", models.CompositePrimaryKey("newspaper_id", "published_date", blank=True, editable=False, primary_key=True, serialize=False)),
+                ("published_date", models.DateTimeField()),
+                ("content", catalog.fields.CompressedTextField(compress_threshold=0, level=19)),
+                ("newspaper", models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name="+", to="catalog.newspaper")),
+            ],
+        ),
+        migrations.RunPython(partition_archive_table, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 16:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0013_newspaper_archive"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NewspaperSignature",
+            fields=[
+                ("newspaper", models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name="+", serialize=False, to="catalog.newspaper")),
+                ("signature", models.BinaryField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="NewspaperBand",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("band", models.PositiveSmallIntegerField()),
+                ("hash", models.BigIntegerField()),
+                ("newspaper", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="catalog.newspaper")),
+            ],
+            options={
+                "indexes": [models.Index(fields=["band", "hash"], name="newspaper_band_hash_idx")],
+            },
+        ),
+    ]
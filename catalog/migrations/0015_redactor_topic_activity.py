@@ -0,0 +1,48 @@
+# Generated by Django 5.2.7 on 2026-10-19 17:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_topic_activity(apps, schema_editor):
+    Newspaper = apps.get_model("catalog", "Newspaper")
+    RedactorTopicActivity = apps.get_model("catalog", "RedactorTopicActivity")
+    rows = (
+        Newspaper.publishers.through.objects.filter(newspaper__topics__isnull=False)
+        .values("redactor_id", "newspaper__topics")
+        .annotate(count=models.Count("newspaper_id"))
+        .order_by()
+    )
+    RedactorTopicActivity.objects.bulk_create(
+        (
+            RedactorTopicActivity(
+                redactor_id=row["redactor_id"], topic_id=row["newspaper__topics"], article_count=row["count"]
+            )
+            for row in rows.iterator()
+        ),
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0014_newspaper_signatures"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RedactorTopicActivity",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("article_count", models.PositiveIntegerField(default=0)),
+                ("redactor", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="topic_activity", to=settings.AUTH_USER_MODEL)),
+                ("topic", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="+", to="catalog.topic")),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("redactor", "topic"), name="unique_redactor_topic")],
+            },
+        ),
+        migrations.RunPython(fill_topic_activity, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,41 @@
 from django.db import models
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
+from django.utils import timezone
+
+from catalog.fields import CompressedTextField
+
+
+class ActiveManager(models.Manager):
+    """Hides soft-deleted rows, which wait for ``catalog.purge`` to remove them."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
+class ActiveRedactorManager(UserManager):
+    use_in_migrations = False
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
 
 
 class Topic(models.Model):
-    name = models.CharField(max_length=255, unique=True)
+    name = models.CharField(max_length=255)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = ActiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["name"],
+                condition=models.Q(deleted_at__isnull=True),
+                name="unique_active_topic_name",
+                violation_error_message="Topic with this Name already exists.",
+            ),
+        ]
 
     def __str__(self):
         return self.name
@@ -11,10 +43,24 @@ class Topic(models.Model):
 
 class Redactor(AbstractUser):
     years_of_experience = models.IntegerField(default=0)
+    deleted_at = models.DateTimeField(null=True, blank=True, editable=False)
+    # Also bumped when the redactor's newspapers change, see catalog.signals.
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by catalog.activity from the newspapers the redactor publishes.
+    article_count = models.PositiveIntegerField(default=0, editable=False)
+    last_published_at = models.DateTimeField(null=True, blank=True, editable=False)
+    topic_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = ActiveRedactorManager()
+    all_objects = UserManager()
 
     class Meta:
         verbose_name = "Redactor"
         verbose_name_plural = "Redactors"
+        indexes = [
+            models.Index(fields=["-article_count"], name="redactor_article_count_idx"),
+            models.Index(fields=["-last_published_at"], name="redactor_last_published_idx"),
+        ]
 
     def __str__(self):
         return self.username
@@ -22,10 +68,249 @@ class Redactor(AbstractUser):
 
 class Newspaper(models.Model):
     title = models.CharField(max_length=255)
-    content = models.TextField()
+    content = CompressedTextField()
     published_date = models.DateTimeField(auto_now_add=True)
+    # Also bumped when topics, publishers or related newspapers change.
+    updated_at = models.DateTimeField(auto_now=True)
     topics = models.ManyToManyField(Topic, related_name="newspapers")
     publishers = models.ManyToManyField(Redactor, related_name="newspapers")
 
+    # Set when topics or publishers change, cleared by catalog.related.
+    related_stale = models.BooleanField(default=True, editable=False)
+    # Set by catalog.archive once the content moved to NewspaperArchive.
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-published_date"], name="newspaper_published_idx"),
+            models.Index(
+                fields=["related_stale"],
+                condition=models.Q(related_stale=True),
+                name="newspaper_related_stale_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.title} by {', '.join(publisher.username for publisher in self.publishers.all())}"
+
+
+class NewspaperArchive(models.Model):
+    """
+    Content of archived newspapers, recompressed for cold storage.
+
+    Range-partitioned by month of ``published_date`` on PostgreSQL, see
+    migration 0013 and ``catalog.archive.ensure_partitions``.
+    """
+
+    pk = models.CompositePrimaryKey("newspaper_id", "published_date")
+    # The primary key starts with it, no separate index needed.
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="+", db_index=False
+    )
+    published_date = models.DateTimeField()
+    content = CompressedTextField(compress_threshold=0, level=19)
+
+    def __str__(self):
+        return f"{self.newspaper_id} archived ({self.published_date:%Y-%m})"
+
+
+class NewspaperSignature(models.Model):
+    """MinHash signature of a newspaper's content, see catalog.duplicates."""
+
+    newspaper = models.OneToOneField(
+        Newspaper, on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    signature = models.BinaryField()
+
+    def __str__(self):
+        return f"{self.newspaper_id} signature"
+
+
+class NewspaperBand(models.Model):
+    """One LSH band of a newspaper's signature; equal band hashes mark candidate duplicates."""
+
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="+"
+    )
+    band = models.PositiveSmallIntegerField()
+    hash = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["band", "hash"], name="newspaper_band_hash_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.newspaper_id} band {self.band}"
+
+
+class RedactorMonthlyActivity(models.Model):
+    redactor = models.ForeignKey(
+        Redactor, on_delete=models.CASCADE, related_name="monthly_activity"
+    )
+    month = models.DateField()
+    article_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["redactor", "month"], name="unique_redactor_month"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["month", "-article_count"], name="redactor_month_activity_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.redactor_id} {self.month:%Y-%m}: {self.article_count}"
+
+
+class RedactorTopicActivity(models.Model):
+    """How many of a redactor's newspapers cover a topic; rows at zero are removed."""
+
+    redactor = models.ForeignKey(
+        Redactor, on_delete=models.CASCADE, related_name="topic_activity"
+    )
+    topic = models.ForeignKey(Topic, on_delete=models.CASCADE, related_name="+")
+    article_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["redactor", "topic"], name="unique_redactor_topic"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.redactor_id} topic {self.topic_id}: {self.article_count}"
+
+
+class NewspaperNeighbour(models.Model):
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="neighbours"
+    )
+    neighbour = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="+"
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ["rank"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["newspaper", "rank"], name="unique_newspaper_neighbour_rank"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.newspaper_id} -> {self.neighbour_id} ({self.score:.3f})"
+
+
+class DailyPublicationCount(models.Model):
+    day = models.DateField(unique=True)
+    count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day}: {self.count}"
+
+
+class DailyTopicCount(models.Model):
+    day = models.DateField()
+    topic = models.ForeignKey(Topic, on_delete=models.CASCADE, related_name="+")
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "topic"], name="unique_daily_topic"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.topic_id}: {self.count}"
+
+
+class DailyRedactorCount(models.Model):
+    day = models.DateField()
+    redactor = models.ForeignKey(Redactor, on_delete=models.CASCADE, related_name="+")
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["day", "redactor"], name="unique_daily_redactor"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.redactor_id}: {self.count}"
+
+
+class NewspaperRevision(models.Model):
+    newspaper = models.ForeignKey(
+        Newspaper, on_delete=models.CASCADE, related_name="revisions"
+    )
+    number = models.PositiveIntegerField()
+    is_snapshot = models.BooleanField(default=False)
+    depth = models.PositiveSmallIntegerField(default=0)
+    body = models.TextField()
+    length = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-number"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["newspaper", "number"], name="unique_newspaper_revision"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.newspaper_id} revision {self.number}"
+
+
+class Job(models.Model):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = (
+        (PENDING, "Pending"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    )
+
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    dedup_key = models.CharField(max_length=64)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="job_status_run_after_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedup_key"],
+                condition=models.Q(status="pending"),
+                name="unique_pending_job",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
+class Counter(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} = {self.value}"
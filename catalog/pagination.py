@@ -0,0 +1,120 @@
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def get_table_estimate(model, using="default"):
+    """Row count from the planner statistics, or None where the database keeps none."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 until the table has been vacuumed or analyzed.
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+def is_filtered(queryset):
+    query = queryset.query
+    return bool(query.where) or query.distinct or query.low_mark or query.high_mark is not None
+
+
+def get_exact_count_threshold():
+    return getattr(settings, "CATALOG_EXACT_COUNT_THRESHOLD", 10000)
+
+
+def get_count_cap():
+    return getattr(settings, "CATALOG_COUNT_CAP", 10000)
+
+
+class EstimatedPage(Page):
+    """Page that knows whether a next page exists from one extra fetched row."""
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def has_next(self):
+        return self._has_next
+
+    def end_index(self):
+        return self.start_index() + len(self.object_list) - 1 if self.object_list else 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that avoids an exact COUNT(*) over large querysets.
+
+    Unfiltered querysets take their count from ``counter_name`` when given,
+    otherwise from the planner statistics; filtered ones count at most
+    CATALOG_COUNT_CAP rows. Below CATALOG_EXACT_COUNT_THRESHOLD rows the
+    count is exact. Pages fetch one extra row, so next links stay correct
+    whatever the count says.
+    """
+
+    is_estimated = False
+    is_capped = False
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True, counter_name=None):
+        super().__init__(object_list, per_page, orphans, allow_empty_first_page)
+        self.counter_name = counter_name
+
+    @property
+    def is_exact(self):
+        return not (self.is_estimated or self.is_capped)
+
+    def get_estimate(self):
+        queryset = self.object_list
+        if self.counter_name:
+            from catalog.counters import get_value
+
+            value = get_value(self.counter_name)
+            if value is not None:
+                return value
+        return get_table_estimate(queryset.model, queryset.db)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return super().count
+        if not is_filtered(queryset):
+            estimate = self.get_estimate()
+            if estimate is not None and estimate >= get_exact_count_threshold():
+                self.is_estimated = True
+                return estimate
+            return super().count
+        cap = get_count_cap()
+        count = queryset.order_by()[:cap + 1].count()
+        if count > cap:
+            self.is_capped = True
+            return cap
+        return count
+
+    def validate_number(self, number):
+        if self.count is not None and self.is_exact:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        objects = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if not objects and number > 1:
+            raise EmptyPage("That page contains no results")
+        return EstimatedPage(
+            objects[:self.per_page], number, self, has_next=len(objects) > self.per_page
+        )
@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.template.base import Node, Template, TextNode, VariableNode
+from django.template.loader_tags import BlockNode, IncludeNode
+
+_current = ContextVar("catalog_template_profile", default=None)
+_installed = False
+_install_lock = threading.Lock()
+
+recent = deque(maxlen=50)
+totals = {}
+_totals_lock = threading.Lock()
+
+
+def is_enabled():
+    return getattr(settings, "CATALOG_TEMPLATE_PROFILING", False)
+
+
+class Profile:
+    """Cumulative (inclusive) render time and call count per template, block, include and tag."""
+
+    def __init__(self):
+        self.entries = {}
+
+    def record(self, key, duration):
+        entry = self.entries.setdefault(key, [0.0, 0])
+        entry[0] += duration
+        entry[1] += 1
+
+    def as_list(self, limit=None):
+        rows = [
+            {"name": key, "ms": round(seconds * 1000, 3), "calls": calls}
+            for key, (seconds, calls) in self.entries.items()
+        ]
+        rows.sort(key=lambda row: row["ms"], reverse=True)
+        return rows[:limit]
+
+
+def node_key(node):
+    if isinstance(node, BlockNode):
+        return f"block {node.name}"
+    if isinstance(node, IncludeNode):
+        name = node.template.var
+        return f"include {getattr(name, 'var', name)}"
+    if isinstance(node, VariableNode):
+        filters = [func.__name__ for func, args in node.filter_expression.filters]
+        return f"filter {'|'.join(filters)}" if filters else "variable"
+    token = getattr(node, "token", None)
+    if token is not None and token.contents:
+        return f"tag {token.contents.split()[0]}"
+    return f"node {type(node).__name__}"
+
+
+def install():
+    """Wrap template and node rendering once per process; a no-op while no profile is active."""
+    global _installed
+    with _install_lock:
+        if _installed:
+            return
+        template_render = Template.render
+        node_render = Node.render_annotated
+
+        def render(self, context):
+            profile = _current.get()
+            if profile is None:
+                return template_render(self, context)
+            start = time.perf_counter()
+            try:
+                return template_render(self, context)
+            finally:
+                name = self.origin.template_name if self.origin else None
+                profile.record(f"template {name or self.name or '<string>'}", time.perf_counter() - start)
+
+        def render_annotated(self, context):
+            profile = _current.get()
+            if profile is None or isinstance(self, TextNode):
+                return node_render(self, context)
+            start = time.perf_counter()
+            try:
+                return node_render(self, context)
+            finally:
+                profile.record(node_key(self), time.perf_counter() - start)
+
+        Template.render = render
+        Node.render_annotated = render_annotated
+        _installed = True
+
+
+@contextmanager
+def collect():
+    install()
+    profile = Profile()
+    token = _current.set(profile)
+    try:
+        yield profile
+    finally:
+        _current.reset(token)
+
+
+def store(path, profile, limit=30):
+    recent.append({"path": path, "entries": profile.as_list(limit)})
+    with _totals_lock:
+        for key, (seconds, calls) in profile.entries.items():
+            entry = totals.setdefault(key, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+
+
+def get_report(limit=30):
+    with _totals_lock:
+        total = Profile()
+        total.entries = {key: list(value) for key, value in totals.items()}
+    return {"totals": total.as_list(limit), "recent": list(recent)}
+
+
+def reset():
+    recent.clear()
+    with _totals_lock:
+        totals.clear()
+
+
+class TemplateProfilerMiddleware:
+    """Profile template rendering of every request while CATALOG_TEMPLATE_PROFILING is on."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not is_enabled():
+            return self.get_response(request)
+        # Template responses are rendered before they come back up the chain.
+        with collect() as profile:
+            response = self.get_response(request)
+        store(request.path, profile)
+        return response
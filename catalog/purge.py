@@ -0,0 +1,123 @@
+import logging
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connections, transaction
+from django.utils import timezone
+
+from catalog.models import Newspaper, Redactor, Topic
+from catalog.signals import newspapers_bulk_changed
+
+
+logger = logging.getLogger(__name__)
+
+# Model -> Newspaper relation whose through rows reference it.
+RELATIONS = {Topic: "topics", Redactor: "publishers"}
+
+MIN_BATCH_SIZE = 10
+
+
+def get_batch_size():
+    return getattr(settings, "CATALOG_PURGE_BATCH_SIZE", 1000)
+
+
+def get_max_lock_seconds():
+    return getattr(settings, "CATALOG_PURGE_MAX_LOCK_SECONDS", 1.0)
+
+
+def get_through(model):
+    field = Newspaper._meta.get_field(RELATIONS[model])
+    through = field.remote_field.through
+    return through, field.m2m_field_name() + "_id", field.m2m_reverse_field_name() + "_id"
+
+
+def soft_delete(obj):
+    """
+    Hide ``obj`` at once and schedule the removal of its newspaper links.
+
+    The row itself is deleted by the purge job once no links are left.
+    """
+    from catalog.tasks import purge_deleted
+
+    with transaction.atomic():
+        obj.deleted_at = timezone.now()
+        update_fields = ["deleted_at"]
+        if isinstance(obj, Redactor):
+            obj.is_active = False
+            update_fields.append("is_active")
+        obj.save(update_fields=update_fields)
+        purge_deleted.enqueue(obj._meta.label_lower, obj.pk)
+
+
+def limit_statement_time(connection, seconds):
+    # Keeps any single batch from holding its locks longer than the limit.
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL statement_timeout = %s", [int(seconds * 1000)])
+
+
+def purge_links(model, pk, batch_size=None, progress=None):
+    """
+    Delete the through rows linking newspapers to ``model`` ``pk`` in batches.
+
+    Each batch runs in its own short transaction. The batch size halves when
+    a batch is slower than CATALOG_PURGE_MAX_LOCK_SECONDS or hits the
+    statement timeout and grows back when batches are fast. ``progress`` is
+    called with the running total after every batch.
+    """
+    through, source, target = get_through(model)
+    relation = RELATIONS[model]
+    max_seconds = get_max_lock_seconds()
+    size = batch_size or get_batch_size()
+    ceiling = size * 10
+    removed = 0
+    while True:
+        started = time.monotonic()
+        try:
+            with transaction.atomic():
+                connection = connections[through.objects.db]
+                limit_statement_time(connection, max_seconds)
+                rows = list(
+                    through.objects.filter(**{target: pk})
+                    .order_by("pk")
+                    .values_list("pk", source)[:size]
+                )
+                if not rows:
+                    break
+                through.objects.filter(pk__in=[row[0] for row in rows]).delete()
+                newspaper_ids = [row[1] for row in rows]
+                newspapers_bulk_changed.send(
+                    sender=Newspaper,
+                    action=f"remove_{relation}",
+                    newspaper_ids=newspaper_ids,
+                    topic_ids={pk} if relation == "topics" else set(),
+                    redactor_ids={pk} if relation == "publishers" else set(),
+                    count=len(newspaper_ids),
+                )
+        except OperationalError:
+            if size <= MIN_BATCH_SIZE:
+                raise
+            size = max(MIN_BATCH_SIZE, size // 2)
+            logger.warning("Purge batch of %s %s timed out, retrying with %d rows.", model.__name__, pk, size)
+            continue
+        elapsed = time.monotonic() - started
+        removed += len(rows)
+        if elapsed > max_seconds / 2:
+            size = max(MIN_BATCH_SIZE, size // 2)
+        elif elapsed < max_seconds / 10:
+            size = min(ceiling, size * 2)
+        logger.info("Purged %d %s links of %s %s.", removed, relation, model.__name__, pk)
+        if progress is not None:
+            progress(removed)
+    return removed
+
+
+def purge(model, pk, batch_size=None, progress=None):
+    """Remove a soft-deleted object's links, then the object itself."""
+    obj = model.all_objects.filter(pk=pk, deleted_at__isnull=False).first()
+    if obj is None:
+        return 0
+    removed = purge_links(model, pk, batch_size, progress)
+    with transaction.atomic():
+        obj.delete()
+    return removed
@@ -0,0 +1,227 @@
+import fcntl
+import hashlib
+import math
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.http import HttpResponse
+
+from catalog import metrics
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+# Slot of the file backend: key hash, tokens, last update.
+SLOT = struct.Struct("<Qdd")
+
+
+def is_enabled():
+    return getattr(settings, "CATALOG_RATE_LIMITING", True)
+
+
+def get_rules():
+    return getattr(settings, "CATALOG_RATE_LIMITS", {})
+
+
+def get_proxy_count():
+    return getattr(settings, "CATALOG_RATE_LIMIT_PROXY_COUNT", 0)
+
+
+def refill(tokens, updated, now, rate, burst):
+    """Tokens after refilling at ``rate`` per second since ``updated``, capped at ``burst``."""
+    return min(burst, tokens + max(now - updated, 0) * rate)
+
+
+class LocalBackend:
+    """
+    Buckets of this process only.
+
+    Least recently used buckets beyond CATALOG_RATE_LIMIT_LOCAL_SIZE are
+    dropped, and buckets that have refilled are swept out every
+    SWEEP_INTERVAL seconds; a missing bucket is a full one.
+    """
+
+    SWEEP_INTERVAL = 60
+
+    def __init__(self, size=None):
+        self.size = size or getattr(settings, "CATALOG_RATE_LIMIT_LOCAL_SIZE", 10000)
+        # Key to tokens, last update and when the bucket is full again.
+        self.buckets = OrderedDict()
+        self.swept = time.time()
+        self.lock = threading.Lock()
+
+    def take(self, key, rate, burst, now=None):
+        """Take a token; returns 0 when allowed, otherwise the seconds until one is available."""
+        return self.take_all([(key, rate, burst)], now)[0]
+
+    def take_all(self, requests, now=None):
+        """
+        Take a token from every (key, rate, burst) bucket, or from none of them.
+
+        Returns the seconds each bucket needs until it has a token, all 0 when
+        the tokens were taken.
+        """
+        now = time.time() if now is None else now
+        with self.lock:
+            levels = []
+            for key, rate, burst in requests:
+                tokens, updated, _ = self.buckets.get(key, (burst, now, now))
+                levels.append(refill(tokens, updated, now, rate, burst))
+            allowed = all(tokens >= 1 for tokens in levels)
+            waits = []
+            for (key, rate, burst), tokens in zip(requests, levels):
+                if allowed:
+                    tokens -= 1
+                self.buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+                self.buckets.move_to_end(key)
+                waits.append(0 if allowed or tokens >= 1 else (1 - tokens) / rate)
+            self.evict(now)
+        return waits
+
+    def evict(self, now):
+        if now - self.swept >= self.SWEEP_INTERVAL:
+            self.swept = now
+            for key in [key for key, (_, _, full_at) in self.buckets.items() if full_at <= now]:
+                del self.buckets[key]
+        while len(self.buckets) > self.size:
+            self.buckets.popitem(last=False)
+
+
+class FileBackend:
+    """
+    Buckets shared by every process on the host through one file.
+
+    The file is a fixed table of slots addressed by key hash; each take locks
+    only its slots' byte ranges. Two keys hashing to the same slot reset each
+    other's bucket, which errs on the side of allowing requests.
+    """
+
+    def __init__(self, path, slots=65536):
+        self.slots = slots
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+    def take(self, key, rate, burst, now=None):
+        return self.take_all([(key, rate, burst)], now)[0]
+
+    def take_all(self, requests, now=None):
+        """Like ``LocalBackend.take_all``, with the slots locked in offset order."""
+        now = time.time() if now is None else now
+        digests = [
+            int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+            for key, _, _ in requests
+        ]
+        offsets = [(digest % self.slots) * SLOT.size for digest in digests]
+        locked = []
+        try:
+            slots = {}
+            for offset in sorted(set(offsets)):
+                fcntl.lockf(self.fd, fcntl.LOCK_EX, SLOT.size, offset)
+                locked.append(offset)
+                data = os.pread(self.fd, SLOT.size, offset)
+                slots[offset] = SLOT.unpack(data) if len(data) == SLOT.size else (0, 0.0, 0.0)
+            levels = []
+            for (key, rate, burst), digest, offset in zip(requests, digests, offsets):
+                stored, tokens, updated = slots[offset]
+                if stored != digest:
+                    tokens, updated = burst, now
+                levels.append(refill(tokens, updated, now, rate, burst))
+            allowed = all(tokens >= 1 for tokens in levels)
+            waits = []
+            for (key, rate, burst), digest, offset, tokens in zip(requests, digests, offsets, levels):
+                if allowed:
+                    tokens -= 1
+                slots[offset] = (digest, tokens, now)
+                os.pwrite(self.fd, SLOT.pack(digest, tokens, now), offset)
+                waits.append(0 if allowed or tokens >= 1 else (1 - tokens) / rate)
+        finally:
+            for offset in locked:
+                fcntl.lockf(self.fd, fcntl.LOCK_UN, SLOT.size, offset)
+        return waits
+
+
+def get_backend():
+    global _backend
+    with _backend_lock:
+        # Forked workers reopen the file rather than share its descriptor.
+        if _backend is None or _backend.pid != os.getpid():
+            if getattr(settings, "CATALOG_RATE_LIMIT_BACKEND", "local") == "file":
+                _backend = FileBackend(settings.CATALOG_RATE_LIMIT_FILE)
+            else:
+                _backend = LocalBackend()
+            _backend.pid = os.getpid()
+        return _backend
+
+
+def reset():
+    global _backend
+    with _backend_lock:
+        _backend = None
+
+
+def client_ip(request):
+    """The client address, skipping CATALOG_RATE_LIMIT_PROXY_COUNT proxies in X-Forwarded-For."""
+    proxies = get_proxy_count()
+    if proxies:
+        forwarded = [part.strip() for part in request.headers.get("X-Forwarded-For", "").split(",") if part.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def get_rule(request, view_name):
+    rule = get_rules().get(view_name)
+    if rule is None:
+        return None
+    if "methods" in rule and request.method not in rule["methods"]:
+        return None
+    if "params" in rule and not any(request.GET.get(param) for param in rule["params"]):
+        return None
+    return rule
+
+
+def check(request, view_name, rule):
+    """Seconds the client must wait, or 0; takes a token from both the user and the IP bucket, or from neither."""
+    buckets = []
+    user = getattr(request, "user", None)
+    if "user" in rule and user is not None and user.is_authenticated:
+        buckets.append(("user", f"user:{user.pk}", rule["user"]))
+    if "ip" in rule:
+        buckets.append(("ip", f"ip:{client_ip(request)}", rule["ip"]))
+    if not buckets:
+        return 0
+    waits = get_backend().take_all(
+        [(f"{view_name}:{key}", per_minute / 60, burst) for _, key, (per_minute, burst) in buckets]
+    )
+    for (scope, _, _), retry_after in zip(buckets, waits):
+        metrics.RATE_LIMIT_REQUESTS.labels(view_name, scope, "limited" if retry_after else "allowed").inc()
+    return max(waits)
+
+
+class RateLimitMiddleware:
+    """Answer 429 when a client runs out of tokens for the URL name's CATALOG_RATE_LIMITS rule."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not is_enabled():
+            return None
+        view_name = request.resolver_match.view_name
+        rule = get_rule(request, view_name)
+        if rule is None:
+            return None
+        wait = check(request, view_name, rule)
+        if not wait:
+            return None
+        response = HttpResponse("Too many requests, try again later.", status=429, content_type="text/plain")
+        response["Retry-After"] = str(max(math.ceil(wait), 1))
+        return response
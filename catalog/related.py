@@ -0,0 +1,247 @@
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+from scipy import sparse
+
+from catalog.models import Newspaper, NewspaperNeighbour
+
+
+def get_neighbour_count():
+    return getattr(settings, "CATALOG_RELATED_COUNT", 6)
+
+
+def get_metric():
+    return getattr(settings, "CATALOG_RELATED_METRIC", "jaccard")
+
+
+def get_batch_size():
+    return getattr(settings, "CATALOG_RELATED_BATCH_SIZE", 200)
+
+
+def chunked(values, size=1000):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def live_links(relation):
+    """Through rows of ``relation`` whose topic or publisher is not deleted, and their target column."""
+    if relation == "topics":
+        return Newspaper.topics.through.objects.filter(topic__deleted_at__isnull=True), "topic_id"
+    return Newspaper.publishers.through.objects.filter(redactor__deleted_at__isnull=True), "redactor_id"
+
+
+def load_links(relation, newspaper_ids=None):
+    links, target = live_links(relation)
+    if newspaper_ids is None:
+        rows = list(links.values_list("newspaper_id", target))
+    else:
+        rows = []
+        for chunk in chunked(newspaper_ids):
+            rows.extend(links.filter(newspaper_id__in=chunk).values_list("newspaper_id", target))
+    return np.array(rows, dtype=np.int64).reshape(-1, 2)
+
+
+def load_features(newspaper_ids=None):
+    """
+    Newspaper ids and the binary newspaper x (topic + publisher) matrix, of
+    every newspaper or only of ``newspaper_ids``.
+
+    Newspapers without live topics or publishers have no row.
+    """
+    topic_links = load_links("topics", newspaper_ids)
+    publisher_links = load_links("publishers", newspaper_ids)
+
+    ids = np.unique(np.concatenate([topic_links[:, 0], publisher_links[:, 0]]))
+    topic_ids, topic_cols = np.unique(topic_links[:, 1], return_inverse=True)
+    publisher_cols = np.unique(publisher_links[:, 1], return_inverse=True)[1] + len(topic_ids)
+    rows = np.searchsorted(ids, np.concatenate([topic_links[:, 0], publisher_links[:, 0]]))
+    cols = np.concatenate([topic_cols, publisher_cols])
+    width = int(cols.max()) + 1 if len(cols) else 0
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)), shape=(len(ids), width)
+    )
+    return ids, matrix
+
+
+def neighbourhood(newspaper_ids):
+    """The given newspapers and every newspaper sharing a live topic or publisher with them."""
+    found = set(newspaper_ids)
+    for relation in ("topics", "publishers"):
+        links, target = live_links(relation)
+        for chunk in chunked(newspaper_ids):
+            shared = links.filter(newspaper_id__in=chunk).values(target)
+            found.update(links.filter(**{f"{target}__in": shared}).values_list("newspaper_id", flat=True))
+    return found
+
+
+def positions_of(ids, newspaper_ids):
+    """Matrix rows of the given newspapers, skipping those without a row."""
+    wanted = np.asarray(sorted(newspaper_ids), dtype=np.int64)
+    positions = np.searchsorted(ids, wanted)
+    found = positions < len(ids)
+    found[found] = ids[positions[found]] == wanted[found]
+    return positions[found]
+
+
+def similarity(shared, size_a, size_b, metric):
+    if metric == "cosine":
+        return shared / np.sqrt(size_a * size_b)
+    return shared / (size_a + size_b - shared)
+
+
+def top_neighbours(ids, matrix, rows, k=None, metric=None, batch_size=None):
+    """
+    Yield ``{newspaper_id: [(neighbour_id, score), ...]}`` for ``rows`` batch by batch.
+
+    Similarities of a whole batch come from one sparse product with the
+    transposed matrix, so only newspapers sharing a topic or publisher
+    with the batch are ever scored. Ties go to the newer newspaper.
+    """
+    k = k or get_neighbour_count()
+    metric = metric or get_metric()
+    batch_size = batch_size or get_batch_size()
+    sizes = np.asarray(matrix.sum(axis=1)).ravel()
+    transposed = matrix.T.tocsr()
+    for start in range(0, len(rows), batch_size):
+        batch = np.asarray(rows[start:start + batch_size])
+        product = (matrix[batch] @ transposed).tocoo()
+        local, cols, shared = product.row, product.col, product.data
+        sources = batch[local]
+        keep = cols != sources
+        local, cols, shared, sources = local[keep], cols[keep], shared[keep], sources[keep]
+        scores = similarity(shared, sizes[sources], sizes[cols], metric)
+
+        order = np.lexsort((-ids[cols], -scores, local))
+        local, cols, scores = local[order], cols[order], scores[order]
+        ranks = np.arange(len(local)) - np.searchsorted(local, local)
+        keep = ranks < k
+        local, cols, scores = local[keep], cols[keep], scores[keep]
+
+        result = {int(ids[row]): [] for row in batch}
+        for row, col, score in zip(ids[batch[local]].tolist(), ids[cols].tolist(), scores.tolist()):
+            result[row].append((col, score))
+        yield result
+
+
+def write_neighbours(result, replace=True):
+    rows = [
+        NewspaperNeighbour(newspaper_id=newspaper_id, neighbour_id=neighbour_id, rank=rank, score=score)
+        for newspaper_id, neighbours in result.items()
+        for rank, (neighbour_id, score) in enumerate(neighbours, start=1)
+    ]
+    with transaction.atomic():
+        changed = set(result)
+        if replace:
+            existing = NewspaperNeighbour.objects.filter(newspaper_id__in=list(result))
+            before = set(existing.values_list("newspaper_id", "rank", "neighbour_id"))
+            after = {(row.newspaper_id, row.rank, row.neighbour_id) for row in rows}
+            changed = {row[0] for row in before ^ after}
+            existing.delete()
+        NewspaperNeighbour.objects.bulk_create(rows)
+        # The related list is part of the detail page, see NewspaperDetailView.
+        Newspaper.objects.filter(pk__in=list(changed)).update(updated_at=timezone.now())
+
+
+# Flags are set even when already set: the update then waits for a running
+# refresh_stale, which holds the rows locked until it clears their flags,
+# and marks them again for the next run.
+def mark_stale(newspaper_ids):
+    for chunk in chunked(newspaper_ids):
+        Newspaper.objects.filter(pk__in=chunk).update(related_stale=True)
+
+
+def mark_referrers_stale(newspaper_ids):
+    for chunk in chunked(newspaper_ids):
+        Newspaper.objects.filter(neighbours__neighbour_id__in=chunk).update(related_stale=True)
+
+
+def forget(newspaper_ids):
+    """Drop the neighbour rows of newspapers that are about to be deleted."""
+    mark_referrers_stale(newspaper_ids)
+    NewspaperNeighbour.objects.filter(neighbour_id__in=newspaper_ids).delete()
+    NewspaperNeighbour.objects.filter(newspaper_id__in=newspaper_ids).delete()
+
+
+def find_affected(ids, matrix, changed, k, metric):
+    """
+    Newspapers whose neighbour lists may differ after ``changed`` changed.
+
+    Those are the changed newspapers, the ones listing them as neighbours
+    and the ones they now score above the current last neighbour of.
+    """
+    affected = set(changed)
+    for chunk in chunked(changed):
+        affected.update(
+            NewspaperNeighbour.objects.filter(neighbour_id__in=chunk).values_list("newspaper_id", flat=True)
+        )
+
+    positions = positions_of(ids, changed)
+    if not len(positions):
+        return affected
+    sizes = np.asarray(matrix.sum(axis=1)).ravel()
+    product = (matrix @ matrix[positions].T).tocoo()
+    rows, targets = product.row, positions[product.col]
+    keep = rows != targets
+    rows, targets, shared = rows[keep], targets[keep], product.data[keep]
+    best = np.zeros(len(ids))
+    np.maximum.at(best, rows, similarity(shared, sizes[rows], sizes[targets], metric))
+
+    candidates = np.flatnonzero(best)
+    for chunk in chunked(candidates.tolist()):
+        chunk_ids = ids[chunk].tolist()
+        thresholds = {
+            row["newspaper_id"]: row
+            for row in NewspaperNeighbour.objects.filter(newspaper_id__in=chunk_ids)
+            .values("newspaper_id")
+            .annotate(count=Count("pk"), lowest=Min("score"))
+            .order_by()
+        }
+        for position, newspaper_id in zip(chunk, chunk_ids):
+            current = thresholds.get(newspaper_id)
+            if current is None or current["count"] < k or best[position] > current["lowest"]:
+                affected.add(newspaper_id)
+    return affected
+
+
+def refresh_stale(k=None, metric=None):
+    """
+    Recompute the neighbours of every newspaper affected by changes since the last run.
+
+    Only the links of newspapers near the changed ones are loaded. The stale
+    flags are cleared in the transaction that writes the new neighbours, so a
+    failed run leaves them for the retry.
+    """
+    k = k or get_neighbour_count()
+    metric = metric or get_metric()
+    with transaction.atomic():
+        stale = set(Newspaper.objects.select_for_update().filter(related_stale=True).values_list("pk", flat=True))
+        if not stale:
+            return 0
+        # Scoring the changed newspapers needs the full rows of their candidates...
+        ids, matrix = load_features(neighbourhood(stale))
+        affected = find_affected(ids, matrix, stale, k, metric)
+        # ...and ranking the affected ones the full rows of theirs.
+        ids, matrix = load_features(neighbourhood(affected))
+        computed = set()
+        for result in top_neighbours(ids, matrix, positions_of(ids, affected), k, metric):
+            write_neighbours(result)
+            computed.update(result)
+        # Affected newspapers without any topic or publisher have no neighbours.
+        for chunk in chunked(affected - computed):
+            NewspaperNeighbour.objects.filter(newspaper_id__in=chunk).delete()
+        for chunk in chunked(stale):
+            Newspaper.objects.filter(pk__in=chunk).update(related_stale=False)
+    return len(affected)
+
+
+def rebuild(k=None, metric=None):
+    """Recompute every neighbour list from scratch."""
+    Newspaper.objects.filter(related_stale=True).update(related_stale=False)
+    NewspaperNeighbour.objects.all().delete()
+    ids, matrix = load_features()
+    for result in top_neighbours(ids, matrix, np.arange(len(ids)), k, metric):
+        write_neighbours(result, replace=False)
+    return len(ids)
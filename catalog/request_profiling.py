@@ -0,0 +1,271 @@
+import json
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SALT = "catalog.request-profiling"
+NAME = re.compile(r"^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$")
+
+
+def get_directory():
+    return getattr(settings, "CATALOG_REQUEST_PROFILING_DIR", settings.BASE_DIR / "run" / "profiles")
+
+
+def get_sample_rate():
+    return getattr(settings, "CATALOG_REQUEST_PROFILING_SAMPLE_RATE", 0.0)
+
+
+def get_interval():
+    return getattr(settings, "CATALOG_REQUEST_PROFILING_INTERVAL", 0.002)
+
+
+def get_max_files():
+    return getattr(settings, "CATALOG_REQUEST_PROFILING_MAX_FILES", 200)
+
+
+def get_max_age():
+    return getattr(settings, "CATALOG_REQUEST_PROFILING_MAX_AGE", 7 * 24 * 60 * 60)
+
+
+def get_token_max_age():
+    return getattr(settings, "CATALOG_REQUEST_PROFILING_TOKEN_MAX_AGE", 60 * 60)
+
+
+def make_token():
+    """Signed token for the X-Catalog-Profile header, for clients without a staff session."""
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(uuid.uuid4().hex[:8])
+
+
+def check_token(token):
+    try:
+        signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=get_token_max_age())
+    except signing.BadSignature:
+        return False
+    return True
+
+
+def get_trigger(request):
+    """Why ``request`` should be profiled, or None."""
+    token = request.headers.get("X-Catalog-Profile")
+    if token and check_token(token):
+        return "token"
+    if "_profile" in request.GET and getattr(request, "user", None) is not None and request.user.is_staff:
+        return "staff"
+    rate = get_sample_rate()
+    if rate and random.random() < rate:
+        return "sample"
+    return None
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ",")
+
+
+class Sampler:
+    """Samples the stack of one thread from a helper thread into collapsed stack counts."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="catalog-profiler", daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stopped.set()
+        self.thread.join()
+
+
+class QueryTimeline:
+    """Start offset, duration and SQL of every query, on every database connection."""
+
+    def __init__(self, started):
+        self.started = started
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "alias": context["connection"].alias,
+                    "start_ms": round((start - self.started) * 1000, 3),
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                    "sql": sql[:2000],
+                }
+            )
+
+
+def store(profile):
+    directory = get_directory()
+    os.makedirs(directory, exist_ok=True)
+    name = f"{datetime.now(dt_timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+    path = os.path.join(directory, f"{name}.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as file:
+        json.dump(profile, file)
+    os.replace(path + ".tmp", path)
+    prune()
+    return name
+
+
+def prune():
+    """Drop profiles past the age limit, then the oldest ones past the count limit."""
+    names = list_names()
+    cutoff = time.time() - get_max_age()
+    for index, name in enumerate(names):
+        path = os.path.join(get_directory(), f"{name}.json")
+        try:
+            if index >= get_max_files() or os.path.getmtime(path) < cutoff:
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def list_names():
+    """Stored profile names, newest first."""
+    try:
+        files = os.listdir(get_directory())
+    except FileNotFoundError:
+        return []
+    return sorted((name[:-5] for name in files if name.endswith(".json") and NAME.match(name[:-5])), reverse=True)
+
+
+def load(name):
+    if not NAME.match(name):
+        return None
+    try:
+        with open(os.path.join(get_directory(), f"{name}.json"), encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return None
+
+
+def list_profiles(limit=100):
+    profiles = []
+    for name in list_names()[:limit]:
+        profile = load(name)
+        if profile is not None:
+            profile.pop("stacks", None)
+            profile["query_count"] = len(profile.pop("queries", []))
+            profiles.append(dict(profile, name=name))
+    return profiles
+
+
+def collapsed(profile):
+    """The stacks in the folded format read by flamegraph.pl and speedscope."""
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(profile["stacks"].items()))
+
+
+def flame_rows(stacks, min_percent=0.2):
+    """
+    Boxes of a flame graph (root at the top) as rows of depth, left and width.
+
+    Left and width are percentages of all samples; boxes narrower than
+    ``min_percent`` are left out.
+    """
+    root = {"children": {}, "count": 0}
+    for stack, count in stacks.items():
+        node = root
+        node["count"] += count
+        for label in stack.split(";"):
+            node = node["children"].setdefault(label, {"children": {}, "count": 0})
+            node["count"] += count
+    total = root["count"] or 1
+    boxes = []
+
+    def walk(node, depth, left):
+        for label, child in sorted(node["children"].items()):
+            width = 100 * child["count"] / total
+            if width >= min_percent:
+                boxes.append(
+                    {
+                        "label": label,
+                        "depth": depth,
+                        "left": round(left, 3),
+                        "width": round(width, 3),
+                        "samples": child["count"],
+                    }
+                )
+                walk(child, depth + 1, left)
+            left += width
+
+    walk(root, 0, 0.0)
+    return boxes
+
+
+class RequestProfilerMiddleware:
+    """
+    Profile requests that ask for it and a sample of the others.
+
+    Staff add ``_profile`` to the query string; other clients send a token
+    from ``make_token`` in the X-Catalog-Profile header. The response names
+    the stored profile in its own X-Catalog-Profile header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        trigger = get_trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+        started = time.perf_counter()
+        timeline = QueryTimeline(started)
+        with ExitStack() as stack:
+            # Every alias: a connection first opened during the request is wrapped too.
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timeline))
+            with Sampler(threading.get_ident(), get_interval()) as sampler:
+                response = self.get_response(request)
+        duration = time.perf_counter() - started
+        try:
+            name = store(
+                {
+                    "method": request.method,
+                    "path": request.get_full_path(),
+                    "status": response.status_code,
+                    "trigger": trigger,
+                    "started_at": datetime.now(dt_timezone.utc).isoformat(),
+                    "duration_ms": round(duration * 1000, 3),
+                    "interval_ms": get_interval() * 1000,
+                    "stacks": dict(sampler.stacks),
+                    "queries": timeline.queries,
+                }
+            )
+        except OSError:
+            logger.exception("Could not store the profile of %s.", request.path)
+        else:
+            response.headers["X-Catalog-Profile"] = name
+        return response
@@ -0,0 +1,172 @@
+import difflib
+import json
+
+from django.conf import settings
+from django.db import transaction
+
+from catalog import archive
+from catalog.models import Newspaper, NewspaperRevision
+
+
+def get_max_deltas():
+    return getattr(settings, "CATALOG_REVISIONS_MAX_DELTAS", 10)
+
+
+def compute_delta(old, new):
+    """
+    Line-based delta turning ``old`` into ``new``.
+
+    Positive integers copy that many lines from the source, negative
+    integers skip them and lists of strings are inserted verbatim.
+    """
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    ops = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append(i2 - i1)
+            continue
+        if i2 > i1:
+            ops.append(i1 - i2)
+        if j2 > j1:
+            ops.append(new_lines[j1:j2])
+    return ops
+
+
+def apply_delta(text, ops):
+    lines = text.splitlines(keepends=True)
+    position = 0
+    result = []
+    for op in ops:
+        if isinstance(op, list):
+            result.extend(op)
+        elif op > 0:
+            result.extend(lines[position:position + op])
+            position += op
+        else:
+            position -= op
+    return "".join(result)
+
+
+def reconstruct(revisions):
+    """Rebuild the content of the last revision in a snapshot-first chain."""
+    content = None
+    for revision in revisions:
+        if revision.is_snapshot:
+            content = revision.body
+        else:
+            content = apply_delta(content, json.loads(revision.body))
+    return content
+
+
+def get_chain(newspaper_id, number):
+    revision = NewspaperRevision.objects.only("depth").get(
+        newspaper_id=newspaper_id, number=number
+    )
+    return NewspaperRevision.objects.filter(
+        newspaper_id=newspaper_id,
+        number__gte=number - revision.depth,
+        number__lte=number,
+    ).order_by("number")
+
+
+def get_revision_content(newspaper_id, number):
+    return reconstruct(get_chain(newspaper_id, number))
+
+
+def record_revision(newspaper):
+    """
+    Append a revision for ``newspaper.content`` unless it matches the latest one.
+
+    A full snapshot is stored for the first revision, whenever the delta chain
+    would grow past ``CATALOG_REVISIONS_MAX_DELTAS`` and whenever the delta
+    would not be smaller than the text itself.
+    """
+    content = newspaper.content
+    with transaction.atomic():
+        latest = (
+            NewspaperRevision.objects.select_for_update()
+            .filter(newspaper=newspaper)
+            .only("number", "depth")
+            .order_by("-number")
+            .first()
+        )
+        if latest is None:
+            return NewspaperRevision.objects.create(
+                newspaper=newspaper,
+                number=1,
+                is_snapshot=True,
+                depth=0,
+                body=content,
+                length=len(content),
+            )
+
+        previous = get_revision_content(newspaper.pk, latest.number)
+        if previous == content:
+            return None
+
+        revision = NewspaperRevision(
+            newspaper=newspaper, number=latest.number + 1, length=len(content)
+        )
+        body = json.dumps(compute_delta(previous, content), separators=(",", ":"))
+        if latest.depth + 1 > get_max_deltas() or len(body) >= len(content):
+            revision.is_snapshot = True
+            revision.depth = 0
+            revision.body = content
+        else:
+            revision.depth = latest.depth + 1
+            revision.body = body
+        revision.save()
+        return revision
+
+
+def record_current_revision(newspaper_id):
+    """
+    Append a revision for the content the newspaper has now.
+
+    The row is read under a lock, so of concurrent saves the last to commit
+    is the last revision; ``record_revision`` alone would take the content
+    the caller happens to hold.
+    """
+    with transaction.atomic():
+        newspaper = Newspaper.objects.select_for_update().filter(pk=newspaper_id).first()
+        if newspaper is None:
+            return None
+        return record_revision(archive.load(newspaper))
+
+
+def diff_revisions(newspaper_id, from_number, to_number):
+    """
+    Unified diff lines between two revisions.
+
+    Consecutive revisions are rendered straight from the stored delta, any
+    other pair is reconstructed from its own chain and compared with difflib.
+    """
+    if to_number == from_number + 1:
+        target = NewspaperRevision.objects.get(newspaper_id=newspaper_id, number=to_number)
+        if not target.is_snapshot:
+            source = get_revision_content(newspaper_id, from_number)
+            return list(_delta_lines(source, json.loads(target.body)))
+    source = get_revision_content(newspaper_id, from_number)
+    target = get_revision_content(newspaper_id, to_number)
+    lines = difflib.unified_diff(source.splitlines(), target.splitlines(), lineterm="")
+    # Skip the ---/+++ file header, the revision numbers are shown by the caller.
+    return list(lines)[2:]
+
+
+def _delta_lines(source, ops):
+    lines = source.splitlines()
+    position = 0
+    for op in ops:
+        if isinstance(op, list):
+            for line in op:
+                yield "+" + line.rstrip("\r\n")
+        elif op > 0:
+            for line in lines[position:position + op]:
+                yield " " + line
+            position += op
+        else:
+            for line in lines[position:position - op]:
+                yield "-" + line
+            position -= op
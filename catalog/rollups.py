@@ -0,0 +1,128 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from catalog.models import (
+    DailyPublicationCount,
+    DailyRedactorCount,
+    DailyTopicCount,
+    Newspaper,
+)
+
+
+def get_window_days():
+    return getattr(settings, "CATALOG_DASHBOARD_DAYS", 30)
+
+
+def day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def days_of(newspaper_ids):
+    """Local publication days of the given newspapers."""
+    return set(
+        Newspaper.objects.filter(pk__in=newspaper_ids)
+        .annotate(day=TruncDate("published_date"))
+        .values_list("day", flat=True)
+        .distinct()
+    )
+
+
+def refresh_day(day):
+    """Recompute the rollup rows of one day from that day's newspapers only."""
+    start, end = day_bounds(day)
+    published = {"newspaper__published_date__gte": start, "newspaper__published_date__lt": end}
+    count = Newspaper.objects.filter(published_date__gte=start, published_date__lt=end).count()
+    topics = (
+        Newspaper.topics.through.objects.filter(**published, topic__deleted_at__isnull=True)
+        .values("topic_id")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    redactors = (
+        Newspaper.publishers.through.objects.filter(**published, redactor__deleted_at__isnull=True)
+        .values("redactor_id")
+        .annotate(count=Count("pk"))
+        .order_by()
+    )
+    with transaction.atomic():
+        if count:
+            DailyPublicationCount.objects.update_or_create(day=day, defaults={"count": count})
+        else:
+            DailyPublicationCount.objects.filter(day=day).delete()
+        DailyTopicCount.objects.filter(day=day).delete()
+        DailyTopicCount.objects.bulk_create(
+            [DailyTopicCount(day=day, topic_id=row["topic_id"], count=row["count"]) for row in topics]
+        )
+        DailyRedactorCount.objects.filter(day=day).delete()
+        DailyRedactorCount.objects.bulk_create(
+            [DailyRedactorCount(day=day, redactor_id=row["redactor_id"], count=row["count"]) for row in redactors]
+        )
+
+
+def rebuild(progress=None):
+    """Recompute every day that has newspapers and drop rows of days that have none."""
+    days = (
+        Newspaper.objects.annotate(day=TruncDate("published_date"))
+        .values_list("day", flat=True)
+        .distinct()
+        .order_by("day")
+    )
+    days = list(days)
+    for day in days:
+        refresh_day(day)
+        if progress is not None:
+            progress(day)
+    DailyPublicationCount.objects.exclude(day__in=days).delete()
+    DailyTopicCount.objects.exclude(day__in=days).delete()
+    DailyRedactorCount.objects.exclude(day__in=days).delete()
+    return len(days)
+
+
+def get_dashboard(days=None, today=None, top=5):
+    """
+    Dashboard figures for the last ``days`` days, read from the rollup tables.
+
+    Every query reads at most one row per day (and topic or redactor) of the
+    window, whatever the size of the archive.
+    """
+    days = days or get_window_days()
+    today = today or timezone.localdate()
+    start = today - timedelta(days=days - 1)
+    counts = dict(
+        DailyPublicationCount.objects.filter(day__gte=start, day__lte=today).values_list("day", "count")
+    )
+    per_day = [
+        {"day": start + timedelta(days=offset), "count": counts.get(start + timedelta(days=offset), 0)}
+        for offset in range(days)
+    ]
+    per_week = {}
+    for row in per_day:
+        week = row["day"] - timedelta(days=row["day"].weekday())
+        per_week[week] = per_week.get(week, 0) + row["count"]
+    peak = max([row["count"] for row in per_day] + [1])
+    for row in per_day:
+        row["percent"] = round(100 * row["count"] / peak)
+    return {
+        "days": days,
+        "total": sum(counts.values()),
+        "per_day": per_day,
+        "per_week": [{"week": week, "count": count} for week, count in sorted(per_week.items())],
+        "top_topics": list(
+            DailyTopicCount.objects.filter(day__gte=start, day__lte=today, topic__deleted_at__isnull=True)
+            .values("topic__name")
+            .annotate(total=Sum("count"))
+            .order_by("-total", "topic__name")[:top]
+        ),
+        "top_redactors": list(
+            DailyRedactorCount.objects.filter(day__gte=start, day__lte=today, redactor__deleted_at__isnull=True)
+            .values("redactor__username")
+            .annotate(total=Sum("count"))
+            .order_by("-total", "redactor__username")[:top]
+        ),
+    }
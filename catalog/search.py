@@ -0,0 +1,182 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.urls import reverse
+
+from catalog.models import Newspaper, Redactor, Topic
+
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration of title searches. Migration 0006 builds the GIN
+# index with it; changing it takes a migration recreating that index.
+TITLE_SEARCH_CONFIG = "english"
+
+_executor = None
+_slots = None
+_executor_lock = threading.Lock()
+
+
+class SearchResult:
+    def __init__(self, kind, label, url, score=0.0):
+        self.kind = kind
+        self.label = label
+        self.url = url
+        self.score = score
+
+
+
+
+def has_full_text_search(using="default"):
+    return connections[using].vendor == "postgresql"
+
+
+def search_newspaper_titles(queryset, term):
+    """
+    Filter newspapers by title words.
+
+    On PostgreSQL this matches the GIN index on to_tsvector(title) created by
+    migration 0006; other databases fall back to a substring match.
+    """
+    if not has_full_text_search(queryset.db):
+        return queryset.filter(title__icontains=term)
+    from django.contrib.postgres.search import SearchQuery, SearchVector
+
+    return queryset.annotate(
+        title_search=SearchVector("title", config=TITLE_SEARCH_CONFIG)
+    ).filter(title_search=SearchQuery(term, config=TITLE_SEARCH_CONFIG, search_type="websearch"))
+
+
+def get_timeout():
+    return getattr(settings, "CATALOG_SEARCH_TIMEOUT", 0.5)
+
+
+def get_result_count():
+    return getattr(settings, "CATALOG_SEARCH_RESULTS", 10)
+
+
+def get_concurrency():
+    return getattr(settings, "CATALOG_SEARCH_CONCURRENCY", 2)
+
+
+def get_executor():
+    """The pool and the semaphore of searches it has a thread for every source of."""
+    global _executor, _slots
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=get_concurrency() * len(SOURCES),
+                thread_name_prefix="catalog-search",
+            )
+            _slots = threading.BoundedSemaphore(get_concurrency())
+        return _executor, _slots
+
+
+def relevance(term, text):
+    """Score in [0, 1]: whole match, prefix, word prefix, substring, other (stemmed) match."""
+    term, text = term.lower(), text.lower()
+    if text == term:
+        return 1.0
+    if text.startswith(term):
+        return 0.8
+    if any(word.startswith(term) for word in text.split()):
+        return 0.6
+    if term in text:
+        return 0.4
+    return 0.2
+
+
+def search_newspapers(term, limit):
+    newspapers = search_newspaper_titles(Newspaper.objects.only("title"), term).order_by("-published_date")
+    return [
+        SearchResult("newspaper", newspaper.title, reverse("catalog:newspaper-detail", args=[newspaper.pk]))
+        for newspaper in newspapers[:limit]
+    ]
+
+
+def search_topics(term, limit):
+    topics = Topic.objects.filter(name__icontains=term).order_by("name")
+    return [
+        SearchResult("topic", topic.name, reverse("catalog:topic-list") + "?" + urlencode({"name": topic.name}))
+        for topic in topics[:limit]
+    ]
+
+
+def search_redactors(term, limit):
+    redactors = Redactor.objects.filter(username__icontains=term).order_by("username")
+    return [
+        SearchResult("redactor", redactor.username, reverse("catalog:redactor-detail", args=[redactor.pk]))
+        for redactor in redactors[:limit]
+    ]
+
+
+SOURCES = {
+    "newspapers": search_newspapers,
+    "topics": search_topics,
+    "redactors": search_redactors,
+}
+
+
+def run_source(source, term, limit, timeout):
+    try:
+        if not has_full_text_search():
+            return SOURCES[source](term, limit)
+        with transaction.atomic():
+            # Give up in the database too, so a slow query frees its thread.
+            with connections["default"].cursor() as cursor:
+                cursor.execute("SET LOCAL statement_timeout = %s", [max(int(timeout * 1000), 1)])
+            return SOURCES[source](term, limit)
+    finally:
+        # Keeps the thread's connection for reuse within CONN_MAX_AGE.
+        close_old_connections()
+
+
+def search(term, limit=None, timeout=None):
+    """
+    Newspapers, topics and redactors matching ``term``, most relevant first.
+
+    The sources are queried concurrently; those that have not answered
+    within ``timeout`` seconds, or that failed, are left out and named in
+    the returned ``missing`` list. A search holds one of
+    CATALOG_SEARCH_CONCURRENCY slots until all its sources are done, so they
+    start at once instead of queueing behind other searches' sources; when
+    no slot frees up within ``timeout``, every source is missing.
+    """
+    limit = limit or get_result_count()
+    timeout = get_timeout() if timeout is None else timeout
+    executor, slots = get_executor()
+    if not slots.acquire(timeout=timeout):
+        logger.warning("No search slot freed up within %.2fs.", timeout)
+        return [], list(SOURCES)
+    futures = {executor.submit(run_source, source, term, limit, timeout): source for source in SOURCES}
+    remaining = [len(futures)]
+    remaining_lock = threading.Lock()
+
+    def source_done(future):
+        with remaining_lock:
+            remaining[0] -= 1
+            if not remaining[0]:
+                slots.release()
+
+    for future in futures:
+        future.add_done_callback(source_done)
+    done, not_done = wait(futures, timeout=timeout)
+    results, missing = [], []
+    for future, source in futures.items():
+        if future in not_done:
+            future.cancel()
+            logger.warning("Search source %s missed the %.2fs deadline.", source, timeout)
+            missing.append(source)
+        elif future.exception() is not None:
+            logger.error("Search source %s failed.", source, exc_info=future.exception())
+            missing.append(source)
+        else:
+            results.extend(future.result())
+    for result in results:
+        result.score = relevance(term, result.label)
+    results.sort(key=lambda result: (-result.score, result.label.lower()))
+    return results[:limit], missing
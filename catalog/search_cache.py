@@ -0,0 +1,144 @@
+import hashlib
+import time
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+
+from catalog import singleflight
+from catalog.models import Newspaper
+
+
+INDEX_KEY = "catalog.search.ids.index"
+INDEX_LOCK_KEY = "catalog.search.ids.index.lock"
+# Newest first, ties broken by id so cached pages stay stable.
+ORDERING = ("-published_date", "-pk")
+
+
+def get_size():
+    return getattr(settings, "CATALOG_SEARCH_CACHE_SIZE", 200)
+
+
+def get_max_ids():
+    return getattr(settings, "CATALOG_SEARCH_CACHE_MAX_IDS", 5000)
+
+
+def get_timeout():
+    return getattr(settings, "CATALOG_SEARCH_CACHE_TIMEOUT", 60 * 10)
+
+
+def normalize(term):
+    """The query searched for ``term``, cached or not."""
+    return " ".join(term.lower().split())
+
+
+def entry_key(query):
+    return "catalog.search.ids." + hashlib.md5(query.encode("utf-8")).hexdigest()
+
+
+def matching_ids(query, limit):
+    return list(
+        Newspaper.objects.filter(title__icontains=query).order_by(*ORDERING).values_list("pk", flat=True)[:limit]
+    )
+
+
+def get_ids(term):
+    """
+    Ordered ids of the newspapers whose title contains ``term``, or None for
+    searches with more than CATALOG_SEARCH_CACHE_MAX_IDS results.
+
+    Lists are cached per normalized query. The index of cached queries is
+    kept in least recently used order and bounded by CATALOG_SEARCH_CACHE_SIZE;
+    an entry is only served while its query is in the index, so ``invalidate``
+    sees every list it has to drop. Concurrent misses of a query run it once.
+    """
+    query = normalize(term)
+    key = entry_key(query)
+    found = cache.get_many([INDEX_KEY, key])
+    index = found.get(INDEX_KEY, [])
+    entry = found.get(key)
+    if entry is not None and entry["value"]["query"] == query and query in index:
+        # Only reorder when the query is not already among the recent half.
+        if index.index(query) < len(index) // 2:
+            remember(query)
+        return entry["value"]["ids"]
+    if entry is not None:
+        # Not indexed, so possibly missed by invalidate.
+        cache.delete(key)
+    value = singleflight.get_or_compute("search", key, partial(fill, query), get_timeout())
+    if value["ids"] is None:
+        cache.delete(key)
+        return None
+    remember(query)
+    return value["ids"]
+
+
+def fill(query):
+    ids = matching_ids(query, get_max_ids() + 1)
+    return {"query": query, "ids": ids if len(ids) <= get_max_ids() else None}
+
+
+@contextmanager
+def index_lock(wait=0.1):
+    """Whether the index could be locked within ``wait`` seconds; updates are a read and a write."""
+    deadline = time.monotonic() + wait
+    while not cache.add(INDEX_LOCK_KEY, 1, 5):
+        if time.monotonic() >= deadline:
+            yield False
+            return
+        time.sleep(0.005)
+    try:
+        yield True
+    finally:
+        cache.delete(INDEX_LOCK_KEY)
+
+
+def remember(query):
+    with index_lock() as locked:
+        if not locked:
+            # Not indexed, the list is filled again by a later search.
+            return
+        index = [cached for cached in cache.get(INDEX_KEY, []) if cached != query] + [query]
+        evicted, index = index[:-get_size()], index[-get_size():]
+        cache.set(INDEX_KEY, index, None)
+    if evicted:
+        cache.delete_many([entry_key(cached) for cached in evicted])
+
+
+def invalidate(titles=()):
+    """
+    Drop the cached lists of every query found in any of ``titles``.
+
+    A list holds exactly the newspapers whose title contains its query, so
+    passing a changed newspaper's old and new titles finds every list it
+    leaves, enters or moves in by the queries alone, without loading them.
+    """
+    index = cache.get(INDEX_KEY)
+    if not index:
+        return
+    titles = [normalize(title) for title in titles]
+    stale = [query for query in index if any(query in title for title in titles)]
+    if not stale:
+        return
+    # Lists without an entry are not served, whether or not the index is updated.
+    cache.delete_many([entry_key(query) for query in stale])
+    with index_lock() as locked:
+        if locked:
+            index = cache.get(INDEX_KEY) or []
+            cache.set(INDEX_KEY, [query for query in index if query not in stale], None)
+
+
+def clear():
+    """Drop every cached list, e.g. after loads that send no signals."""
+    index = cache.get(INDEX_KEY) or []
+    cache.delete_many([INDEX_KEY] + [entry_key(query) for query in index])
+
+
+def fetch(ids):
+    """The newspapers of ``ids`` in that order, with one query plus the list page's prefetches."""
+    newspapers = {
+        newspaper.pk: newspaper
+        for newspaper in Newspaper.objects.filter(pk__in=ids).prefetch_related("topics", "publishers")
+    }
+    return [newspapers[pk] for pk in ids if pk in newspapers]
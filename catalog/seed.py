@@ -0,0 +1,88 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from catalog import activity, counters, duplicates, related, rollups, search_cache
+from catalog.models import Newspaper, Redactor, Topic
+
+
+WORDS = (
+    "editor report market city council science research policy election "
+    "budget school health climate energy transport sport culture music "
+    "film museum history economy trade bank startup software security "
+    "court police festival weather harbour river bridge station airport "
+    "hospital university library theatre gallery farm village region "
+    "minister mayor citizen reader writer column interview analysis"
+).split()
+
+
+def generate_sentence(rng):
+    words = rng.choices(WORDS, k=rng.randint(6, 16))
+    return " ".join(words).capitalize() + "."
+
+
+def generate_article(rng, paragraphs=None):
+    if paragraphs is None:
+        paragraphs = rng.randint(3, 12)
+    return "\n\n".join(
+        " ".join(generate_sentence(rng) for _ in range(rng.randint(3, 8)))
+        for _ in range(paragraphs)
+    )
+
+
+def seed_catalog(newspapers=1000, topics=50, redactors=50, days=365, seed=0, batch_size=1000):
+    """Bulk-create a reproducible dataset for benchmarks and load tests."""
+    rng = random.Random(seed)
+    now = timezone.now()
+    password = make_password(None)
+    with transaction.atomic():
+        topic_objs = Topic.objects.bulk_create(
+            [Topic(name=f"Topic {seed}-{i}") for i in range(topics)]
+        )
+        redactor_objs = Redactor.objects.bulk_create(
+            [
+                Redactor(
+                    username=f"redactor_{seed}_{i}",
+                    password=password,
+                    years_of_experience=rng.randint(0, 40),
+                )
+                for i in range(redactors)
+            ]
+        )
+        topic_through = Newspaper.topics.through
+        publisher_through = Newspaper.publishers.through
+        for start in range(0, newspapers, batch_size):
+            batch = Newspaper.objects.bulk_create(
+                [
+                    Newspaper(title=generate_sentence(rng)[:255], content=generate_article(rng))
+                    for _ in range(min(batch_size, newspapers - start))
+                ]
+            )
+            for newspaper in batch:
+                newspaper.published_date = now - timedelta(seconds=rng.randint(0, days * 86400))
+            Newspaper.objects.bulk_update(batch, ["published_date"])
+            topic_through.objects.bulk_create(
+                [
+                    topic_through(newspaper_id=newspaper.pk, topic_id=topic.pk)
+                    for newspaper in batch
+                    for topic in rng.sample(topic_objs, k=min(len(topic_objs), rng.randint(1, 3)))
+                ]
+            )
+            publisher_through.objects.bulk_create(
+                [
+                    publisher_through(newspaper_id=newspaper.pk, redactor_id=redactor.pk)
+                    for newspaper in batch
+                    for redactor in rng.sample(redactor_objs, k=min(len(redactor_objs), rng.randint(1, 2)))
+                ]
+            )
+        # bulk_create sends no signals, so maintained data is rebuilt at the end.
+        counters.rebuild()
+        activity.rebuild()
+        related.rebuild()
+        rollups.rebuild()
+        duplicates.rebuild()
+        transaction.on_commit(search_cache.clear)
+    return newspapers
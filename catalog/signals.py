@@ -0,0 +1,375 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from catalog import activity, archive, counters, events, feeds, related, rollups, search_cache
+from catalog.models import Newspaper, Redactor, Topic
+from catalog.revisions import record_current_revision
+from catalog.tasks import (
+    refresh_newspaper_signature,
+    refresh_related_newspapers,
+    refresh_rollup_day,
+)
+
+
+# Sent by catalog.bulk inside the transaction of every batch, with the
+# action, newspaper_ids, topic_ids, redactor_ids and count keyword arguments.
+# Deletes also pass the publication days of the deleted newspapers as days.
+newspapers_bulk_changed = Signal()
+
+
+@receiver(pre_save, sender=Newspaper)
+def newspaper_saving(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Saving an archived newspaper writes its content back to the newspaper table.
+    if raw or instance.archived_at is None:
+        return
+    if update_fields is None or "content" in update_fields:
+        archive.restore(instance)
+
+
+@receiver(post_save, sender=Newspaper)
+def newspaper_restored(sender, instance, raw=False, **kwargs):
+    if getattr(instance, "_archive_restored", False):
+        archive.forget([instance.pk])
+        instance._archive_restored = False
+
+
+@receiver(post_save, sender=Newspaper)
+def newspaper_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if kwargs.get("created"):
+        counters.increment(counters.NEWSPAPER_COUNT)
+    if update_fields is None or "content" in update_fields:
+        # Right away rather than from a job, so every edit gets its revision
+        # and the history ends on the saved content. No new revision means
+        # the content is unchanged, and so is its signature.
+        if record_current_revision(instance.pk) is not None:
+            refresh_newspaper_signature.enqueue(instance.pk)
+
+
+@receiver(post_delete, sender=Newspaper)
+def newspaper_deleted(sender, instance, **kwargs):
+    counters.increment(counters.NEWSPAPER_COUNT, -1)
+
+
+@receiver(newspapers_bulk_changed, sender=Newspaper)
+def newspapers_bulk_deleted(sender, action, count, **kwargs):
+    if action == "delete":
+        counters.increment(counters.NEWSPAPER_COUNT, -count)
+
+
+@receiver(pre_delete, sender=Newspaper)
+def newspaper_deleting(sender, instance, **kwargs):
+    # The links are gone by post_delete.
+    activity.forget([instance.pk])
+
+
+def changed_links(relation, instance, action, reverse, pk_set):
+    """The (newspaper id, other id) pairs an m2m_changed action adds or removes."""
+    if action == "post_add":
+        return [(pk, instance.pk) if reverse else (instance.pk, pk) for pk in pk_set]
+    if reverse:
+        return activity.links(relation, pk_set if action == "pre_remove" else None, [instance.pk])
+    return activity.links(relation, [instance.pk], pk_set if action == "pre_remove" else None)
+
+
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+@receiver(m2m_changed, sender=Newspaper.topics.through)
+def newspaper_links_changed_activity(sender, instance, action, reverse, pk_set, **kwargs):
+    # Removed links are counted out before they are gone.
+    if action not in ("post_add", "pre_remove", "pre_clear"):
+        return
+    relation = "publishers" if sender is Newspaper.publishers.through else "topics"
+    activity.apply_links(
+        relation, changed_links(relation, instance, action, reverse, pk_set), 1 if action == "post_add" else -1
+    )
+
+
+@receiver(newspapers_bulk_changed, sender=Newspaper)
+def newspapers_bulk_activity_changed(sender, action, newspaper_ids, topic_ids, redactor_ids, **kwargs):
+    # Deleted newspapers were counted out by catalog.bulk before their links went.
+    if action == "delete":
+        return
+    verb, relation = action.split("_")
+    others = redactor_ids if relation == "publishers" else topic_ids
+    pairs = [(newspaper_id, other_id) for newspaper_id in newspaper_ids for other_id in others]
+    activity.apply_links(relation, pairs, 1 if verb == "add" else -1)
+
+
+
+def refresh_related(newspaper_ids):
+    related.mark_stale(newspaper_ids)
+    refresh_related_newspapers.enqueue()
+
+
+@receiver(pre_delete, sender=Newspaper)
+def newspaper_deleting_related(sender, instance, **kwargs):
+    related.mark_referrers_stale([instance.pk])
+    refresh_related_newspapers.enqueue()
+
+
+@receiver(m2m_changed, sender=Newspaper.topics.through)
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+def newspaper_links_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        refresh_related([instance.pk])
+    elif action == "pre_clear":
+        refresh_related(instance.newspapers.values_list("pk", flat=True))
+    else:
+        refresh_related(pk_set)
+
+
+@receiver(newspapers_bulk_changed, sender=Newspaper)
+def newspapers_bulk_related_changed(sender, action, newspaper_ids, **kwargs):
+    # Deleted newspapers were already dropped by catalog.bulk.
+    if action == "delete":
+        refresh_related_newspapers.enqueue()
+    else:
+        refresh_related(newspaper_ids)
+
+
+def refresh_rollups(days):
+    for day in days:
+        refresh_rollup_day.enqueue(day.isoformat())
+
+
+@receiver(post_save, sender=Newspaper)
+def newspaper_saved_rollups(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        refresh_rollups([timezone.localdate(instance.published_date)])
+
+
+@receiver(pre_delete, sender=Newspaper)
+def newspaper_deleting_rollups(sender, instance, **kwargs):
+    refresh_rollups([timezone.localdate(instance.published_date)])
+
+
+@receiver(m2m_changed, sender=Newspaper.topics.through)
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+def newspaper_links_changed_rollups(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        refresh_rollups([timezone.localdate(instance.published_date)])
+    elif action == "pre_clear":
+        refresh_rollups(rollups.days_of(instance.newspapers.values("pk")))
+    else:
+        refresh_rollups(rollups.days_of(pk_set))
+
+
+@receiver(newspapers_bulk_changed, sender=Newspaper)
+def newspapers_bulk_rollups_changed(sender, action, newspaper_ids, days=None, **kwargs):
+    refresh_rollups(days if days is not None else rollups.days_of(newspaper_ids))
+
+
+def touch_newspapers(newspaper_ids):
+    Newspaper.objects.filter(pk__in=newspaper_ids).update(updated_at=timezone.now())
+
+
+def touch_redactors(redactor_ids):
+    if redactor_ids:
+        Redactor.all_objects.filter(pk__in=redactor_ids).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Newspaper)
+@receiver(post_delete, sender=Newspaper)
+@receiver(post_save, sender=Topic)
+@receiver(post_delete, sender=Topic)
+@receiver(post_save, sender=Redactor)
+@receiver(post_delete, sender=Redactor)
+def model_changed_generation(sender, raw=False, **kwargs):
+    if not raw:
+        counters.bump_generation(sender)
+
+
+@receiver(post_save, sender=Newspaper)
+def newspaper_saved_touch(sender, instance, created=False, raw=False, **kwargs):
+    # Redactor pages list the titles of their newspapers.
+    if not created and not raw:
+        touch_redactors(activity.publisher_ids([instance.pk]))
+
+
+@receiver(pre_delete, sender=Newspaper)
+def newspaper_deleting_touch(sender, instance, **kwargs):
+    touch_redactors(activity.publisher_ids([instance.pk]))
+
+
+@receiver(m2m_changed, sender=Newspaper.topics.through)
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+def newspaper_links_changed_touch(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    counters.bump_generation(Newspaper)
+    publishers = sender is Newspaper.publishers.through
+    if not reverse:
+        touch_newspapers([instance.pk])
+        if publishers:
+            touch_redactors(activity.publisher_ids([instance.pk]) if action == "pre_clear" else pk_set)
+    else:
+        touch_newspapers(instance.newspapers.values("pk") if action == "pre_clear" else pk_set)
+        if publishers:
+            touch_redactors([instance.pk])
+
+
+@receiver(newspapers_bulk_changed, sender=Newspaper)
+def newspapers_bulk_touch(sender, action, newspaper_ids, redactor_ids, **kwargs):
+    counters.bump_generation(Newspaper)
+    if action != "delete":
+        touch_newspapers(newspaper_ids)
+    if not action.endswith("_topics"):
+        touch_redactors(redactor_ids)
+
+
+def publish_event(model, action, render=None, **data):
+    # Only committed changes are announced to the event stream.
+    transaction.on_commit(lambda: events.publish(model, action, render, **data))
+
+
+@receiver(post_save, sender=Newspaper)
+def newspaper_saved_event(sender, instance, created=False, raw=False, **kwargs):
+    if not raw:
+        publish_event(
+            "newspaper",
+            "created" if created else "updated",
+            partial(events.render_newspaper_card, instance.pk),
+            pk=instance.pk,
+        )
+
+
+@receiver(post_delete, sender=Newspaper)
+def newspaper_deleted_event(sender, instance, **kwargs):
+    publish_event("newspaper", "deleted", pks=[instance.pk])
+
+
+@receiver(post_save, sender=Topic)
+@receiver(post_save, sender=Redactor)
+def model_saved_event(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    # Soft deletes are saves too; the purge that follows is not announced again.
+    action = "deleted" if instance.deleted_at else "created" if created else "updated"
+    publish_event(sender._meta.model_name, action, pk=instance.pk, name=str(instance))
+
+
+@receiver(m2m_changed, sender=Newspaper.topics.through)
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+def newspaper_links_changed_event(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        publish_event(
+            "newspaper", "updated", partial(events.render_newspaper_card, instance.pk), pk=instance.pk
+        )
+    else:
+        pks = instance.newspapers.values_list("pk", flat=True) if action == "pre_clear" else pk_set
+        publish_event("newspaper", "changed", pks=sorted(pks))
+
+
+@receiver(newspapers_bulk_changed, sender=Newspaper)
+def newspapers_bulk_event(sender, action, newspaper_ids, **kwargs):
+    publish_event("newspaper", "deleted" if action == "delete" else "changed", pks=list(newspaper_ids))
+
+
+def invalidate_feeds(**ids):
+    transaction.on_commit(partial(feeds.invalidate, **ids))
+
+
+@receiver(post_save, sender=Newspaper)
+def newspaper_saved_feeds(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_feeds(newspaper_ids=[instance.pk])
+
+
+@receiver(pre_delete, sender=Newspaper)
+def newspaper_deleting_feeds(sender, instance, **kwargs):
+    invalidate_feeds(
+        topic_ids=list(instance.topics.values_list("pk", flat=True)),
+        redactor_ids=activity.publisher_ids([instance.pk]),
+    )
+
+
+@receiver(post_save, sender=Topic)
+def topic_saved_feeds(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_feeds(topic_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Redactor)
+def redactor_saved_feeds(sender, instance, raw=False, **kwargs):
+    if not raw:
+        invalidate_feeds(redactor_ids=[instance.pk])
+
+
+@receiver(m2m_changed, sender=Newspaper.topics.through)
+@receiver(m2m_changed, sender=Newspaper.publishers.through)
+def newspaper_links_changed_feeds(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    # Feed items list their topics and publishers, so every feed of the
+    # newspapers changes too. Removed links are looked up before they go.
+    topics = sender is Newspaper.topics.through
+    key = "topic_ids" if topics else "redactor_ids"
+    if not reverse:
+        if action == "pre_clear":
+            pk_set = (instance.topics if topics else instance.publishers).values_list("pk", flat=True)
+        invalidate_feeds(newspaper_ids=[instance.pk], **{key: list(pk_set)})
+    else:
+        if action == "pre_clear":
+            pk_set = instance.newspapers.values_list("pk", flat=True)
+        invalidate_feeds(newspaper_ids=list(pk_set), **{key: [instance.pk]})
+
+
+@receiver(newspapers_bulk_changed, sender=Newspaper)
+def newspapers_bulk_feeds(sender, action, newspaper_ids, topic_ids, redactor_ids, **kwargs):
+    invalidate_feeds(
+        newspaper_ids=[] if action == "delete" else list(newspaper_ids),
+        topic_ids=list(topic_ids),
+        redactor_ids=list(redactor_ids),
+    )
+
+
+def invalidate_searches(**kwargs):
+    transaction.on_commit(partial(search_cache.invalidate, **kwargs))
+
+
+@receiver(pre_save, sender=Newspaper)
+def newspaper_saving_searches(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding:
+        return
+    if update_fields is None or {"title", "published_date"} & set(update_fields):
+        instance._search_before = (
+            Newspaper.objects.filter(pk=instance.pk).values_list("title", "published_date").first()
+        )
+
+
+@receiver(post_save, sender=Newspaper)
+def newspaper_saved_searches(sender, instance, raw=False, created=False, **kwargs):
+    # Lists matching the old title lose the newspaper or reorder, lists
+    # matching the new one gain it.
+    if raw:
+        return
+    before = getattr(instance, "_search_before", None)
+    instance._search_before = None
+    if created:
+        invalidate_searches(titles=[instance.title])
+    elif before is not None and before != (instance.title, instance.published_date):
+        invalidate_searches(titles=[before[0], instance.title])
+
+
+@receiver(post_delete, sender=Newspaper)
+def newspaper_deleted_searches(sender, instance, **kwargs):
+    invalidate_searches(titles=[instance.title])
+
+
+@receiver(newspapers_bulk_changed, sender=Newspaper)
+def newspapers_bulk_searches(sender, action, newspaper_ids, **kwargs):
+    # Topic and publisher changes leave titles and dates alone; bulk deletes
+    # do not know the titles, and are rare enough to start afresh.
+    if action == "delete":
+        transaction.on_commit(search_cache.clear)
@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from catalog import metrics
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+POLL_INTERVAL = 0.05
+
+
+def get_lock_timeout():
+    return getattr(settings, "CATALOG_SINGLE_FLIGHT_LOCK_TIMEOUT", 30)
+
+
+def get_wait_timeout():
+    return getattr(settings, "CATALOG_SINGLE_FLIGHT_WAIT", 5)
+
+
+def get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "CATALOG_SINGLE_FLIGHT_THREADS", 2),
+                thread_name_prefix="catalog-refresh",
+            )
+        return _executor
+
+
+def record(name, result):
+    metrics.CACHE_COMPUTATIONS.labels(name, result).inc()
+
+
+def store(key, value, timeout, stale, version=None):
+    # Kept past its freshness for the stale window.
+    cache.set(key, {"value": value, "expires": time.time() + timeout, "version": version}, timeout + stale)
+    return value
+
+
+def compute_and_store(name, key, compute, timeout, stale, lock_key, version=None):
+    try:
+        value = store(key, compute(), timeout, stale, version)
+        record(name, "computed")
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def refresh_in_background(name, key, compute, timeout, stale, lock_key, version=None):
+    try:
+        compute_and_store(name, key, compute, timeout, stale, lock_key, version)
+    finally:
+        close_old_connections()
+
+
+def get_or_compute(name, key, compute, timeout, stale=0, background=False, version=None):
+    """
+    Cached value of ``key``, computed by one caller at a time.
+
+    A value is fresh for ``timeout`` seconds and kept ``stale`` seconds
+    longer. Once it is stale, the caller that takes the lock recomputes it
+    while the others get the stale value; with ``background`` that caller
+    gets the stale value too and the refresh runs on a pool thread. A value
+    of another ``version`` is stale too, but its lock holder always
+    recomputes in place, so a version bumped by a write is served at once.
+
+    Only without any value, e.g. after an eviction, do the others wait for
+    the lock holder's result, and compute it themselves after
+    CATALOG_SINGLE_FLIGHT_WAIT seconds. Locks only coalesce processes that
+    share the cache. Outcomes are counted in
+    catalog_cache_computations_total, labelled with ``name``.
+    """
+    entry = cache.get(key)
+    current = entry is not None and entry.get("version") == version
+    if current and time.time() < entry["expires"]:
+        return entry["value"]
+    lock_key = f"{key}.lock"
+    locked = cache.add(lock_key, 1, get_lock_timeout())
+    args = (name, key, compute, timeout, stale, lock_key, version)
+    if entry is not None:
+        if not locked:
+            record(name, "stale")
+            return entry["value"]
+        if background and current:
+            get_executor().submit(refresh_in_background, *args)
+            record(name, "stale")
+            return entry["value"]
+        return compute_and_store(*args)
+    if locked:
+        return compute_and_store(*args)
+    deadline = time.monotonic() + get_wait_timeout()
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None:
+            record(name, "waited")
+            return entry["value"]
+    record(name, "timeout")
+    return store(key, compute(), timeout, stale, version)
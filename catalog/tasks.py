@@ -0,0 +1,47 @@
+from datetime import date
+
+from django.apps import apps
+
+from catalog import activity, duplicates, related, rollups
+from catalog.jobs import job
+from catalog.revisions import record_current_revision
+
+
+@job
+def record_newspaper_revision(newspaper_id, content=None):
+    # Saves record their revisions themselves now; this drains jobs queued
+    # before, ignoring the content they carry.
+    record_current_revision(newspaper_id)
+
+
+@job
+def refresh_newspaper_signature(newspaper_id):
+    duplicates.refresh_many([newspaper_id])
+
+
+@job
+def purge_deleted(model_label, pk):
+    # catalog.purge sends catalog.signals, which imports this module.
+    from catalog.purge import purge
+
+    purge(apps.get_model(model_label), pk)
+
+
+@job
+def refresh_redactor_activity(redactor_id):
+    activity.refresh_redactor_activity(redactor_id)
+
+
+@job
+def refresh_redactor_last_published(redactor_id):
+    activity.refresh_last_published(redactor_id)
+
+
+@job
+def refresh_related_newspapers():
+    related.refresh_stale()
+
+
+@job
+def refresh_rollup_day(day):
+    rollups.refresh_day(date.fromisoformat(day))
@@ -0,0 +1,69 @@
+from django import template
+
+register = template.Library()
+
+
+@register.filter
+def approximate_count(value):
+    """Round a large count for display: 2312345 -> "2.3M", 10000 -> "10K"."""
+    value = int(value)
+    for size, suffix in ((1_000_000_000, "B"), (1_000_000, "M"), (1_000, "K")):
+        if value >= size:
+            rounded = f"{value / size:.1f}".rstrip("0").rstrip(".")
+            return f"{rounded}{suffix}"
+    return str(value)
+
+
+def get_page_window(number, last, on_each_side=2, on_ends=1, last_known=True):
+    """
+    Page numbers around ``number`` with ``None`` marking elided ranges.
+
+    The work done depends on the window size only, never on ``last``. When
+    ``last_known`` is false the last page is an estimate and is not linked.
+    """
+    start = max(1, number - on_each_side)
+    end = min(last, number + on_each_side)
+    pages = []
+    if start > 1:
+        pages.extend(range(1, min(on_ends, start - 1) + 1))
+        if start > on_ends + 1:
+            pages.append(None)
+    pages.extend(range(start, end + 1))
+    if end < last and last_known:
+        if end < last - on_ends:
+            pages.append(None)
+        pages.extend(range(max(end + 1, last - on_ends + 1), last + 1))
+    return pages
+
+
+@register.inclusion_tag("includes/pagination.html", takes_context=True)
+def pagination(context, on_each_side=2, on_ends=1):
+    page_obj = context.get("page_obj")
+    if not context.get("is_paginated") or page_obj is None:
+        return {"is_paginated": False}
+    paginator = page_obj.paginator
+    exact = not (getattr(paginator, "is_estimated", False) or getattr(paginator, "is_capped", False))
+    if exact:
+        last = paginator.num_pages
+    else:
+        # Only the next page is known to exist.
+        last = page_obj.number + 1 if page_obj.has_next() else page_obj.number
+
+    params = context["request"].GET.copy()
+    params.pop("page", None)
+    query = params.urlencode()
+    prefix = f"?{query}&page=" if query else "?page="
+
+    links = [
+        {"number": number, "url": f"{prefix}{number}", "current": number == page_obj.number}
+        if number is not None else None
+        for number in get_page_window(page_obj.number, last, on_each_side, on_ends, exact)
+    ]
+    return {
+        "is_paginated": True,
+        "page_obj": page_obj,
+        "paginator": paginator,
+        "links": links,
+        "previous_url": f"{prefix}{page_obj.number - 1}" if page_obj.has_previous() else None,
+        "next_url": f"{prefix}{page_obj.number + 1}" if page_obj.has_next() else None,
+    }
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from catalog import activity, bulk
+from catalog.models import Newspaper, RedactorMonthlyActivity, RedactorTopicActivity, Topic
+
+
+@override_settings(CATALOG_JOBS_MODE="immediate")
+class RedactorActivityTests(TestCase):
+    def setUp(self):
+        self.redactor = get_user_model().objects.create_user(username="writer", password="strongpass123")
+        self.client.force_login(self.redactor)
+        self.science = Topic.objects.create(name="Science")
+        self.sports = Topic.objects.create(name="Sports")
+
+    def create_newspaper(self, title, *topics):
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper = Newspaper.objects.create(title=title, content="Text")
+            newspaper.topics.add(*topics)
+            newspaper.publishers.add(self.redactor)
+        return newspaper
+
+    def test_columns_follow_publishing(self):
+        first = self.create_newspaper("First", self.science)
+        self.create_newspaper("Second", self.science, self.sports)
+        self.redactor.refresh_from_db()
+        self.assertEqual(self.redactor.article_count, 2)
+        self.assertEqual(self.redactor.topic_count, 2)
+        self.assertIsNotNone(self.redactor.last_published_at)
+        monthly = RedactorMonthlyActivity.objects.get(redactor=self.redactor)
+        self.assertEqual(monthly.month, activity.get_current_month())
+        self.assertEqual(monthly.article_count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.redactor.refresh_from_db()
+        self.assertEqual(self.redactor.article_count, 1)
+
+    def test_bulk_actions_refresh_publishers(self):
+        newspapers = [self.create_newspaper(f"Newspaper {i}", self.science) for i in range(3)]
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.remove_related("topics", [newspaper.pk for newspaper in newspapers], self.science)
+        self.redactor.refresh_from_db()
+        self.assertEqual(self.redactor.topic_count, 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.delete_newspapers([newspaper.pk for newspaper in newspapers])
+        self.redactor.refresh_from_db()
+        self.assertEqual(self.redactor.article_count, 0)
+        self.assertFalse(RedactorMonthlyActivity.objects.exists())
+
+    def state(self):
+        redactors = list(
+            get_user_model().objects.order_by("pk").values_list("pk", "article_count", "topic_count", "last_published_at")
+        )
+        months = set(RedactorMonthlyActivity.objects.values_list("redactor_id", "month", "article_count"))
+        topics = set(RedactorTopicActivity.objects.values_list("redactor_id", "topic_id", "article_count"))
+        return redactors, months, topics
+
+    def test_writes_apply_deltas_matching_a_full_recompute(self):
+        other = get_user_model().objects.create_user(username="other", password="strongpass123")
+        first = self.create_newspaper("First", self.science)
+        second = self.create_newspaper("Second", self.science, self.sports)
+        third = self.create_newspaper("Third", self.sports)
+        Newspaper.objects.filter(pk=first.pk).update(published_date=timezone.now() - timedelta(days=62))
+        activity.rebuild()
+        with mock.patch.object(activity, "refresh_redactor_activity") as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                other.newspapers.add(first, second)
+                second.topics.remove(self.science)
+                self.sports.newspapers.add(first)
+                first.topics.clear()
+                third.publishers.clear()
+                bulk.add_related("topics", [second.pk, third.pk], self.science)
+                bulk.remove_related("publishers", [first.pk], other)
+            with self.captureOnCommitCallbacks(execute=True):
+                second.delete()
+        refresh.assert_not_called()
+        maintained = self.state()
+        activity.rebuild()
+        self.assertEqual(maintained, self.state())
+        self.redactor.refresh_from_db()
+        self.assertEqual((self.redactor.article_count, self.redactor.topic_count), (1, 0))
+
+    def test_deleting_the_latest_newspaper_moves_last_published_back(self):
+        first = self.create_newspaper("First", self.science)
+        latest = self.create_newspaper("Latest", self.science)
+        with self.captureOnCommitCallbacks(execute=True):
+            latest.delete()
+        self.redactor.refresh_from_db()
+        self.assertEqual(self.redactor.last_published_at, first.published_date)
+
+    def test_list_sorted_by_activity_this_month(self):
+        other = get_user_model().objects.create_user(username="other", password="strongpass123")
+        get_user_model().objects.create_user(username="idle", password="strongpass123")
+        self.create_newspaper("Mine", self.science)
+        old = self.create_newspaper("Old", self.science)
+        old.publishers.set([other])
+        Newspaper.objects.filter(pk=old.pk).update(published_date=timezone.now() - timedelta(days=62))
+        activity.rebuild()
+
+        response = self.client.get(reverse("catalog:redactor-list"), {"sort": "month"})
+        self.assertEqual([redactor.username for redactor in response.context["redactors"]], ["writer"])
+        response = self.client.get(reverse("catalog:redactor-list"), {"sort": "recent"})
+        self.assertEqual(
+            [redactor.username for redactor in response.context["redactors"]], ["writer", "other"]
+        )
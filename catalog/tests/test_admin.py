@@ -1,8 +1,12 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.admin.sites import AdminSite
+from django.urls import reverse
 
-from catalog.admin import RedactorAdmin
-from catalog.models import Redactor
+from catalog.admin import NewspaperAdmin, RedactorAdmin
+from catalog.models import Newspaper, Redactor, Topic
+from catalog.pagination import EstimatedCountPaginator
 
 class RedactorAdminTest(TestCase):
     def setUp(self):
@@ -22,3 +26,64 @@ class RedactorAdminTest(TestCase):
         add_fs_dict = {name: opts for name, opts in self.admin.add_fieldsets}
         self.assertIn("Additional info", add_fs_dict)
         self.assertIn("years_of_experience", add_fs_dict["Additional info"]["fields"])
+
+
+class NewspaperAdminTest(TestCase):
+    def setUp(self):
+        self.user = Redactor.objects.create_superuser(
+            username="admin", password="strongpass123"
+        )
+        self.client.force_login(self.user)
+        self.url = reverse("admin:catalog_newspaper_changelist")
+        self.topic = Topic.objects.create(name="Science")
+        self.other_topic = Topic.objects.create(name="Sports")
+
+    def create_newspapers(self, count):
+        newspapers = Newspaper.objects.bulk_create(
+            [Newspaper(title=f"Newspaper {i}", content="Sample content") for i in range(count)]
+        )
+        for newspaper in newspapers:
+            newspaper.topics.add(self.topic)
+            newspaper.publishers.add(self.user)
+        return newspapers
+
+    def test_changelist_settings(self):
+        newspaper_admin = NewspaperAdmin(Newspaper, AdminSite())
+        self.assertFalse(newspaper_admin.show_full_result_count)
+        self.assertEqual(newspaper_admin.autocomplete_fields, ("topics", "publishers"))
+        self.assertIs(newspaper_admin.paginator, EstimatedCountPaginator)
+
+    def test_changelist_query_count_does_not_grow_with_rows(self):
+        self.create_newspapers(2)
+        with CaptureQueriesContext(connection) as small:
+            self.client.get(self.url)
+        self.create_newspapers(20)
+        with CaptureQueriesContext(connection) as large:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(small), len(large))
+
+    def test_changelist_does_not_list_related_objects_in_filters(self):
+        self.create_newspapers(1)
+        response = self.client.get(self.url)
+        self.assertNotContains(response, "Sports")
+        self.assertContains(response, "admin-autocomplete")
+
+    def test_autocomplete_filter(self):
+        first, second = self.create_newspapers(2)
+        second.topics.set([self.other_topic])
+        response = self.client.get(self.url + f"?topics__id__exact={self.other_topic.pk}")
+        self.assertEqual(list(response.context["cl"].result_list), [second])
+        self.assertContains(response, '<option value="%d" selected>Sports</option>' % self.other_topic.pk)
+
+    def test_changelist_defers_content(self):
+        self.create_newspapers(1)
+        response = self.client.get(self.url)
+        newspaper = response.context["cl"].result_list[0]
+        self.assertIn("content", newspaper.get_deferred_fields())
+
+    def test_search(self):
+        self.create_newspapers(3)
+        Newspaper.objects.create(title="Climate report", content="Sample content")
+        response = self.client.get(self.url + "?q=climate")
+        self.assertEqual([n.title for n in response.context["cl"].result_list], ["Climate report"])
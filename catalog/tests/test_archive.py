@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from catalog import archive, bulk
+from catalog.models import Newspaper, NewspaperArchive, NewspaperRevision, Topic
+
+ARTICLE = "An archived article about the harbour. " * 40
+
+
+@override_settings(CATALOG_JOBS_MODE="immediate")
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="writer", password="strongpass123")
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.old = Newspaper.objects.create(title="Old", content=ARTICLE)
+            self.recent = Newspaper.objects.create(title="Recent", content="Fresh news")
+        Newspaper.objects.filter(pk=self.old.pk).update(published_date=timezone.now() - timedelta(days=400))
+
+    def test_archive_moves_old_content(self):
+        self.assertEqual(archive.archive(), 1)
+        old = Newspaper.objects.get(pk=self.old.pk)
+        self.assertIsNotNone(old.archived_at)
+        self.assertEqual(len(Newspaper._meta.get_field("content").get_prep_value(old.content)), 1)
+        self.assertEqual(str(NewspaperArchive.objects.get(newspaper=old).content), ARTICLE)
+        self.assertIsNone(Newspaper.objects.get(pk=self.recent.pk).archived_at)
+        self.assertEqual(archive.archive(), 0)
+
+    def test_views_read_archived_content(self):
+        archive.archive()
+        response = self.client.get(reverse("catalog:newspaper-detail", args=[self.old.pk]))
+        self.assertContains(response, "archived article about the harbour")
+        response = self.client.get(reverse("catalog:newspaper-update", args=[self.old.pk]))
+        self.assertContains(response, "archived article about the harbour")
+        response = self.client.get(reverse("catalog:newspaper-list"))
+        self.assertContains(response, "Old")
+
+    def test_saving_restores_content(self):
+        archive.archive()
+        topic = Topic.objects.create(name="Harbour")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("catalog:newspaper-update", args=[self.old.pk]),
+                {"title": "Old, edited", "content": ARTICLE + "Update.", "topics": [topic.pk], "publishers": [self.user.pk]},
+            )
+        self.assertEqual(response.status_code, 302)
+        old = Newspaper.objects.get(pk=self.old.pk)
+        self.assertIsNone(old.archived_at)
+        self.assertEqual(old.content, ARTICLE + "Update.")
+        self.assertFalse(NewspaperArchive.objects.exists())
+        self.assertEqual(NewspaperRevision.objects.filter(newspaper=old).count(), 2)
+
+    def test_saving_without_loading_is_refused(self):
+        archive.archive()
+        old = Newspaper.objects.get(pk=self.old.pk)
+        old.title = "Renamed"
+        with self.assertRaises(ValueError):
+            old.save()
+        old.save(update_fields=["title"])
+        self.assertEqual(NewspaperArchive.objects.count(), 1)
+
+    def test_deletes_remove_archived_content(self):
+        archive.archive()
+        bulk.delete_newspapers([self.old.pk])
+        self.assertFalse(NewspaperArchive.objects.exists())
+
+    def test_month_of(self):
+        value = datetime(2024, 3, 31, 23, 30, tzinfo=dt_timezone(timedelta(hours=-2)))
+        self.assertEqual(archive.month_of(value), datetime(2024, 4, 1, tzinfo=dt_timezone.utc))
+        self.assertEqual(archive.next_month(datetime(2024, 12, 1, tzinfo=dt_timezone.utc)).year, 2025)
+        self.assertEqual(archive.partition_name(datetime(2024, 4, 1)), "catalog_newspaperarchive_p202404")
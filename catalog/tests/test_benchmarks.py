@@ -0,0 +1,16 @@
+from django.db import connection
+from django.test import TransactionTestCase
+
+from catalog import benchmarks
+
+
+class StorageBenchmarkTests(TransactionTestCase):
+    def test_compares_text_column_with_binary_column(self):
+        rows = benchmarks.bench_storage(newspapers=5, requests=3, paragraphs=5)
+        self.assertEqual([row["mode"] for row in rows], ["text", "uncompressed", "compressed"])
+        text, uncompressed, compressed = rows
+        self.assertEqual(text["stored_bytes"], text["logical_bytes"])
+        # One codec byte per row.
+        self.assertEqual(uncompressed["stored_bytes"], uncompressed["logical_bytes"] + 5)
+        self.assertLess(compressed["stored_bytes"], uncompressed["stored_bytes"])
+        self.assertNotIn("catalog_benchmark_plain_newspaper", connection.introspection.table_names())
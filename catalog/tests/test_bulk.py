@@ -0,0 +1,210 @@
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from catalog import bulk
+from catalog.models import Newspaper, NewspaperRevision, Topic
+from catalog.signals import newspapers_bulk_changed
+
+
+class BulkTestMixin:
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser",
+            password="strongpass123"
+        )
+        self.topic = Topic.objects.create(name="Science")
+        self.other_topic = Topic.objects.create(name="Sports")
+        self.newspapers = Newspaper.objects.bulk_create(
+            [Newspaper(title=f"Newspaper {i}", content="Sample content") for i in range(5)]
+        )
+        self.ids = [newspaper.pk for newspaper in self.newspapers]
+        for newspaper in self.newspapers:
+            newspaper.topics.add(self.topic)
+            newspaper.publishers.add(self.user)
+
+
+class BulkOperationTests(BulkTestMixin, TestCase):
+    def test_delete_newspapers(self):
+        NewspaperRevision.objects.create(
+            newspaper=self.newspapers[0], number=1, is_snapshot=True, body="Sample content"
+        )
+        # Per batch: savepoint, two link lookups, day lookup, activity deltas
+        # for the one redactor (three lookups, article, month and topic updates
+        # with two cleanup deletes, topic count and update, latest check and
+        # generation), four deletes, related cleanup (one update, two deletes),
+        # archive delete, signature deletes (two), counter and generation
+        # updates, redactor touch, release.
+        with self.assertNumQueries(30 * 3):
+            deleted = bulk.delete_newspapers(self.ids, batch_size=2)
+        self.assertEqual(deleted, 5)
+        self.assertFalse(Newspaper.objects.exists())
+        self.assertFalse(Newspaper.topics.through.objects.exists())
+        self.assertFalse(Newspaper.publishers.through.objects.exists())
+        self.assertFalse(NewspaperRevision.objects.exists())
+        self.assertTrue(Topic.objects.filter(pk=self.topic.pk).exists())
+
+    def test_delete_ignores_unknown_ids(self):
+        self.assertEqual(bulk.delete_newspapers([self.ids[0], 999999]), 1)
+
+    def test_add_topic_skips_existing_links(self):
+        self.newspapers[0].topics.add(self.other_topic)
+        added = bulk.add_related("topics", self.ids, self.other_topic)
+        self.assertEqual(added, 4)
+        self.assertEqual(self.other_topic.newspapers.count(), 5)
+
+    def test_remove_publisher(self):
+        removed = bulk.remove_related("publishers", self.ids[:3], self.user)
+        self.assertEqual(removed, 3)
+        self.assertEqual(self.user.newspapers.count(), 2)
+
+    def test_unknown_relation(self):
+        with self.assertRaises(ValueError):
+            bulk.add_related("groups", self.ids, self.topic)
+
+    def test_signal_reports_affected_rows(self):
+        received = []
+
+        def receiver(sender, **kwargs):
+            received.append(kwargs)
+
+        newspapers_bulk_changed.connect(receiver)
+        self.addCleanup(newspapers_bulk_changed.disconnect, receiver)
+        bulk.delete_newspapers(self.ids[:2])
+        bulk.remove_related("topics", self.ids[2:], self.topic)
+        self.assertEqual(received[0]["action"], "delete")
+        self.assertEqual(received[0]["newspaper_ids"], self.ids[:2])
+        self.assertEqual(received[0]["topic_ids"], {self.topic.pk})
+        self.assertEqual(received[0]["redactor_ids"], {self.user.pk})
+        self.assertEqual(received[1]["action"], "remove_topics")
+        self.assertEqual(received[1]["count"], 3)
+
+
+class NewspaperBulkActionViewTests(BulkTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+        self.url = reverse("catalog:newspaper-bulk")
+
+    def test_login_required(self):
+        self.client.logout()
+        response = self.client.post(self.url, {"action": "delete", "newspapers": self.ids})
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("/accounts/login/", response.url)
+        self.assertEqual(Newspaper.objects.count(), 5)
+
+    def test_get_not_allowed(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 405)
+
+    def test_bulk_delete(self):
+        response = self.client.post(
+            self.url, {"action": "delete", "newspapers": self.ids[:2]}, follow=True
+        )
+        self.assertRedirects(response, reverse("catalog:newspaper-list"))
+        self.assertEqual(Newspaper.objects.count(), 3)
+        self.assertContains(response, "Deleted 2 newspapers.")
+
+    def test_bulk_add_topic_redirects_to_next(self):
+        next_url = reverse("catalog:newspaper-list") + "?page=2"
+        response = self.client.post(
+            self.url,
+            {
+                "action": "add_topic",
+                "topic": "sports",
+                "newspapers": self.ids,
+                "next": next_url,
+            },
+        )
+        self.assertRedirects(response, next_url, fetch_redirect_response=False)
+        self.assertEqual(self.other_topic.newspapers.count(), 5)
+
+    def test_bulk_action_requires_related_object(self):
+        response = self.client.post(
+            self.url, {"action": "add_topic", "newspapers": self.ids}, follow=True
+        )
+        self.assertContains(response, "Choose a topic for this action.")
+
+    def test_bulk_action_rejects_unknown_or_ambiguous_names(self):
+        response = self.client.post(
+            self.url, {"action": "add_topic", "topic": "Missing", "newspapers": self.ids}, follow=True
+        )
+        self.assertContains(response, "No topic named &quot;Missing&quot;.")
+        Topic.objects.create(name="SPORTS")
+        response = self.client.post(
+            self.url, {"action": "add_topic", "topic": "sports", "newspapers": self.ids}, follow=True
+        )
+        self.assertContains(response, "Several topics are named &quot;sports&quot;.")
+        self.assertEqual(self.other_topic.newspapers.count(), 0)
+
+    def test_list_page_renders_no_option_per_topic_or_redactor(self):
+        response = self.client.get(reverse("catalog:newspaper-list"))
+        self.assertNotContains(response, f'<option value="{self.topic.pk}"')
+        self.assertContains(response, 'name="topic"')
+
+    def test_bulk_action_requires_selection(self):
+        response = self.client.post(self.url, {"action": "delete"}, follow=True)
+        self.assertContains(response, "Select at least one newspaper.")
+        self.assertEqual(Newspaper.objects.count(), 5)
+
+    def test_offsite_next_is_ignored(self):
+        response = self.client.post(
+            self.url,
+            {"action": "delete", "newspapers": self.ids[:1], "next": "https://example.com/"},
+        )
+        self.assertRedirects(response, reverse("catalog:newspaper-list"))
+
+
+class NewspaperAdminBulkActionTests(BulkTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.admin_user = get_user_model().objects.create_superuser(
+            username="admin", password="strongpass123"
+        )
+        self.client.force_login(self.admin_user)
+        self.url = reverse("admin:catalog_newspaper_changelist")
+
+    def test_delete_asks_for_confirmation(self):
+        response = self.client.post(
+            self.url, {"action": "delete_newspapers", ACTION_CHECKBOX_NAME: self.ids}
+        )
+        self.assertTemplateUsed(response, "admin/catalog/newspaper/bulk_delete_confirmation.html")
+        self.assertEqual(Newspaper.objects.count(), 5)
+
+    def test_delete_after_confirmation(self):
+        self.client.post(
+            self.url,
+            {"action": "delete_newspapers", ACTION_CHECKBOX_NAME: self.ids, "post": "yes"},
+        )
+        self.assertEqual(Newspaper.objects.count(), 0)
+
+    def test_select_across_confirmation_posts_back_the_filters(self):
+        url = self.url + "?q=Newspaper"
+        response = self.client.post(
+            url, {"action": "delete_newspapers", ACTION_CHECKBOX_NAME: self.ids[:2], "select_across": "1"}
+        )
+        self.assertEqual(response.context["count"], 5)
+        self.assertContains(response, f'name="{ACTION_CHECKBOX_NAME}"', count=1)
+        self.client.post(
+            url,
+            {"action": "delete_newspapers", ACTION_CHECKBOX_NAME: self.ids[:1], "select_across": "1", "post": "yes"},
+        )
+        self.assertEqual(Newspaper.objects.count(), 0)
+
+    def test_default_delete_action_is_replaced(self):
+        response = self.client.get(self.url)
+        actions = [value for value, label in response.context["action_form"].fields["action"].choices]
+        self.assertNotIn("delete_selected", actions)
+        self.assertIn("delete_newspapers", actions)
+
+    def test_remove_topic(self):
+        self.client.post(
+            self.url,
+            {
+                "action": "remove_topic",
+                "topic": self.topic.pk,
+                ACTION_CHECKBOX_NAME: self.ids[:2],
+            },
+        )
+        self.assertEqual(self.topic.newspapers.count(), 3)
@@ -0,0 +1,94 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from catalog.models import Newspaper, Topic
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="writer", password="strongpass123")
+        self.client.force_login(self.user)
+        self.topic = Topic.objects.create(name="Science")
+        self.newspaper = Newspaper.objects.create(title="Morning", content="Text")
+        self.newspaper.topics.add(self.topic)
+        self.newspaper.publishers.add(self.user)
+        self.detail_url = reverse("catalog:newspaper-detail", args=[self.newspaper.pk])
+
+    def test_detail_not_modified(self):
+        # The first response sets the CSRF cookie, which is part of the ETag.
+        self.client.get(self.detail_url)
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("Last-Modified"))
+
+        with self.assertNumQueries(3):
+            # Session, user and the last-modified lookup, nothing is rendered.
+            response = self.client.get(self.detail_url, headers={"if-none-match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(
+            self.detail_url, headers={"if-modified-since": response["Last-Modified"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_changes_with_csrf_token(self):
+        self.client.get(self.detail_url)
+        etag = self.client.get(self.detail_url)["ETag"]
+        # As when logging in again, the page gets a new token.
+        del self.client.cookies[settings.CSRF_COOKIE_NAME]
+        self.client.get(reverse("catalog:index"))
+        response = self.client.get(self.detail_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_detail_changes_with_links_and_names(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.newspaper.topics.add(Topic.objects.create(name="Sports"))
+        response = self.client.get(self.detail_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+
+        etag = response["ETag"]
+        self.topic.name = "Physics"
+        self.topic.save()
+        response = self.client.get(self.detail_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Physics")
+
+    def test_redactor_detail_changes_with_newspaper_titles(self):
+        url = reverse("catalog:redactor-detail", args=[self.user.pk])
+        self.client.get(url)
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 304)
+        self.newspaper.title = "Evening"
+        self.newspaper.save()
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 200)
+
+    def test_list_etag_follows_generations_and_query(self):
+        url = reverse("catalog:topic-list")
+        # The first response sets the CSRF cookie, which is part of the ETag.
+        self.client.get(url)
+        etag = self.client.get(url)["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 304)
+        self.assertEqual(
+            self.client.get(url, {"name": "Sci"}, headers={"if-none-match": etag}).status_code, 200
+        )
+        Topic.objects.create(name="Sports")
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 200)
+
+    def test_pending_messages_are_not_answered_with_304(self):
+        url = reverse("catalog:newspaper-list")
+        self.client.get(url)
+        etag = self.client.get(url)["ETag"]
+        response = self.client.post(reverse("catalog:newspaper-bulk"), {"action": "delete"})
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+        response = self.client.get(url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(list(response.context["messages"]))
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 304)
+
+    def test_missing_detail_is_404(self):
+        url = reverse("catalog:newspaper-detail", args=[self.newspaper.pk + 1])
+        self.assertEqual(self.client.get(url, headers={"if-modified-since": http_date()}).status_code, 404)
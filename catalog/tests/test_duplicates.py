@@ -0,0 +1,89 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from catalog import bulk, duplicates
+from catalog.forms import NewspaperForm
+from catalog.models import Newspaper, NewspaperBand, NewspaperSignature, Topic
+from catalog.tasks import refresh_newspaper_signature
+
+ARTICLE = (
+    "The city council approved the new harbour budget on Tuesday after a long debate "
+    "about ferry routes, fishing quotas and the repair of the old lighthouse. "
+    "Residents asked for more frequent ferries in winter and cheaper tickets for students. "
+)
+EDITED = ARTICLE.replace("Tuesday", "Wednesday") + "The mayor thanked the volunteers."
+UNRELATED = "Local football club wins the regional cup with a late penalty in extra time."
+
+
+@override_settings(CATALOG_JOBS_MODE="immediate")
+class DuplicateTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="writer", password="strongpass123")
+        self.topic = Topic.objects.create(name="City")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.original = Newspaper.objects.create(title="Harbour budget", content=ARTICLE)
+
+    def form_data(self, content, **extra):
+        return {
+            "title": "Harbour budget again",
+            "content": content,
+            "topics": [self.topic.pk],
+            "publishers": [self.user.pk],
+            **extra,
+        }
+
+    def test_signature_similarity(self):
+        original = duplicates.signature(ARTICLE)
+        self.assertGreater(duplicates.similarity(original, duplicates.signature(EDITED)), 0.7)
+        self.assertLess(duplicates.similarity(original, duplicates.signature(UNRELATED)), 0.2)
+        self.assertIsNone(duplicates.signature("  "))
+
+    def test_signature_is_stored_on_save(self):
+        self.assertTrue(NewspaperSignature.objects.filter(newspaper=self.original).exists())
+        self.assertEqual(
+            NewspaperBand.objects.filter(newspaper=self.original).count(), duplicates.BANDS
+        )
+
+    def test_signature_is_only_refreshed_for_new_content(self):
+        with mock.patch.object(refresh_newspaper_signature, "enqueue") as enqueue:
+            self.original.title = "Harbour budget passed"
+            self.original.save()
+            enqueue.assert_not_called()
+            self.original.content = EDITED
+            self.original.save()
+            enqueue.assert_called_once_with(self.original.pk)
+
+    def test_find_duplicates(self):
+        matches = duplicates.find_duplicates(EDITED, threshold=0.5)
+        self.assertEqual([newspaper.pk for newspaper, score in matches], [self.original.pk])
+        self.assertEqual(duplicates.find_duplicates(UNRELATED), [])
+        self.assertEqual(duplicates.find_duplicates(ARTICLE, exclude=self.original.pk), [])
+
+    def test_form_warns_until_confirmed(self):
+        form = NewspaperForm(data=self.form_data(ARTICLE))
+        self.assertFalse(form.is_valid())
+        self.assertIn("near-duplicate of \"Harbour budget\"", form.errors["content"][0])
+        self.assertTrue(NewspaperForm(data=self.form_data(ARTICLE, confirm_duplicate="on")).is_valid())
+        self.assertTrue(NewspaperForm(data=self.form_data(UNRELATED)).is_valid())
+
+    def test_editing_the_original_is_not_a_duplicate(self):
+        form = NewspaperForm(data=self.form_data(ARTICLE + " Updated."), instance=self.original)
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_create_view_shows_confirmation(self):
+        self.client.force_login(self.user)
+        response = self.client.post(reverse("catalog:newspaper-create"), self.form_data(ARTICLE))
+        self.assertContains(response, "Save anyway")
+        self.assertEqual(Newspaper.objects.count(), 1)
+
+    def test_rebuild_and_delete(self):
+        NewspaperSignature.objects.all().delete()
+        NewspaperBand.objects.all().delete()
+        self.assertEqual(duplicates.batches(missing=True), [[self.original.pk]])
+        self.assertEqual(duplicates.rebuild(), 1)
+        bulk.delete_newspapers([self.original.pk])
+        self.assertFalse(NewspaperSignature.objects.exists())
+        self.assertFalse(NewspaperBand.objects.exists())
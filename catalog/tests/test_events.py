@@ -0,0 +1,150 @@
+import asyncio
+import json
+import tempfile
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from catalog import bulk, events
+from catalog.models import Newspaper, Topic
+
+
+def read_event(chunk):
+    data = next(line for line in chunk.splitlines() if line.startswith("data: "))
+    return json.loads(data[len("data: "):])
+
+
+class EventBusTests(SimpleTestCase):
+    def setUp(self):
+        self.bus = events.EventBus()
+        self.bus.backend = events.LocalBackend(self.bus)
+
+    def test_publish_without_subscribers_skips_rendering(self):
+        render = mock.Mock(return_value={})
+        self.assertIsNone(self.bus.publish("newspaper", "created", render, pk=1))
+        render.assert_not_called()
+
+    async def test_events_reach_subscribers_from_other_threads(self):
+        subscription, missed = self.bus.subscribe()
+        self.assertEqual(missed, [])
+        thread = threading.Thread(
+            target=self.bus.publish, args=("topic", "created"), kwargs={"pk": 3, "name": "Science"}
+        )
+        thread.start()
+        event = await asyncio.wait_for(subscription.queue.get(), 1)
+        thread.join()
+        self.assertEqual((event["model"], event["action"], event["pk"]), ("topic", "created", 3))
+
+    async def test_missed_events_are_replayed(self):
+        subscription, _ = self.bus.subscribe()
+        first = self.bus.publish("topic", "created", pk=1)
+        second = self.bus.publish("topic", "updated", pk=1)
+        self.bus.unsubscribe(subscription)
+        _, missed = self.bus.subscribe(first["id"])
+        self.assertEqual(missed, [second])
+
+    @override_settings(CATALOG_EVENTS_QUEUE_SIZE=1)
+    async def test_slow_subscribers_are_cut_off(self):
+        subscription, _ = self.bus.subscribe()
+        self.bus.publish("topic", "created", pk=1)
+        self.bus.publish("topic", "created", pk=2)
+        await asyncio.sleep(0)
+        self.assertIsNone(subscription.queue.get_nowait())
+
+    @override_settings(CATALOG_EVENTS_HEARTBEAT=0.01)
+    async def test_stream_sends_heartbeats_while_idle(self):
+        with mock.patch("catalog.events.get_bus", return_value=self.bus):
+            stream = events.stream()
+            self.assertTrue((await stream.__anext__()).startswith("retry:"))
+            self.assertEqual(await stream.__anext__(), ": keep-alive\n\n")
+            self.bus.publish("redactor", "deleted", pk=5)
+            self.assertEqual(read_event(await stream.__anext__())["action"], "deleted")
+            await stream.aclose()
+        self.assertFalse(self.bus.has_subscribers())
+
+    async def test_socket_backend_fans_out_to_every_process(self):
+        with tempfile.TemporaryDirectory() as directory:
+            buses = []
+            for name in ("first", "second"):
+                bus = events.EventBus()
+                bus.backend = events.SocketBackend(bus, directory, name=name)
+                buses.append(bus)
+            subscriptions = [bus.subscribe()[0] for bus in buses]
+            buses[0].publish("topic", "created", pk=7)
+            for subscription in subscriptions:
+                event = await asyncio.wait_for(subscription.queue.get(), 1)
+                self.assertEqual(event["pk"], 7)
+
+    async def test_socket_backend_skips_rendering_without_listeners(self):
+        with tempfile.TemporaryDirectory() as directory:
+            bus = events.EventBus()
+            bus.backend = events.SocketBackend(bus, directory, name="only")
+            render = mock.Mock(return_value={})
+            self.assertIsNone(bus.publish("newspaper", "created", render, pk=1))
+            subscription, _ = bus.subscribe()
+            other = events.EventBus()
+            other.backend = events.SocketBackend(other, directory, name="other")
+            self.assertIsNotNone(other.publish("newspaper", "created", render, pk=1))
+            render.assert_called_once()
+            bus.unsubscribe(subscription)
+            self.assertIsNone(other.publish("newspaper", "created", render, pk=2))
+
+
+@override_settings(CATALOG_JOBS_MODE="immediate")
+class EventSignalTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="writer", password="strongpass123")
+
+    def test_changes_are_published_on_commit(self):
+        with mock.patch("catalog.events.publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                newspaper = Newspaper.objects.create(title="Launch", content="Text")
+                topic = Topic.objects.create(name="Science")
+                publish.assert_not_called()
+            with self.captureOnCommitCallbacks(execute=True):
+                bulk.delete_newspapers([newspaper.pk])
+        calls = [(call.args[0], call.args[1], call.kwargs) for call in publish.call_args_list]
+        self.assertEqual(calls[0], ("newspaper", "created", {"pk": newspaper.pk}))
+        self.assertEqual(calls[1], ("topic", "created", {"pk": topic.pk, "name": "Science"}))
+        self.assertEqual(calls[2], ("newspaper", "deleted", {"pks": [newspaper.pk]}))
+
+    def test_newspaper_card(self):
+        newspaper = Newspaper.objects.create(title="Launch day", content="Text")
+        newspaper.publishers.add(self.user)
+        html = events.render_newspaper_card(newspaper.pk)["html"]
+        self.assertIn("Launch day", html)
+        self.assertIn(f'data-newspaper="{newspaper.pk}"', html)
+        self.assertEqual(events.render_newspaper_card(newspaper.pk + 1), {})
+
+    async def test_list_page_is_live_on_first_page_only(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("catalog:newspaper-list"))
+        self.assertContains(response, 'data-live="true"')
+        response = await self.async_client.get(reverse("catalog:newspaper-list"), {"title": "x"})
+        self.assertContains(response, 'data-live=""')
+
+    def test_list_page_is_not_live_under_wsgi(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("catalog:newspaper-list"))
+        self.assertContains(response, 'data-live=""')
+
+    def test_stream_view_under_wsgi_ends_at_once(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("catalog:events"))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(b"".join(response), b"")
+
+    async def test_stream_view(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("catalog:events"), headers={"last-event-id": "0"})
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        content = aiter(response.streaming_content)
+        self.assertTrue((await anext(content)).startswith(b"retry:"))
+        await response.streaming_content.aclose()
+
+    def test_stream_view_requires_login(self):
+        response = self.client.get(reverse("catalog:events"))
+        self.assertEqual(response.status_code, 302)
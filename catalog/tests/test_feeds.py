@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from catalog import purge
+from catalog.models import Newspaper, Topic
+
+
+@override_settings(CATALOG_JOBS_MODE="immediate", CATALOG_FEED_ITEMS=2, CATALOG_FEEDS_PUBLIC=True)
+class FeedTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.writer = get_user_model().objects.create_user(username="writer", password="strongpass123")
+        self.other = get_user_model().objects.create_user(username="other", password="strongpass123")
+        self.science = Topic.objects.create(name="Science")
+        self.sports = Topic.objects.create(name="Sports")
+        now = timezone.now()
+        for days, title in ((3, "Oldest"), (2, "Older"), (1, "Newest")):
+            newspaper = self.create_newspaper(title, self.science)
+            Newspaper.objects.filter(pk=newspaper.pk).update(published_date=now - timedelta(days=days))
+
+    def create_newspaper(self, title, *topics, publisher=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper = Newspaper.objects.create(title=title, content=f"{title} content")
+            newspaper.topics.add(*topics)
+            newspaper.publishers.add(publisher or self.writer)
+        return newspaper
+
+    def test_feed_lists_newest_items_up_to_the_cap(self):
+        response = self.client.get(reverse("catalog:newspaper-feed"))
+        self.assertEqual(response["Content-Type"], "application/rss+xml; charset=utf-8")
+        content = response.content.decode()
+        self.assertLess(content.index("Newest"), content.index("Older"))
+        self.assertNotIn("Oldest", content)
+        self.assertIn("<category>Science</category>", content)
+
+    @override_settings(CATALOG_FEEDS_PUBLIC=False)
+    def test_private_feeds_need_login(self):
+        url = reverse("catalog:topic-feed", args=[self.science.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("login", response["Location"])
+        self.client.force_login(self.writer)
+        self.assertContains(self.client.get(url), "Newest")
+
+    def test_cached_feed_needs_no_queries(self):
+        self.client.get(reverse("catalog:topic-feed", args=[self.science.pk]))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("catalog:topic-feed", args=[self.science.pk]))
+        self.assertContains(response, "Newest")
+
+    def test_conditional_get(self):
+        url = reverse("catalog:newspaper-feed-atom")
+        response = self.client.get(url)
+        self.assertEqual(response["Content-Type"], "application/atom+xml; charset=utf-8")
+        self.assertEqual(self.client.get(url, headers={"if-none-match": response["ETag"]}).status_code, 304)
+        since = self.client.get(url, headers={"if-modified-since": response["Last-Modified"]})
+        self.assertEqual(since.status_code, 304)
+
+    def test_changes_drop_only_the_relevant_feeds(self):
+        science = reverse("catalog:topic-feed", args=[self.science.pk])
+        other = reverse("catalog:redactor-feed", args=[self.other.pk])
+        self.client.get(science)
+        self.client.get(other)
+        self.create_newspaper("Breaking", self.science)
+        self.assertContains(self.client.get(science), "Breaking")
+        with self.assertNumQueries(0):
+            self.client.get(other)
+
+        newspaper = Newspaper.objects.get(title="Breaking")
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper.topics.remove(self.science)
+        self.assertNotContains(self.client.get(science), "Breaking")
+
+    def test_deleted_topic_feed_is_gone(self):
+        url = reverse("catalog:topic-feed", args=[self.science.pk])
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            purge.soft_delete(self.science)
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -0,0 +1,70 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from catalog.fields import (
+    CODEC_RAW,
+    CODEC_ZLIB,
+    PackedText,
+    pack_text,
+    unpack_text,
+)
+from catalog.models import Newspaper
+
+
+class PackTextTests(TestCase):
+    def test_short_text_is_stored_raw(self):
+        data = pack_text("short", threshold=512)
+        self.assertEqual(data[0], CODEC_RAW)
+        self.assertEqual(unpack_text(data), "short")
+
+    def test_long_text_is_compressed(self):
+        text = "Редакція " * 200
+        data = pack_text(text, threshold=512, codec="zlib")
+        self.assertEqual(data[0], CODEC_ZLIB)
+        self.assertLess(len(data), len(text.encode("utf-8")))
+        self.assertEqual(unpack_text(data), text)
+
+    def test_incompressible_text_is_stored_raw(self):
+        data = pack_text("x7Qp2Lm9Rt", threshold=1, codec="zlib")
+        self.assertEqual(data[0], CODEC_RAW)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            unpack_text(b"\x09payload")
+
+
+@override_settings(CATALOG_COMPRESSION_THRESHOLD=64, CATALOG_COMPRESSION_CODEC="zlib")
+class CompressedTextFieldTests(TestCase):
+    def setUp(self):
+        self.content = "Latest advancements in technology. " * 50
+        self.newspaper = Newspaper.objects.create(title="Tech", content=self.content)
+
+    def test_round_trip(self):
+        newspaper = Newspaper.objects.get(pk=self.newspaper.pk)
+        self.assertEqual(newspaper.content, self.content)
+
+    def test_column_holds_compressed_bytes(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT content FROM catalog_newspaper WHERE id = %s", [self.newspaper.pk]
+            )
+            stored = bytes(cursor.fetchone()[0])
+        self.assertEqual(stored[0], CODEC_ZLIB)
+        self.assertLess(len(stored), len(self.content))
+
+    def test_value_is_decompressed_on_access(self):
+        newspaper = Newspaper.objects.get(pk=self.newspaper.pk)
+        self.assertIsInstance(newspaper.__dict__["content"], PackedText)
+        self.assertEqual(newspaper.content, self.content)
+        self.assertIsInstance(newspaper.__dict__["content"], str)
+
+    def test_unchanged_value_is_saved_without_recompressing(self):
+        newspaper = Newspaper.objects.get(pk=self.newspaper.pk)
+        newspaper.title = "Renamed"
+        newspaper.save()
+        newspaper.refresh_from_db()
+        self.assertEqual(newspaper.content, self.content)
+
+    def test_deferred_content(self):
+        newspaper = Newspaper.objects.defer("content").get(pk=self.newspaper.pk)
+        self.assertEqual(newspaper.content, self.content)
@@ -0,0 +1,156 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from catalog import jobs
+from catalog.models import Job
+
+
+calls = []
+
+
+@jobs.job(name="tests.record_call", max_attempts=2)
+def record_call(value):
+    calls.append(value)
+
+
+@jobs.job(name="tests.always_fail", max_attempts=2)
+def always_fail():
+    raise RuntimeError("boom")
+
+
+class JobTestMixin:
+    def setUp(self):
+        calls.clear()
+
+
+@override_settings(CATALOG_JOBS_MODE="immediate")
+class ImmediateJobTests(JobTestMixin, TestCase):
+    def test_job_runs_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record_call.enqueue(1)
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [1])
+
+    def test_job_is_not_run_before_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            record_call.enqueue(1)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(calls, [])
+
+    def test_unknown_job(self):
+        with self.assertRaises(KeyError):
+            jobs.enqueue("tests.missing")
+
+    def test_identical_pending_job_is_deduplicated(self):
+        key = jobs.get_dedup_key("tests.record_call", [1], {})
+        jobs._pending.add(key)
+        try:
+            jobs.dispatch("tests.record_call", [1], {})
+        finally:
+            jobs._pending.discard(key)
+        self.assertEqual(calls, [])
+        jobs.dispatch("tests.record_call", [1], {})
+        self.assertEqual(calls, [1])
+
+
+@override_settings(CATALOG_JOBS_MODE="db", CATALOG_JOBS_RETRY_DELAY=1)
+class DatabaseJobTests(JobTestMixin, TestCase):
+    def test_enqueue_creates_pending_job(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record_call.enqueue(1)
+        job = Job.objects.get()
+        self.assertEqual(job.name, "tests.record_call")
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertEqual(calls, [])
+
+    def test_identical_pending_jobs_are_deduplicated(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record_call.enqueue(1)
+            record_call.enqueue(1)
+            record_call.enqueue(2)
+        self.assertEqual(Job.objects.count(), 2)
+
+    def test_worker_runs_jobs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record_call.enqueue(1)
+            record_call.enqueue(2)
+        self.assertEqual(jobs.work(once=True), 2)
+        self.assertEqual(calls, [1, 2])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_job_is_retried_then_marked_failed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            always_fail.enqueue()
+        with self.assertLogs("catalog.jobs", "ERROR"):
+            jobs.work(once=True)
+        job = Job.objects.get()
+        self.assertEqual(job.status, Job.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertGreater(job.run_after, timezone.now())
+
+        Job.objects.update(run_after=timezone.now())
+        with self.assertLogs("catalog.jobs", "ERROR"):
+            jobs.work(once=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+        self.assertIn("boom", job.last_error)
+
+    def test_old_failed_jobs_are_pruned(self):
+        now = timezone.now()
+        old = Job.objects.create(
+            name="tests.always_fail", dedup_key="a", status=Job.FAILED, finished_at=now - timedelta(days=30)
+        )
+        recent = Job.objects.create(name="tests.always_fail", dedup_key="b", status=Job.FAILED, finished_at=now)
+        done = Job.objects.create(name="tests.record_call", dedup_key="c", status=Job.DONE, finished_at=now)
+        self.assertEqual(jobs.prune_finished_jobs(), 2)
+        self.assertEqual(list(Job.objects.all()), [recent])
+        self.assertFalse(Job.objects.filter(pk__in=[old.pk, done.pk]).exists())
+
+    def test_retry_is_dropped_when_identical_job_is_pending(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            always_fail.enqueue()
+        job = jobs.claim_jobs("worker")[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            always_fail.enqueue()
+        with self.assertLogs("catalog.jobs", "ERROR"):
+            jobs.run_job(job)
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertFalse(Job.objects.filter(pk=job.pk).exists())
+
+    def test_stale_running_jobs_are_released(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record_call.enqueue(1)
+        jobs.claim_jobs("dead-worker")
+        Job.objects.update(locked_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(jobs.release_stale_jobs(600), 1)
+        self.assertEqual(Job.objects.get().status, Job.PENDING)
+
+
+@override_settings(CATALOG_JOBS_MODE="thread")
+class ThreadJobTests(JobTestMixin, TestCase):
+    def test_job_is_submitted_to_pool(self):
+        executor = mock.Mock()
+        with mock.patch.object(jobs, "get_executor", return_value=executor):
+            jobs.dispatch("tests.record_call", [1], {})
+        executor.submit.assert_called_once()
+        jobs._pending.clear()
+
+    def test_failed_attempt_is_rescheduled_without_holding_a_pool_thread(self):
+        executor = mock.Mock()
+        with mock.patch.object(jobs, "get_executor", return_value=executor), mock.patch(
+            "threading.Timer"
+        ) as timer, mock.patch("time.sleep") as sleep, self.assertLogs("catalog.jobs", "ERROR"):
+            jobs.run_in_process("tests.always_fail", [], {}, "key")
+        sleep.assert_not_called()
+        timer.assert_called_once_with(
+            jobs.get_retry_delay(1), executor.submit, args=(jobs.run_in_process, "tests.always_fail", [], {}, "key", 2)
+        )
+        timer.return_value.start.assert_called_once()
+
+    def test_last_attempt_is_not_rescheduled(self):
+        with mock.patch("threading.Timer") as timer, self.assertLogs("catalog.jobs", "ERROR"):
+            jobs.run_in_process("tests.always_fail", [], {}, "key", attempt=2)
+        timer.assert_not_called()
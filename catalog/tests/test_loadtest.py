@@ -0,0 +1,61 @@
+import os
+import runpy
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from catalog import loadtest
+
+
+class GunicornConfigTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def load_config(self, **env):
+        env = dict({"PROMETHEUS_MULTIPROC_DIR": os.path.join(self.directory, "metrics")}, **env)
+        with mock.patch.dict(os.environ, env), mock.patch("multiprocessing.cpu_count", return_value=4):
+            return runpy.run_path(str(loadtest.GUNICORN_CONFIG))
+
+    def test_worker_model_per_mode(self):
+        sync = self.load_config(GUNICORN_MODE="sync")
+        self.assertEqual((sync["worker_class"], sync["workers"], sync["threads"]), ("sync", 9, 1))
+        gthread = self.load_config(GUNICORN_MODE="gthread", GUNICORN_THREADS="8")
+        self.assertEqual((gthread["worker_class"], gthread["workers"], gthread["threads"]), ("gthread", 5, 8))
+        asgi = self.load_config(GUNICORN_MODE="asgi")
+        self.assertEqual(asgi["worker_class"], "uvicorn_worker.UvicornWorker")
+        self.assertEqual(asgi["wsgi_app"], "config.asgi:application")
+        self.assertTrue(asgi["preload_app"])
+
+    def test_asgi_is_the_default_mode(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop("GUNICORN_MODE", None)
+            self.assertEqual(self.load_config()["wsgi_app"], "config.asgi:application")
+
+    def test_web_concurrency_overrides_workers(self):
+        self.assertEqual(self.load_config(GUNICORN_MODE="sync", WEB_CONCURRENCY="2")["workers"], 2)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(RuntimeError):
+            self.load_config(GUNICORN_MODE="eventlet")
+
+    def test_metrics_directory_starts_empty(self):
+        os.makedirs(os.path.join(self.directory, "metrics"))
+        open(os.path.join(self.directory, "metrics", "counter_1.db"), "w").close()
+        self.load_config()
+        self.assertEqual(os.listdir(os.path.join(self.directory, "metrics")), [])
+
+
+class ProcessTests(SimpleTestCase):
+    def test_children_and_memory(self):
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(5)"])
+        self.addCleanup(child.wait)
+        self.addCleanup(child.kill)
+        self.assertIn(child.pid, loadtest.children(os.getpid()))
+        rss, pss = loadtest.memory_kib(os.getpid())
+        self.assertGreater(rss, 0)
+        self.assertGreater(pss, 0)
@@ -0,0 +1,93 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+
+WORKER = """
+import django
+django.setup()
+from catalog import metrics
+metrics.REQUEST_QUERIES.labels("catalog:index").observe(3)
+"""
+
+SCRAPE = """
+import django
+django.setup()
+from catalog import metrics
+print(metrics.render().decode())
+"""
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="user", password="pass")
+        self.client.force_login(self.user)
+
+    def test_request_latency_and_queries_by_url_name(self):
+        view = "catalog:topic-list"
+        before = sample("catalog_request_duration_seconds_count", view=view, method="GET")
+        queries = sample("catalog_request_queries_sum", view=view)
+        self.client.get(reverse(view))
+        self.assertEqual(sample("catalog_request_duration_seconds_count", view=view, method="GET"), before + 1)
+        self.assertGreater(sample("catalog_request_queries_sum", view=view), queries)
+
+    def test_template_render_time(self):
+        before = sample("catalog_template_render_seconds_count", template="catalog/topic_list.html")
+        self.client.get(reverse("catalog:topic-list"))
+        self.assertEqual(sample("catalog_template_render_seconds_count", template="catalog/topic_list.html"), before + 1)
+
+    def test_cache_hits_and_misses(self):
+        hits = sample("catalog_cache_requests_total", cache="default", result="hit")
+        misses = sample("catalog_cache_requests_total", cache="default", result="miss")
+        cache.set("catalog.test.metrics", 1)
+        self.assertEqual(cache.get("catalog.test.metrics"), 1)
+        self.assertIsNone(cache.get("catalog.test.missing"))
+        self.assertEqual(cache.get("catalog.test.missing", "fallback"), "fallback")
+        self.assertEqual(sample("catalog_cache_requests_total", cache="default", result="hit"), hits + 1)
+        self.assertEqual(sample("catalog_cache_requests_total", cache="default", result="miss"), misses + 2)
+
+    def test_endpoint(self):
+        staff = get_user_model().objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.force_login(staff)
+        response = self.client.get(reverse("catalog:metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"# TYPE catalog_request_duration_seconds histogram", response.content)
+
+    def test_endpoint_without_token_is_staff_only(self):
+        self.assertEqual(self.client.get(reverse("catalog:metrics")).status_code, 403)
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("catalog:metrics")).status_code, 403)
+
+    @override_settings(CATALOG_METRICS_TOKEN="secret")
+    def test_endpoint_token(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("catalog:metrics")).status_code, 401)
+        response = self.client.get(reverse("catalog:metrics"), headers={"Authorization": "Bearer secret"})
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(CATALOG_METRICS=False)
+    def test_disabled(self):
+        self.assertEqual(self.client.get(reverse("catalog:metrics")).status_code, 404)
+
+    def test_multiprocess_aggregation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=directory, SECRET_KEY="x")
+            env.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.dev")
+            for _ in range(2):
+                subprocess.run([sys.executable, "-c", WORKER], env=env, cwd=settings.BASE_DIR, check=True)
+            output = subprocess.run(
+                [sys.executable, "-c", SCRAPE], env=env, cwd=settings.BASE_DIR, check=True, capture_output=True, text=True
+            ).stdout
+        self.assertIn('catalog_request_queries_sum{view="catalog:index"} 6.0', output)
@@ -0,0 +1,63 @@
+import gzip
+import unittest
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from catalog.middleware import CompressionMiddleware, brotli, choose_encoding
+
+BODY = b"<p>" + b"Newspaper content " * 100 + b"</p>"
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def run_middleware(self, response, accept="gzip", view_name="catalog:newspaper-detail"):
+        request = self.factory.get("/", headers={"accept-encoding": accept})
+        request.resolver_match = type("Match", (), {"view_name": view_name})()
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_choose_encoding(self):
+        self.assertEqual(choose_encoding("gzip, deflate"), "gzip")
+        self.assertEqual(choose_encoding("br;q=0, gzip;q=0.5"), "gzip")
+        self.assertIsNone(choose_encoding("identity"))
+        self.assertIsNone(choose_encoding("gzip;q=0"))
+
+    def test_gzip(self):
+        response = self.run_middleware(HttpResponse(BODY))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), BODY)
+        self.assertIn("compress;dur=", response["Server-Timing"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    @unittest.skipUnless(brotli, "brotli is not installed")
+    def test_brotli_preferred(self):
+        response = self.run_middleware(HttpResponse(BODY), accept="gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), BODY)
+
+    def test_small_and_binary_bodies_are_skipped(self):
+        self.assertFalse(self.run_middleware(HttpResponse(b"<p>short</p>")).has_header("Content-Encoding"))
+        response = self.run_middleware(HttpResponse(BODY, content_type="image/png"))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    @override_settings(CATALOG_RESPONSE_COMPRESSION_VIEWS={"catalog:newspaper-detail": False})
+    def test_view_opt_out(self):
+        self.assertFalse(self.run_middleware(HttpResponse(BODY)).has_header("Content-Encoding"))
+
+    @override_settings(CATALOG_RESPONSE_COMPRESSION_VIEWS={"catalog:newspaper-detail": {"min_length": 10000}})
+    def test_view_options(self):
+        self.assertFalse(self.run_middleware(HttpResponse(BODY)).has_header("Content-Encoding"))
+
+    def test_streaming_chunks_are_flushed(self):
+        response = self.run_middleware(StreamingHttpResponse(iter([BODY, BODY])))
+        chunks = list(response.streaming_content)
+        # Each input chunk produces output right away instead of at the end.
+        self.assertGreaterEqual(len(chunks), 3)
+        self.assertEqual(gzip.decompress(b"".join(chunks)), BODY * 2)
+
+    def test_strong_etag_is_weakened(self):
+        response = HttpResponse(BODY)
+        response["ETag"] = '"abc"'
+        self.assertEqual(self.run_middleware(response)["ETag"], 'W/"abc"')
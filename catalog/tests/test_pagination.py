@@ -0,0 +1,124 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.paginator import EmptyPage
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from catalog import bulk, counters
+from catalog.models import Newspaper
+from catalog.pagination import EstimatedCountPaginator
+from catalog.templatetags.pagination_tags import approximate_count, get_page_window
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        Newspaper.objects.bulk_create(
+            [Newspaper(title=f"Newspaper {i}", content="Sample content") for i in range(12)]
+        )
+
+    def test_unfiltered_count_uses_estimate(self):
+        with mock.patch("catalog.pagination.get_table_estimate", return_value=2_300_000):
+            paginator = EstimatedCountPaginator(Newspaper.objects.order_by("pk"), 9)
+            self.assertEqual(paginator.count, 2_300_000)
+        self.assertTrue(paginator.is_estimated)
+
+    def test_small_estimate_counts_exactly(self):
+        with mock.patch("catalog.pagination.get_table_estimate", return_value=100):
+            paginator = EstimatedCountPaginator(Newspaper.objects.order_by("pk"), 9)
+            self.assertEqual(paginator.count, 12)
+        self.assertFalse(paginator.is_estimated)
+
+    def test_filtered_count_is_exact(self):
+        with mock.patch("catalog.pagination.get_table_estimate", return_value=2_300_000) as estimate:
+            paginator = EstimatedCountPaginator(
+                Newspaper.objects.filter(title__icontains="1").order_by("pk"), 9
+            )
+            self.assertEqual(paginator.count, 3)
+        estimate.assert_not_called()
+
+    def test_no_estimate_on_sqlite(self):
+        paginator = EstimatedCountPaginator(Newspaper.objects.order_by("pk"), 9)
+        self.assertEqual(paginator.count, 12)
+        self.assertFalse(paginator.is_estimated)
+
+    def test_unfiltered_count_prefers_counter(self):
+        counters.set_value(counters.NEWSPAPER_COUNT, 2_300_000)
+        with mock.patch("catalog.pagination.get_table_estimate") as estimate:
+            paginator = EstimatedCountPaginator(
+                Newspaper.objects.order_by("pk"), 9, counter_name=counters.NEWSPAPER_COUNT
+            )
+            self.assertEqual(paginator.count, 2_300_000)
+        estimate.assert_not_called()
+
+    @override_settings(CATALOG_COUNT_CAP=5)
+    def test_filtered_count_is_capped(self):
+        paginator = EstimatedCountPaginator(
+            Newspaper.objects.filter(title__startswith="Newspaper").order_by("pk"), 3
+        )
+        self.assertEqual(paginator.count, 5)
+        self.assertTrue(paginator.is_capped)
+        page = paginator.page(4)
+        self.assertEqual(len(page), 3)
+        self.assertFalse(page.has_next())
+        self.assertEqual(page.end_index(), 12)
+        with self.assertRaises(EmptyPage):
+            paginator.page(5)
+
+    def test_page_probes_next_row(self):
+        with mock.patch("catalog.pagination.get_table_estimate", return_value=2_300_000):
+            paginator = EstimatedCountPaginator(Newspaper.objects.order_by("pk"), 6)
+            self.assertTrue(paginator.page(1).has_next())
+            self.assertFalse(paginator.page(2).has_next())
+
+
+class NewspaperCounterTests(TestCase):
+    def test_counter_follows_saves_and_deletes(self):
+        counters.rebuild()
+        newspaper = Newspaper.objects.create(title="Morning", content="Text")
+        Newspaper.objects.create(title="Evening", content="Text")
+        self.assertEqual(counters.get_value(counters.NEWSPAPER_COUNT), 2)
+        newspaper.delete()
+        self.assertEqual(counters.get_value(counters.NEWSPAPER_COUNT), 1)
+
+    def test_counter_follows_bulk_deletes(self):
+        newspapers = Newspaper.objects.bulk_create(
+            [Newspaper(title=f"Newspaper {i}", content="Text") for i in range(5)]
+        )
+        counters.rebuild()
+        bulk.delete_newspapers([newspaper.pk for newspaper in newspapers[:3]])
+        self.assertEqual(counters.get_value(counters.NEWSPAPER_COUNT), 2)
+
+
+class ApproximateCountTests(SimpleTestCase):
+    def test_rounding(self):
+        self.assertEqual(approximate_count(950), "950")
+        self.assertEqual(approximate_count(10000), "10K")
+        self.assertEqual(approximate_count(2_312_345), "2.3M")
+
+
+class PageWindowTests(SimpleTestCase):
+    def test_window_elides_both_ends(self):
+        self.assertEqual(
+            get_page_window(50, 100_000), [1, None, 48, 49, 50, 51, 52, None, 100_000]
+        )
+
+    def test_window_near_start(self):
+        self.assertEqual(get_page_window(2, 10), [1, 2, 3, 4, None, 10])
+
+    def test_unknown_last_page_is_not_linked(self):
+        self.assertEqual(get_page_window(50, 51, last_known=False), [1, None, 48, 49, 50, 51])
+
+
+class PaginationTagTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="reader", password="pass12345")
+        self.client.force_login(self.user)
+        Newspaper.objects.bulk_create(
+            [Newspaper(title=f"Newspaper {i}", content="Text") for i in range(30)]
+        )
+
+    def test_links_keep_query_string(self):
+        response = self.client.get(reverse("catalog:newspaper-list"), {"title": "News", "page": 2})
+        self.assertContains(response, 'href="?title=News&amp;page=3"')
+        self.assertContains(response, 'href="?title=News&amp;page=1"')
@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from catalog import profiling
+
+TEMPLATE = (
+    "{% load pagination_tags %}"
+    "{% block main %}{% for item in items %}{{ item|upper }}{% endfor %}{% endblock %}"
+    "{% include 'includes/pagination.html' %}"
+)
+
+
+class ProfilingTests(TestCase):
+    def setUp(self):
+        profiling.reset()
+        self.addCleanup(profiling.reset)
+
+    def test_collect_records_templates_blocks_tags_and_filters(self):
+        template = Template(TEMPLATE)
+        with profiling.collect() as profile:
+            template.render(Context({"items": ["a", "b"]}))
+        names = {entry["name"]: entry["calls"] for entry in profile.as_list()}
+        self.assertIn("block main", names)
+        self.assertEqual(names["tag for"], 1)
+        self.assertEqual(names["filter upper"], 2)
+        self.assertIn("include includes/pagination.html", names)
+        self.assertIn("template includes/pagination.html", names)
+
+    def test_nothing_recorded_outside_collect(self):
+        with profiling.collect() as profile:
+            pass
+        Template(TEMPLATE).render(Context({"items": ["a"]}))
+        self.assertEqual(profile.entries, {})
+
+    def test_report_is_hidden_while_disabled(self):
+        staff = get_user_model().objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.force_login(staff)
+        self.assertEqual(self.client.get(reverse("catalog:template-profile")).status_code, 404)
+
+    @override_settings(CATALOG_TEMPLATE_PROFILING=True)
+    def test_middleware_collects_and_staff_sees_report(self):
+        staff = get_user_model().objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.force_login(staff)
+        self.client.get(reverse("catalog:topic-list"))
+        report = self.client.get(reverse("catalog:template-profile")).json()
+        self.assertEqual(report["recent"][0]["path"], reverse("catalog:topic-list"))
+        self.assertIn("template catalog/topic_list.html", {entry["name"] for entry in report["totals"]})
+
+    @override_settings(CATALOG_TEMPLATE_PROFILING=True)
+    def test_report_requires_staff(self):
+        user = get_user_model().objects.create_user(username="user", password="pass")
+        self.client.force_login(user)
+        response = self.client.get(reverse("catalog:template-profile"))
+        self.assertEqual(response.status_code, 302)
@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from catalog import jobs, purge
+from catalog.models import Newspaper, Redactor, Topic
+
+
+class PurgeTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser",
+            password="strongpass123"
+        )
+        self.client.force_login(self.user)
+        self.topic = Topic.objects.create(name="Science")
+        self.redactor = get_user_model().objects.create_user(username="writer", password="strongpass123")
+        self.newspapers = Newspaper.objects.bulk_create(
+            [Newspaper(title=f"Newspaper {i}", content="Sample content") for i in range(25)]
+        )
+        for newspaper in self.newspapers:
+            newspaper.topics.add(self.topic)
+            newspaper.publishers.add(self.redactor)
+
+    def test_soft_delete_hides_object(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            purge.soft_delete(self.topic)
+        jobs_enqueued = [
+            callback.args[0] for callback in callbacks if getattr(callback, "func", None) is jobs.dispatch
+        ]
+        self.assertEqual(jobs_enqueued, ["catalog.tasks.purge_deleted"])
+        self.assertFalse(Topic.objects.filter(pk=self.topic.pk).exists())
+        self.assertTrue(Topic.all_objects.filter(pk=self.topic.pk).exists())
+        self.assertEqual(self.newspapers[0].topics.count(), 0)
+        # The name can be reused straight away.
+        Topic.objects.create(name="Science")
+
+    def test_purge_removes_links_in_batches(self):
+        purge.soft_delete(self.topic)
+        progress = []
+        removed = purge.purge(Topic, self.topic.pk, batch_size=10, progress=progress.append)
+        self.assertEqual(removed, 25)
+        self.assertEqual(progress[-1], 25)
+        self.assertGreater(len(progress), 1)
+        self.assertFalse(Topic.all_objects.filter(pk=self.topic.pk).exists())
+        self.assertFalse(Newspaper.topics.through.objects.exists())
+        self.assertEqual(Newspaper.objects.count(), 25)
+
+    def test_purge_skips_live_objects(self):
+        self.assertEqual(purge.purge(Topic, self.topic.pk), 0)
+        self.assertTrue(Topic.objects.filter(pk=self.topic.pk).exists())
+
+    @override_settings(CATALOG_JOBS_MODE="immediate")
+    def test_redactor_delete_view_purges_after_commit(self):
+        url = reverse("catalog:redactor-delete", args=[self.redactor.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url)
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Redactor.all_objects.filter(pk=self.redactor.pk).exists())
+        self.assertFalse(Newspaper.publishers.through.objects.exists())
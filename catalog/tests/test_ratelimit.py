@@ -0,0 +1,120 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from catalog import ratelimit
+
+RULES = {
+    "catalog:topic-list": {"params": ["name"], "user": (60, 2), "ip": (60, 3)},
+    "catalog:topic-create": {"methods": ["POST"], "ip": (60, 1)},
+}
+
+
+class BackendTests(SimpleTestCase):
+    def check_backend(self, backend):
+        self.assertEqual(backend.take("key", 1, 2, now=100), 0)
+        self.assertEqual(backend.take("key", 1, 2, now=100), 0)
+        self.assertAlmostEqual(backend.take("key", 1, 2, now=100), 1)
+        self.assertAlmostEqual(backend.take("key", 1, 2, now=100.5), 0.5)
+        self.assertEqual(backend.take("key", 1, 2, now=101.1), 0)
+        self.assertEqual(backend.take("other", 1, 2, now=101.1), 0)
+
+    def test_local_backend(self):
+        self.check_backend(ratelimit.LocalBackend())
+
+    def test_file_backend_is_shared_between_instances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "buckets.bin")
+            self.check_backend(ratelimit.FileBackend(path))
+            second = ratelimit.FileBackend(path)
+            self.assertGreater(second.take("key", 1, 2, now=101.1), 0)
+
+    def check_all_or_nothing(self, backend):
+        self.assertEqual(backend.take_all([("user", 1, 5), ("ip", 1, 1)], now=100), [0, 0])
+        waits = backend.take_all([("user", 1, 5), ("ip", 1, 1)], now=100)
+        self.assertEqual(waits[0], 0)
+        self.assertAlmostEqual(waits[1], 1)
+        # The rejected request left the user bucket alone.
+        self.assertEqual([backend.take("user", 1, 5, now=100) for _ in range(4)], [0, 0, 0, 0])
+
+    def test_local_backend_takes_all_or_nothing(self):
+        self.check_all_or_nothing(ratelimit.LocalBackend())
+
+    def test_file_backend_takes_all_or_nothing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.check_all_or_nothing(ratelimit.FileBackend(os.path.join(directory, "buckets.bin")))
+
+    def test_local_backend_evicts_full_and_least_recently_used_buckets(self):
+        backend = ratelimit.LocalBackend(size=2)
+        backend.swept = 100
+        for key in ("a", "b", "c"):
+            backend.take(key, 1, 2, now=100)
+        self.assertEqual(list(backend.buckets), ["b", "c"])
+        backend.take("d", 1, 100, now=100 + backend.SWEEP_INTERVAL)
+        self.assertEqual(list(backend.buckets), ["d"])
+
+    @override_settings(CATALOG_RATE_LIMIT_PROXY_COUNT=1)
+    def test_client_ip_behind_proxy(self):
+        request = RequestFactory().get("/", headers={"X-Forwarded-For": "1.1.1.1, 2.2.2.2"}, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(ratelimit.client_ip(request), "2.2.2.2")
+        with override_settings(CATALOG_RATE_LIMIT_PROXY_COUNT=0):
+            self.assertEqual(ratelimit.client_ip(request), "10.0.0.1")
+
+
+@override_settings(CATALOG_RATE_LIMITING=True, CATALOG_RATE_LIMITS=RULES, CATALOG_RATE_LIMIT_BACKEND="local")
+class MiddlewareTests(TestCase):
+    def setUp(self):
+        ratelimit.reset()
+        self.addCleanup(ratelimit.reset)
+        self.user = get_user_model().objects.create_user(username="user", password="pass")
+        self.client.force_login(self.user)
+
+    def test_search_is_limited_per_user(self):
+        url = reverse("catalog:topic-list")
+        limited = REGISTRY.get_sample_value(
+            "catalog_rate_limit_requests_total", {"view": "catalog:topic-list", "scope": "user", "result": "limited"}
+        ) or 0
+        self.assertEqual(self.client.get(url, {"name": "a"}).status_code, 200)
+        self.assertEqual(self.client.get(url, {"name": "a"}).status_code, 200)
+        response = self.client.get(url, {"name": "a"})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(
+            REGISTRY.get_sample_value(
+                "catalog_rate_limit_requests_total", {"view": "catalog:topic-list", "scope": "user", "result": "limited"}
+            ),
+            limited + 1,
+        )
+        # Without the search parameter the rule does not apply.
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_ip_bucket_is_shared_between_users(self):
+        url = reverse("catalog:topic-list")
+        self.client.get(url, {"name": "a"})
+        self.client.get(url, {"name": "a"})
+        other = get_user_model().objects.create_user(username="other", password="pass")
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(url, {"name": "a"}).status_code, 200)
+        self.assertEqual(self.client.get(url, {"name": "a"}).status_code, 429)
+
+    def test_only_listed_methods(self):
+        url = reverse("catalog:topic-create")
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.post(url, {"name": "First"}).status_code, 302)
+        self.assertEqual(self.client.post(url, {"name": "Second"}).status_code, 429)
+
+    def test_disabled(self):
+        with override_settings(CATALOG_RATE_LIMITING=False):
+            for _ in range(5):
+                self.assertEqual(self.client.get(reverse("catalog:topic-list"), {"name": "a"}).status_code, 200)
+
+    def test_forked_process_reopens_backend(self):
+        backend = ratelimit.get_backend()
+        with mock.patch("os.getpid", return_value=os.getpid() + 1):
+            self.assertIsNot(ratelimit.get_backend(), backend)
@@ -0,0 +1,97 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from catalog import bulk, related
+from catalog.models import Newspaper, Topic
+
+
+class RelatedNewspapersTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="writer", password="strongpass123")
+        self.other = get_user_model().objects.create_user(username="other", password="strongpass123")
+        self.science, self.sports, self.arts = (
+            Topic.objects.create(name=name) for name in ("Science", "Sports", "Arts")
+        )
+        self.a = self.create("A", [self.science, self.sports], [self.user])
+        self.b = self.create("B", [self.science, self.sports], [self.user])
+        self.c = self.create("C", [self.science], [self.other])
+        self.d = self.create("D", [self.arts], [self.other])
+
+    def create(self, title, topics, publishers):
+        newspaper = Newspaper.objects.create(title=title, content="Text")
+        newspaper.topics.set(topics)
+        newspaper.publishers.set(publishers)
+        return newspaper
+
+    def neighbours(self, newspaper):
+        return list(newspaper.neighbours.values_list("neighbour__title", flat=True))
+
+    def test_rebuild_ranks_by_jaccard(self):
+        related.rebuild()
+        self.assertEqual(self.neighbours(self.a), ["B", "C"])
+        self.assertEqual(self.neighbours(self.c), ["D", "B", "A"])
+        neighbour = self.a.neighbours.first()
+        self.assertEqual(neighbour.score, 1.0)
+        self.assertFalse(Newspaper.objects.filter(related_stale=True).exists())
+
+    @override_settings(CATALOG_RELATED_COUNT=1)
+    def test_cosine_and_neighbour_count(self):
+        related.rebuild(metric="cosine")
+        self.assertEqual(self.neighbours(self.a), ["B"])
+
+    @override_settings(CATALOG_JOBS_MODE="immediate")
+    def test_changes_refresh_affected_neighbourhoods(self):
+        related.rebuild()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.d.topics.set([self.science, self.sports])
+            self.d.publishers.set([self.user])
+        self.assertEqual(self.neighbours(self.a)[0], "D")
+        self.assertEqual(self.neighbours(self.d), ["B", "A", "C"])
+        self.assertEqual(self.neighbours(self.c), ["D", "B", "A"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.delete_newspapers([self.d.pk])
+        self.assertEqual(self.neighbours(self.a), ["B", "C"])
+
+    def test_refresh_stale_skips_unaffected(self):
+        related.rebuild()
+        Newspaper.objects.filter(pk=self.d.pk).update(related_stale=True)
+        self.d.topics.set([self.arts])
+        # D changed without changing its features, only its neighbourhood is recomputed.
+        self.assertEqual(related.refresh_stale(), 2)
+
+    def test_failed_refresh_keeps_stale_flags(self):
+        related.rebuild()
+        related.mark_stale([self.a.pk])
+        with mock.patch.object(related, "write_neighbours", side_effect=RuntimeError("boom")):
+            with self.assertRaises(RuntimeError):
+                related.refresh_stale()
+        self.assertTrue(Newspaper.objects.get(pk=self.a.pk).related_stale)
+        related.refresh_stale()
+        self.assertFalse(Newspaper.objects.filter(related_stale=True).exists())
+
+    def test_refresh_stale_loads_only_the_neighbourhood(self):
+        lone = self.create("Lone", [Topic.objects.create(name="Chess")], [])
+        related.rebuild()
+        related.mark_stale([self.d.pk])
+        loaded = []
+        load_features = related.load_features
+
+        def record(newspaper_ids=None):
+            loaded.append(set(newspaper_ids))
+            return load_features(newspaper_ids)
+
+        with mock.patch.object(related, "load_features", side_effect=record):
+            related.refresh_stale()
+        self.assertTrue(loaded)
+        self.assertTrue(all(lone.pk not in ids for ids in loaded))
+
+    def test_detail_view_lists_neighbours(self):
+        related.rebuild()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("catalog:newspaper-detail", args=[self.a.pk]))
+        self.assertEqual([n.title for n in response.context["related_newspapers"]], ["B", "C"])
+        self.assertContains(response, "Related newspapers")
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from catalog import request_profiling
+
+
+class RequestProfilingTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        settings = override_settings(
+            CATALOG_REQUEST_PROFILING_DIR=directory.name,
+            CATALOG_REQUEST_PROFILING_INTERVAL=0.0005,
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.directory = directory.name
+        self.staff = get_user_model().objects.create_user(username="staff", password="pass", is_staff=True)
+
+    def test_staff_query_flag_stores_profile(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse("catalog:topic-list") + "?_profile")
+        name = response["X-Catalog-Profile"]
+        profile = request_profiling.load(name)
+        self.assertEqual(profile["trigger"], "staff")
+        self.assertEqual(profile["status"], 200)
+        self.assertTrue(any("topic" in query["sql"] for query in profile["queries"]))
+
+    def test_flag_ignored_for_other_users(self):
+        user = get_user_model().objects.create_user(username="user", password="pass")
+        self.client.force_login(user)
+        response = self.client.get(reverse("catalog:topic-list") + "?_profile")
+        self.assertNotIn("X-Catalog-Profile", response)
+        self.assertEqual(request_profiling.list_names(), [])
+
+    def test_signed_header_triggers_profile(self):
+        user = get_user_model().objects.create_user(username="user", password="pass")
+        self.client.force_login(user)
+        response = self.client.get(
+            reverse("catalog:topic-list"), headers={"X-Catalog-Profile": request_profiling.make_token()}
+        )
+        profile = request_profiling.load(response["X-Catalog-Profile"])
+        self.assertEqual(profile["trigger"], "token")
+        self.assertTrue(any("topic" in query["sql"] for query in profile["queries"]))
+        response = self.client.get(reverse("catalog:topic-list"), headers={"X-Catalog-Profile": "forged:token"})
+        self.assertNotIn("X-Catalog-Profile", response)
+
+    @override_settings(CATALOG_REQUEST_PROFILING_SAMPLE_RATE=1.0)
+    def test_sample_rate(self):
+        response = self.client.get(reverse("catalog:index"))
+        self.assertEqual(request_profiling.load(response["X-Catalog-Profile"])["trigger"], "sample")
+
+    @override_settings(CATALOG_REQUEST_PROFILING_MAX_FILES=2)
+    def test_retention_keeps_newest_files(self):
+        names = [request_profiling.store({"stacks": {}, "queries": []}) for _ in range(3)]
+        self.assertEqual(set(request_profiling.list_names()), set(sorted(names)[1:]))
+
+    def test_retention_drops_old_files(self):
+        name = request_profiling.store({"stacks": {}, "queries": []})
+        old = time.time() - request_profiling.get_max_age() - 1
+        os.utime(os.path.join(self.directory, f"{name}.json"), (old, old))
+        request_profiling.prune()
+        self.assertEqual(request_profiling.list_names(), [])
+
+    def test_sampler_collects_stacks(self):
+        def busy():
+            end = time.perf_counter() + 0.05
+            while time.perf_counter() < end:
+                pass
+
+        with request_profiling.Sampler(threading.get_ident(), 0.001) as sampler:
+            busy()
+        self.assertTrue(any(stack.split(";")[-1].startswith("busy (") for stack in sampler.stacks))
+
+    def test_flame_rows(self):
+        boxes = request_profiling.flame_rows({"main;a": 3, "main;b": 1})
+        self.assertEqual(
+            [(box["label"], box["depth"], box["left"], box["width"]) for box in boxes],
+            [("main", 0, 0.0, 100.0), ("a", 1, 0.0, 75.0), ("b", 1, 75.0, 25.0)],
+        )
+
+    def test_pages_render_for_staff_only(self):
+        name = request_profiling.store(
+            {
+                "method": "GET",
+                "path": "/topics/",
+                "status": 200,
+                "trigger": "staff",
+                "started_at": "2024-01-01T00:00:00+00:00",
+                "duration_ms": 10.0,
+                "interval_ms": 1.0,
+                "stacks": {"main;view": 4},
+                "queries": [{"alias": "default", "start_ms": 1.0, "duration_ms": 2.0, "sql": "SELECT 1"}],
+            }
+        )
+        url = reverse("catalog:request-profile-detail", args=[name])
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.staff)
+        self.assertContains(self.client.get(reverse("catalog:request-profile-list")), "/topics/")
+        response = self.client.get(url)
+        self.assertContains(response, "view")
+        self.assertContains(response, "SELECT 1")
+        response = self.client.get(url + "?format=collapsed")
+        self.assertEqual(response.content, b"main;view 4\n")
+        self.assertEqual(self.client.get(reverse("catalog:request-profile-detail", args=["missing"])).status_code, 404)
@@ -0,0 +1,179 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+
+from catalog import jobs
+from catalog.models import Newspaper, NewspaperRevision, Topic
+from catalog.revisions import (
+    apply_delta,
+    compute_delta,
+    diff_revisions,
+    get_revision_content,
+)
+from catalog.tasks import record_newspaper_revision
+
+
+class DeltaTests(TestCase):
+    def test_apply_delta_round_trip(self):
+        old = "first line\nsecond line\nthird line\n"
+        new = "first line\nchanged line\nthird line\nfourth line"
+        self.assertEqual(apply_delta(old, compute_delta(old, new)), new)
+
+    def test_delta_of_identical_text_only_copies(self):
+        text = "one\ntwo\nthree\n"
+        self.assertEqual(compute_delta(text, text), [3])
+
+
+@override_settings(CATALOG_REVISIONS_MAX_DELTAS=3, CATALOG_JOBS_MODE="immediate")
+class RevisionHistoryTests(TestCase):
+    def setUp(self):
+        self.lines = [f"Paragraph {i} of a fairly long article body." for i in range(50)]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper = Newspaper.objects.create(
+                title="Daily News", content="\n".join(self.lines)
+            )
+
+    def edit(self, index, text):
+        self.lines[index] = text
+        self.newspaper.content = "\n".join(self.lines)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper.save()
+
+    def test_first_revision_is_snapshot(self):
+        revision = self.newspaper.revisions.get()
+        self.assertTrue(revision.is_snapshot)
+        self.assertEqual(revision.body, self.newspaper.content)
+
+    def test_unchanged_content_is_not_recorded(self):
+        self.newspaper.title = "Renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper.save()
+        self.assertEqual(self.newspaper.revisions.count(), 1)
+
+    def test_edits_are_stored_as_deltas(self):
+        self.edit(10, "Edited paragraph.")
+        revision = self.newspaper.revisions.get(number=2)
+        self.assertFalse(revision.is_snapshot)
+        self.assertEqual(revision.depth, 1)
+        self.assertLess(len(revision.body), len(self.newspaper.content))
+
+    def test_snapshot_after_max_deltas(self):
+        for i in range(5):
+            self.edit(i, f"Edit {i}")
+        revisions = NewspaperRevision.objects.filter(newspaper=self.newspaper)
+        self.assertEqual(
+            list(revisions.order_by("number").values_list("depth", flat=True)),
+            [0, 1, 2, 3, 0, 1],
+        )
+
+    def test_every_revision_can_be_reconstructed(self):
+        contents = [self.newspaper.content]
+        for i in range(7):
+            self.edit(i * 3, f"Edit {i}")
+            contents.append(self.newspaper.content)
+        for number, content in enumerate(contents, start=1):
+            self.assertEqual(get_revision_content(self.newspaper.pk, number), content)
+
+    def test_reconstruction_is_bounded_by_max_deltas(self):
+        for i in range(7):
+            self.edit(i, f"Edit {i}")
+        latest = self.newspaper.revisions.first()
+        with self.assertNumQueries(2):
+            get_revision_content(self.newspaper.pk, latest.number)
+
+    def test_diff_consecutive_revisions(self):
+        self.edit(10, "Edited paragraph.")
+        lines = diff_revisions(self.newspaper.pk, 1, 2)
+        self.assertIn("-Paragraph 10 of a fairly long article body.", lines)
+        self.assertIn("+Edited paragraph.", lines)
+
+    def test_diff_distant_revisions(self):
+        self.edit(10, "Edited paragraph.")
+        self.edit(20, "Another edit.")
+        lines = diff_revisions(self.newspaper.pk, 1, 3)
+        self.assertIn("+Edited paragraph.", lines)
+        self.assertIn("+Another edit.", lines)
+
+
+@override_settings(CATALOG_JOBS_MODE="db")
+class QueuedRevisionTests(TestCase):
+    def test_edits_get_revisions_before_a_worker_runs(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper = Newspaper.objects.create(title="Daily News", content="first\n")
+        for content in ("second\n", "third\n"):
+            newspaper.content = content
+            with self.captureOnCommitCallbacks(execute=True):
+                newspaper.save()
+        self.assertEqual(
+            [get_revision_content(newspaper.pk, number) for number in (1, 2, 3)],
+            ["first\n", "second\n", "third\n"],
+        )
+
+    def test_queued_jobs_record_the_current_content(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper = Newspaper.objects.create(title="Daily News", content="v3\n")
+        with self.captureOnCommitCallbacks(execute=True):
+            record_newspaper_revision.enqueue(newspaper.pk, "v2\n")
+        jobs.work(once=True)
+        self.assertEqual(newspaper.revisions.count(), 1)
+        self.assertEqual(get_revision_content(newspaper.pk, 1), "v3\n")
+
+
+@override_settings(CATALOG_JOBS_MODE="immediate")
+class RevisionViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            username="testuser",
+            password="strongpass123"
+        )
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper = Newspaper.objects.create(title="Daily News", content="Old text")
+        self.newspaper.content = "New text"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.newspaper.save()
+
+    def test_revision_list_view(self):
+        response = self.client.get(
+            reverse("catalog:newspaper-revision-list", args=[self.newspaper.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "catalog/newspaper_revision_list.html")
+        self.assertEqual(len(response.context["revisions"]), 2)
+
+    def test_revision_list_does_not_load_bodies(self):
+        response = self.client.get(
+            reverse("catalog:newspaper-revision-list", args=[self.newspaper.pk])
+        )
+        for revision in response.context["revisions"]:
+            self.assertIn("body", revision.get_deferred_fields())
+
+    def test_revision_diff_view_defaults_to_latest_change(self):
+        response = self.client.get(
+            reverse("catalog:newspaper-revision-diff", args=[self.newspaper.pk])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["from_number"], 1)
+        self.assertEqual(response.context["to_number"], 2)
+        self.assertIn("+New text", response.context["diff_lines"])
+
+    def test_revision_diff_view_unknown_revision(self):
+        response = self.client.get(
+            reverse("catalog:newspaper-revision-diff", args=[self.newspaper.pk]) + "?from=1&to=9"
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_update_view_records_revision(self):
+        topic = Topic.objects.create(name="Science")
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("catalog:newspaper-update", args=[self.newspaper.pk]),
+                {
+                    "title": "Daily News",
+                    "content": "Newest text",
+                    "publishers": [self.user.pk],
+                    "topics": [topic.pk],
+                },
+            )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.newspaper.revisions.count(), 3)
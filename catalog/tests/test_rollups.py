@@ -0,0 +1,70 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from catalog import bulk, rollups
+from catalog.models import DailyPublicationCount, DailyTopicCount, Newspaper, Topic
+
+
+@override_settings(CATALOG_JOBS_MODE="immediate")
+class RollupTests(TestCase):
+    def setUp(self):
+        # The index caches its figures under the generation counters, which
+        # repeat from test to test.
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = get_user_model().objects.create_user(username="writer", password="strongpass123")
+        self.client.force_login(self.user)
+        self.science = Topic.objects.create(name="Science")
+        self.sports = Topic.objects.create(name="Sports")
+        self.today = timezone.localdate()
+
+    def create_newspaper(self, *topics):
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper = Newspaper.objects.create(title="Title", content="Text")
+            newspaper.topics.add(*topics)
+            newspaper.publishers.add(self.user)
+        return newspaper
+
+    def test_rollups_follow_writes(self):
+        first = self.create_newspaper(self.science)
+        self.create_newspaper(self.science, self.sports)
+        self.assertEqual(DailyPublicationCount.objects.get(day=self.today).count, 2)
+        self.assertEqual(DailyTopicCount.objects.get(day=self.today, topic=self.science).count, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(DailyPublicationCount.objects.get(day=self.today).count, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.delete_newspapers(Newspaper.objects.values_list("pk", flat=True))
+        self.assertFalse(DailyPublicationCount.objects.exists())
+        self.assertFalse(DailyTopicCount.objects.exists())
+
+    def test_dashboard_reads_window(self):
+        old = self.create_newspaper(self.sports)
+        Newspaper.objects.filter(pk=old.pk).update(published_date=timezone.now() - timedelta(days=40))
+        self.create_newspaper(self.science)
+        self.create_newspaper(self.science)
+        rollups.rebuild()
+
+        dashboard = rollups.get_dashboard(days=30)
+        self.assertEqual(dashboard["total"], 2)
+        self.assertEqual(len(dashboard["per_day"]), 30)
+        self.assertEqual(dashboard["per_day"][-1], {"day": self.today, "count": 2, "percent": 100})
+        self.assertEqual(sum(row["count"] for row in dashboard["per_week"]), 2)
+        self.assertEqual(dashboard["top_topics"], [{"topic__name": "Science", "total": 2}])
+        self.assertEqual(dashboard["top_redactors"], [{"redactor__username": "writer", "total": 2}])
+
+        with self.assertNumQueries(3):
+            rollups.get_dashboard()
+
+    def test_index_shows_dashboard(self):
+        self.create_newspaper(self.science)
+        response = self.client.get(reverse("catalog:index"))
+        self.assertContains(response, "Top topics")
+        self.assertEqual(response.context["dashboard"]["total"], 1)
@@ -0,0 +1,118 @@
+import threading
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from catalog import search
+from catalog.models import Newspaper, Topic
+
+
+def source(*labels, kind="topic"):
+    def run(term, limit):
+        return [search.SearchResult(kind, label, f"/{label}/") for label in labels]
+
+    return run
+
+
+FAKE_SOURCES = {
+    "newspapers": source("Art fair opens", kind="newspaper"),
+    "topics": source("Smart cities", "Art"),
+    "redactors": source("artie", kind="redactor"),
+}
+
+
+class RelevanceTests(SimpleTestCase):
+    def test_ordering(self):
+        scores = [search.relevance("art", text) for text in ("Art", "Artists", "Modern art", "Smart", "Arts")]
+        self.assertEqual(scores, [1.0, 0.8, 0.6, 0.4, 0.8])
+
+
+class SourceTests(TestCase):
+    def setUp(self):
+        get_user_model().objects.create_user(username="artie", password="pass")
+        Topic.objects.create(name="Art")
+        Topic.objects.create(name="Cooking")
+        Newspaper.objects.create(title="Art fair opens", content="text", published_date=date(2024, 5, 1))
+
+    def test_sources(self):
+        self.assertEqual([result.label for result in search.search_newspapers("art", 5)], ["Art fair opens"])
+        topics = search.search_topics("art", 5)
+        self.assertEqual([result.label for result in topics], ["Art"])
+        self.assertEqual(topics[0].url, reverse("catalog:topic-list") + "?name=Art")
+        self.assertEqual([result.label for result in search.search_redactors("art", 5)], ["artie"])
+
+
+@mock.patch.dict(search.SOURCES, FAKE_SOURCES)
+class SearchTests(SimpleTestCase):
+    def test_merges_sources_by_relevance(self):
+        results, missing = search.search("art", timeout=5)
+        self.assertEqual(missing, [])
+        self.assertEqual(
+            [(result.kind, result.label) for result in results],
+            [("topic", "Art"), ("newspaper", "Art fair opens"), ("redactor", "artie"), ("topic", "Smart cities")],
+        )
+        self.assertEqual(search.search("art", limit=2, timeout=5)[0][1].label, "Art fair opens")
+
+    def test_slow_source_is_dropped(self):
+        release = threading.Event()
+
+        def slow(term, limit):
+            release.wait(5)
+            return [search.SearchResult("topic", "late", "/")]
+
+        self.addCleanup(release.set)
+        with mock.patch.dict(search.SOURCES, {"topics": slow}):
+            results, missing = search.search("art", timeout=0.2)
+        self.assertEqual(missing, ["topics"])
+        self.assertEqual([result.label for result in results], ["Art fair opens", "artie"])
+
+    @override_settings(CATALOG_SEARCH_CONCURRENCY=1)
+    def test_searches_wait_for_a_slot_not_behind_other_sources(self):
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow(term, limit):
+            started.set()
+            release.wait(5)
+            return []
+
+        self.addCleanup(release.set)
+        with mock.patch.object(search, "_executor", None), mock.patch.object(search, "_slots", None):
+            with mock.patch.dict(search.SOURCES, {"topics": slow}):
+                self.assertEqual(search.search("art", timeout=0.1)[1], ["topics"])
+            self.assertTrue(started.wait(5))
+            # The slow source still holds the only slot.
+            with self.assertLogs("catalog.search", "WARNING"):
+                self.assertEqual(search.search("art", timeout=0.1), ([], list(search.SOURCES)))
+            release.set()
+            results, missing = search.search("art", timeout=5)
+            self.assertEqual(missing, [])
+            search._executor.shutdown()
+
+    def test_failing_source_is_dropped(self):
+        def broken(term, limit):
+            raise RuntimeError("boom")
+
+        with mock.patch.dict(search.SOURCES, {"redactors": broken}):
+            results, missing = search.search("art", timeout=5)
+        self.assertEqual(missing, ["redactors"])
+        self.assertEqual(len(results), 3)
+
+
+@mock.patch.dict(search.SOURCES, FAKE_SOURCES)
+class SearchViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="user", password="pass")
+
+    def test_view(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("catalog:search"), {"q": "art"})
+        self.assertContains(response, "Art fair opens")
+        self.assertContains(response, 'value="art"')
+        self.assertEqual(self.client.get(reverse("catalog:search")).context["results"], [])
+
+    def test_view_requires_login(self):
+        self.assertEqual(self.client.get(reverse("catalog:search"), {"q": "art"}).status_code, 302)
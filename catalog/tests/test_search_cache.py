@@ -0,0 +1,122 @@
+import threading
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from catalog import bulk, search_cache, singleflight
+from catalog.models import Newspaper
+
+
+@override_settings(CATALOG_JOBS_MODE="immediate")
+class SearchCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        now = timezone.now()
+        self.old = self.create("Art fair opens", now - timedelta(days=2))
+        self.new = self.create("Modern art news", now - timedelta(days=1))
+        self.other = self.create("Weather", now)
+
+    def create(self, title, published_date):
+        with self.captureOnCommitCallbacks(execute=True):
+            newspaper = Newspaper.objects.create(title=title, content="text")
+        Newspaper.objects.filter(pk=newspaper.pk).update(published_date=published_date)
+        return newspaper
+
+    def test_ids_are_cached_per_normalized_query(self):
+        self.assertEqual(search_cache.get_ids("art"), [self.new.pk, self.old.pk])
+        with self.assertNumQueries(0):
+            self.assertEqual(search_cache.get_ids("  ART "), [self.new.pk, self.old.pk])
+
+    def test_concurrent_misses_wait_for_the_fill(self):
+        key = search_cache.entry_key("art")
+        cache.add(f"{key}.lock", 1, 60)
+        # Another request is filling the list.
+        fill = threading.Timer(0.1, singleflight.store, args=(key, {"query": "art", "ids": [self.new.pk]}, 60, 0))
+        fill.start()
+        self.addCleanup(fill.cancel)
+        with self.assertNumQueries(0):
+            self.assertEqual(search_cache.get_ids("art"), [self.new.pk])
+        self.assertEqual(cache.get(search_cache.INDEX_KEY), ["art"])
+
+    @override_settings(CATALOG_SEARCH_CACHE_MAX_IDS=1)
+    def test_long_lists_are_not_cached(self):
+        self.assertIsNone(search_cache.get_ids("art"))
+        self.assertEqual(search_cache.get_ids("weather"), [self.other.pk])
+
+    @override_settings(CATALOG_SEARCH_CACHE_SIZE=2)
+    def test_least_recently_used_query_is_evicted(self):
+        search_cache.get_ids("art")
+        search_cache.get_ids("news")
+        search_cache.get_ids("art")
+        search_cache.get_ids("weather")
+        self.assertEqual(cache.get(search_cache.INDEX_KEY), ["art", "weather"])
+        with self.assertNumQueries(1):
+            search_cache.get_ids("news")
+
+    def test_saves_drop_affected_lists(self):
+        search_cache.get_ids("art")
+        search_cache.get_ids("weather")
+        search_cache.get_ids("sport")
+        self.other.title = "Sport weather"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.save()
+        self.assertEqual(cache.get(search_cache.INDEX_KEY), ["art"])
+        self.assertEqual(search_cache.get_ids("sport"), [self.other.pk])
+
+    def test_title_changes_leave_old_matches(self):
+        search_cache.get_ids("art")
+        self.old.title = "Gallery opens"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.old.save()
+        self.assertEqual(search_cache.get_ids("art"), [self.new.pk])
+
+    def test_deletes_drop_affected_lists(self):
+        search_cache.get_ids("art")
+        search_cache.get_ids("weather")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.old.delete()
+        self.assertEqual(cache.get(search_cache.INDEX_KEY), ["weather"])
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.delete_newspapers([self.other.pk])
+        self.assertIsNone(cache.get(search_cache.INDEX_KEY))
+
+    def test_content_changes_keep_lists(self):
+        search_cache.get_ids("art")
+        self.old.refresh_from_db()
+        self.old.content = "Other text"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.old.save()
+        with self.assertNumQueries(0):
+            self.assertEqual(search_cache.get_ids("art"), [self.new.pk, self.old.pk])
+
+    def test_concurrent_fills_keep_every_query(self):
+        threads = [threading.Thread(target=search_cache.remember, args=(f"query {n}",)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(cache.get(search_cache.INDEX_KEY)), [f"query {n}" for n in range(8)])
+
+    @override_settings(CATALOG_SEARCH_CACHE_MAX_IDS=0)
+    def test_uncached_searches_are_normalized_too(self):
+        self.client.force_login(get_user_model().objects.create_user(username="user", password="pass"))
+        response = self.client.get(reverse("catalog:newspaper-list"), {"title": "  FAIR   opens "})
+        self.assertEqual([newspaper.title for newspaper in response.context["newspapers"]], ["Art fair opens"])
+
+    def test_list_view_pages_through_cached_ids(self):
+        user = get_user_model().objects.create_user(username="user", password="pass")
+        self.client.force_login(user)
+        for day in range(10):
+            self.create(f"Art review {day}", timezone.now() - timedelta(days=3 + day))
+        response = self.client.get(reverse("catalog:newspaper-list"), {"title": "art", "page": 2})
+        self.assertEqual(
+            [newspaper.title for newspaper in response.context["newspapers"]],
+            [f"Art review {day}" for day in range(7, 10)],
+        )
+        self.assertEqual(response.context["paginator"].count, 12)
+        self.assertIn("art", cache.get(search_cache.INDEX_KEY))
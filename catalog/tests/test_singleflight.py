@@ -0,0 +1,118 @@
+import threading
+import time
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+
+from catalog import singleflight
+from catalog.models import Topic
+
+
+def computations(result, name="test"):
+    return REGISTRY.get_sample_value("catalog_cache_computations_total", {"cache": name, "result": result}) or 0
+
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_fresh_value_is_not_recomputed(self):
+        compute = mock.Mock(return_value=1)
+        self.assertEqual(singleflight.get_or_compute("test", "key", compute, 60), 1)
+        self.assertEqual(singleflight.get_or_compute("test", "key", compute, 60), 1)
+        compute.assert_called_once()
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return "value"
+
+        before = computations("waited")
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(singleflight.get_or_compute("test", "key", compute, 60)))
+            for _ in range(4)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ["value"] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(computations("waited"), before + 3)
+
+    @override_settings(CATALOG_SINGLE_FLIGHT_WAIT=0.1)
+    def test_waiters_compute_after_timeout(self):
+        cache.add("key.lock", 1, 60)
+        before = computations("timeout")
+        self.assertEqual(singleflight.get_or_compute("test", "key", lambda: 2, 60), 2)
+        self.assertEqual(computations("timeout"), before + 1)
+
+    def test_stale_value_served_while_another_caller_refreshes(self):
+        singleflight.store("key", "old", 0, 60)
+        cache.add("key.lock", 1, 60)
+        before = computations("stale")
+        self.assertEqual(singleflight.get_or_compute("test", "key", lambda: "new", 60, stale=60), "old")
+        self.assertEqual(computations("stale"), before + 1)
+        cache.delete("key.lock")
+        self.assertEqual(singleflight.get_or_compute("test", "key", lambda: "new", 60, stale=60), "new")
+
+    def test_stale_while_revalidate_refreshes_in_background(self):
+        singleflight.store("key", "old", 0, 60)
+        refreshed = threading.Event()
+
+        def compute():
+            refreshed.set()
+            return "new"
+
+        value = singleflight.get_or_compute("test", "key", compute, 60, stale=60, background=True)
+        self.assertEqual(value, "old")
+        self.assertTrue(refreshed.wait(5))
+        deadline = time.monotonic() + 5
+        while cache.get("key.lock") is not None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(singleflight.get_or_compute("test", "key", compute, 60), "new")
+
+    def test_new_version_is_computed_in_place_while_others_get_the_old(self):
+        singleflight.store("key", "old", 60, 60, version=1)
+        cache.add("key.lock", 1, 60)
+        self.assertEqual(singleflight.get_or_compute("test", "key", lambda: "new", 60, version=2), "old")
+        cache.delete("key.lock")
+        value = singleflight.get_or_compute("test", "key", lambda: "new", 60, background=True, version=2)
+        self.assertEqual(value, "new")
+        self.assertEqual(singleflight.get_or_compute("test", "key", lambda: "newer", 60, version=2), "new")
+
+    def test_lock_released_when_compute_fails(self):
+        def broken():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            singleflight.get_or_compute("test", "key", broken, 60)
+        self.assertIsNone(cache.get("key.lock"))
+
+
+class IndexCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client.force_login(get_user_model().objects.create_user(username="user", password="pass"))
+
+    def test_index_figures_follow_writes(self):
+        self.assertEqual(self.client.get(reverse("catalog:index")).context["num_topics"], 0)
+        with self.assertNumQueries(3):
+            # Session, user and generation counters.
+            self.client.get(reverse("catalog:index"))
+        Topic.objects.create(name="Science")
+        self.assertEqual(self.client.get(reverse("catalog:index")).context["num_topics"], 1)
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 from django.contrib.auth import get_user_model
@@ -506,6 +507,9 @@ class RedactorDeleteViewTests(TestCase):
 
 class NewspaperListViewTests(TestCase):
     def setUp(self):
+        # Searches page through cached id lists, and bulk_create sends no signals.
+        cache.clear()
+        self.addCleanup(cache.clear)
         self.user = get_user_model().objects.create_user(
             username="testuser",
             password="strongpass123"
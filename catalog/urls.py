@@ -1,6 +1,21 @@
 from django.urls import path
+
+from .feeds import (
+    NewspaperAtomFeed,
+    NewspaperFeed,
+    RedactorAtomFeed,
+    RedactorFeed,
+    TopicAtomFeed,
+    TopicFeed,
+)
 from .views import (
     index,
+    catalog_events,
+    metrics_view,
+    search_view,
+    template_profile,
+    request_profile_list,
+    request_profile_detail,
     TopicListView,
     TopicCreateView,
     TopicUpdateView,
@@ -11,16 +26,25 @@ from .views import (
     RedactorUpdateView,
     RedactorDeleteView,
     NewspaperListView,
+    NewspaperBulkActionView,
     NewspaperDetailView,
     NewspaperCreateView,
     NewspaperUpdateView,
     NewspaperDeleteView,
+    NewspaperRevisionListView,
+    NewspaperRevisionDiffView,
 )
 
 app_name = "catalog"
 
 urlpatterns = [
     path("", index, name="index"),  # Home page
+    path("events/", catalog_events, name="events"),  # Server-sent events of catalog changes
+    path("search/", search_view, name="search"),  # Search across newspapers, topics and redactors
+    path("metrics", metrics_view, name="metrics"),  # Prometheus metrics
+    path("debug/templates/", template_profile, name="template-profile"),  # Template profiler report
+    path("debug/profiles/", request_profile_list, name="request-profile-list"),  # Stored request profiles
+    path("debug/profiles/<str:name>/", request_profile_detail, name="request-profile-detail"),  # Request profile flame graph
     path("topics/", TopicListView.as_view(), name="topic-list"),  # Topics list
     path("topics/create/", TopicCreateView.as_view(), name="topic-create"),  # Create new topic
     path("topics/<int:pk>/update/", TopicUpdateView.as_view(), name="topic-update"),  # Update topic
@@ -31,8 +55,17 @@ urlpatterns = [
     path("redactors/<int:pk>/update/", RedactorUpdateView.as_view(), name="redactor-update"),  # Update redactor
     path("redactors/<int:pk>/delete/", RedactorDeleteView.as_view(), name="redactor-delete"),  # Delete redactor
     path("newspapers/", NewspaperListView.as_view(), name="newspaper-list"),  # Newspapers list
+    path("newspapers/bulk/", NewspaperBulkActionView.as_view(), name="newspaper-bulk"),  # Bulk actions on newspapers
     path("newspapers/<int:pk>/", NewspaperDetailView.as_view(), name="newspaper-detail"),  # Newspaper detail
     path("newspapers/create/", NewspaperCreateView.as_view(), name="newspaper-create"),  # Create new newspaper
     path("newspapers/<int:pk>/update/", NewspaperUpdateView.as_view(), name="newspaper-update"),  # Update newspaper
     path("newspapers/<int:pk>/delete/", NewspaperDeleteView.as_view(), name="newspaper-delete"),  # Delete newspaper
+    path("newspapers/<int:pk>/revisions/", NewspaperRevisionListView.as_view(), name="newspaper-revision-list"),  # Newspaper revision history
+    path("newspapers/<int:pk>/revisions/diff/", NewspaperRevisionDiffView.as_view(), name="newspaper-revision-diff"),  # Diff two revisions
+    path("feeds/newspapers/rss/", NewspaperFeed(), name="newspaper-feed"),  # Latest newspapers, RSS
+    path("feeds/newspapers/atom/", NewspaperAtomFeed(), name="newspaper-feed-atom"),  # Latest newspapers, Atom
+    path("feeds/topics/<int:pk>/rss/", TopicFeed(), name="topic-feed"),  # Latest newspapers on a topic, RSS
+    path("feeds/topics/<int:pk>/atom/", TopicAtomFeed(), name="topic-feed-atom"),  # Latest newspapers on a topic, Atom
+    path("feeds/redactors/<int:pk>/rss/", RedactorFeed(), name="redactor-feed"),  # Latest newspapers by a redactor, RSS
+    path("feeds/redactors/<int:pk>/atom/", RedactorAtomFeed(), name="redactor-feed-atom"),  # Latest newspapers by a redactor, Atom
 ]
@@ -1,37 +1,153 @@
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
+from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.shortcuts import render
+from django.db.models import F, Max
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.utils.crypto import constant_time_compare
+from django.utils.http import url_has_allowed_host_and_scheme
 from django.views import generic
 from django.urls import reverse_lazy
 
-from catalog.models import Newspaper, Topic, Redactor
+from catalog.models import Newspaper, NewspaperRevision, Topic, Redactor
 from catalog.forms import (
     RedactorCreateForm,
     RedactorUpdateForm, 
     NewspaperForm,
+    NewspaperBulkActionForm,
     NewspaperTitleSearchForm,
     RedactorUsernameSearchForm,
     TopicNameSearchForm,
 )
-
-@login_required
-def index(request):
-
-    num_newspapers = Newspaper.objects.count()
+from catalog import activity, archive, bulk, counters, events, metrics, profiling, purge, request_profiling, rollups, search, search_cache, singleflight
+from catalog.conditional import GenerationETagMixin, RowETagMixin
+from catalog.pagination import EstimatedCountPaginator
+from catalog.revisions import diff_revisions
+
+def get_index_figures():
+    num_newspapers = counters.get_value(counters.NEWSPAPER_COUNT)
+    if num_newspapers is None:
+        num_newspapers = Newspaper.objects.count()
     num_topics = Topic.objects.count()
     num_redactors = Redactor.objects.count()
 
-    context = {
+    return {
         "num_newspapers": num_newspapers,
         "num_topics": num_topics,
         "num_redactors": num_redactors,
+        "dashboard": rollups.get_dashboard(),
     }
 
+
+@login_required
+def index(request):
+    # Writes bump a generation and so the version: one request recomputes
+    # the figures while the others keep getting the previous ones. Time only
+    # makes them stale, and they are then refreshed in the background.
+    generations = counters.get_values([counters.generation_name(model) for model in (Newspaper, Topic, Redactor)])
+    context = singleflight.get_or_compute(
+        "index",
+        "catalog.index",
+        get_index_figures,
+        getattr(settings, "CATALOG_INDEX_CACHE_TIMEOUT", 60),
+        stale=getattr(settings, "CATALOG_INDEX_CACHE_STALE", 60 * 10),
+        background=True,
+        version="-".join(map(str, generations)),
+    )
+
     return render(request, "catalog/index.html", context=context)
 
 
-class TopicListView(LoginRequiredMixin, generic.ListView):
+@login_required
+async def catalog_events(request):
+    """Server-sent events of catalog changes; idle clients only cost a heartbeat."""
+    try:
+        last_id = int(request.headers.get("Last-Event-ID", ""))
+    except ValueError:
+        last_id = None
+    if not events.can_stream(request):
+        # No Content tells EventSource not to reconnect.
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(events.stream(last_id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@login_required
+def search_view(request):
+    query = request.GET.get("q", "").strip()
+    results, missing = search.search(query) if query else ([], [])
+    return render(
+        request,
+        "catalog/search.html",
+        {"query": query, "results": results, "missing": missing},
+    )
+
+
+def metrics_view(request):
+    if not metrics.is_enabled():
+        raise Http404("Metrics are off.")
+    token = metrics.get_token()
+    if token and not constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}"):
+        return HttpResponse("Unauthorized", status=401, content_type="text/plain")
+    # Without a token only staff may look, so a missing METRICS_TOKEN fails closed.
+    if not token and not request.user.is_staff:
+        return HttpResponse("Forbidden", status=403, content_type="text/plain")
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE_LATEST)
+
+
+@staff_member_required
+def template_profile(request):
+    if not profiling.is_enabled():
+        raise Http404("Template profiling is off.")
+    if request.GET.get("reset"):
+        profiling.reset()
+    return JsonResponse(profiling.get_report())
+
+
+@staff_member_required
+def request_profile_list(request):
+    return render(
+        request,
+        "catalog/request_profile_list.html",
+        {"profiles": request_profiling.list_profiles(), "token": request_profiling.make_token()},
+    )
+
+
+@staff_member_required
+def request_profile_detail(request, name):
+    profile = request_profiling.load(name)
+    if profile is None:
+        raise Http404("No such profile.")
+    if request.GET.get("format") == "collapsed":
+        response = HttpResponse(request_profiling.collapsed(profile), content_type="text/plain; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="{name}.folded"'
+        return response
+    frames = request_profiling.flame_rows(profile["stacks"])
+    duration = profile["duration_ms"] or 1
+    for query in profile["queries"]:
+        query["left"] = round(100 * query["start_ms"] / duration, 3)
+        query["width"] = max(round(100 * query["duration_ms"] / duration, 3), 0.5)
+    return render(
+        request,
+        "catalog/request_profile_detail.html",
+        {
+            "name": name,
+            "profile": profile,
+            "frames": frames,
+            "samples": sum(profile["stacks"].values()),
+            "flame_height": 18 * (max((frame["depth"] for frame in frames), default=-1) + 1),
+            "sql_ms": round(sum(query["duration_ms"] for query in profile["queries"]), 3),
+        },
+    )
+
+
+class TopicListView(LoginRequiredMixin, GenerationETagMixin, generic.ListView):
     model = Topic
+    etag_models = (Topic,)
     template_name = "catalog/topic_list.html"
     context_object_name = "topics"
     paginate_by = 15
@@ -67,14 +183,23 @@ class TopicUpdateView(LoginRequiredMixin, generic.UpdateView):
     success_url = reverse_lazy("catalog:topic-list")
 
 
-class TopicDeleteView(LoginRequiredMixin, generic.DeleteView):
+class SoftDeleteMixin:
+    """Hide the object at once and leave its newspaper links to a purge job."""
+
+    def form_valid(self, form):
+        purge.soft_delete(self.object)
+        return redirect(self.get_success_url())
+
+
+class TopicDeleteView(LoginRequiredMixin, SoftDeleteMixin, generic.DeleteView):
     model = Topic
     template_name = "catalog/topic_confirm_delete.html"
     success_url = reverse_lazy("catalog:topic-list")
 
 
-class RedactorListView(LoginRequiredMixin, generic.ListView):
+class RedactorListView(LoginRequiredMixin, GenerationETagMixin, generic.ListView):
     model = Redactor
+    etag_models = (Redactor,)
     template_name = "catalog/redactor_list.html"
     context_object_name = "redactors"
     paginate_by = 15
@@ -83,22 +208,43 @@ class RedactorListView(LoginRequiredMixin, generic.ListView):
         context = super(RedactorListView, self).get_context_data(**kwargs)
         model = self.request.GET.get("username", "")
         context["search_form"] = RedactorUsernameSearchForm(
-            initial={"username": model}
+            initial={"username": model, "sort": self.get_sort()}
         )
+        context["sort"] = self.get_sort()
         return context
-    
+
+    def get_sort(self):
+        sort = self.request.GET.get("sort", "")
+        return sort if sort in ("articles", "recent", "month") else "username"
+
     def get_queryset(self):
-        queryset = Redactor.objects.all().order_by("username")
+        queryset = Redactor.objects.all()
         username = self.request.GET.get("username", "")
         if username:
             queryset = queryset.filter(username__icontains=username)
-        return queryset
-
-class RedactorDetailView(LoginRequiredMixin, generic.DetailView):
+        # Every ordering below is served by an index on the maintained
+        # activity columns, see catalog.activity.
+        sort = self.get_sort()
+        if sort == "articles":
+            return queryset.order_by("-article_count", "username")
+        if sort == "recent":
+            return queryset.filter(last_published_at__isnull=False).order_by("-last_published_at")
+        if sort == "month":
+            return queryset.filter(
+                monthly_activity__month=activity.get_current_month()
+            ).annotate(
+                month_count=F("monthly_activity__article_count")
+            ).order_by("-month_count", "username")
+        return queryset.order_by("username")
+
+class RedactorDetailView(LoginRequiredMixin, RowETagMixin, generic.DetailView):
     model = Redactor
     template_name = "catalog/redactor_detail.html"
     context_object_name = "redactor"
 
+    def get_last_modified(self, request, *args, **kwargs):
+        return Redactor.objects.filter(pk=kwargs["pk"]).values_list("updated_at", flat=True).first()
+
 
 class RedactorCreateView(LoginRequiredMixin, generic.CreateView):
     model = Redactor
@@ -114,17 +260,24 @@ class RedactorUpdateView(LoginRequiredMixin, generic.UpdateView):
     success_url = reverse_lazy("catalog:redactor-list")
 
 
-class RedactorDeleteView(LoginRequiredMixin, generic.DeleteView):
+class RedactorDeleteView(LoginRequiredMixin, SoftDeleteMixin, generic.DeleteView):
     model = Redactor
     template_name = "catalog/redactor_confirm_delete.html"
     success_url = reverse_lazy("catalog:redactor-list")
 
 
-class NewspaperListView(LoginRequiredMixin, generic.ListView):
+class NewspaperListView(LoginRequiredMixin, GenerationETagMixin, generic.ListView):
     model = Newspaper
+    etag_models = (Newspaper, Topic, Redactor)
     template_name = "catalog/newspaper_list.html"
     context_object_name = "newspapers"
     paginate_by = 9
+    paginator_class = EstimatedCountPaginator
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return super(NewspaperListView, self).get_paginator(
+            queryset, per_page, counter_name=counters.NEWSPAPER_COUNT, **kwargs
+        )
 
     def get_context_data(self, **kwargs):
         context = super(NewspaperListView, self).get_context_data(**kwargs)
@@ -132,21 +285,93 @@ class NewspaperListView(LoginRequiredMixin, generic.ListView):
         context["search_form"] = NewspaperTitleSearchForm(
             initial={"title": model}
         )
+        context["bulk_form"] = NewspaperBulkActionForm()
+        context["live"] = (
+            events.can_stream(self.request) and context["page_obj"].number == 1 and not model
+        )
         return context
     
     def get_queryset(self):
         queryset = Newspaper.objects.all().prefetch_related("topics", "publishers").order_by("-published_date")
         title = self.request.GET.get("title", "")
         if title:
-            queryset = queryset.filter(title__icontains=title)
+            # Searches page through a cached list of ids when it is short enough.
+            ids = search_cache.get_ids(title)
+            if ids is not None:
+                return ids
+            queryset = queryset.filter(title__icontains=search_cache.normalize(title))
         return queryset
 
-
-class NewspaperDetailView(LoginRequiredMixin, generic.DetailView):
+    def paginate_queryset(self, queryset, page_size):
+        paginator, page, object_list, is_paginated = super(NewspaperListView, self).paginate_queryset(
+            queryset, page_size
+        )
+        if isinstance(queryset, list):
+            object_list = page.object_list = search_cache.fetch(page.object_list)
+        return paginator, page, object_list, is_paginated
+
+
+class NewspaperBulkActionView(LoginRequiredMixin, generic.FormView):
+    form_class = NewspaperBulkActionForm
+    http_method_names = ["post"]
+
+    def get_success_url(self):
+        next_url = self.request.POST.get("next", "")
+        if url_has_allowed_host_and_scheme(next_url, allowed_hosts={self.request.get_host()}):
+            return next_url
+        return reverse_lazy("catalog:newspaper-list")
+
+    def form_valid(self, form):
+        ids = form.cleaned_data["newspapers"]
+        action = form.cleaned_data["action"]
+        if action == "delete":
+            count = bulk.delete_newspapers(ids)
+            messages.success(self.request, f"Deleted {count} newspapers.")
+        else:
+            verb, relation = action.split("_")
+            obj = form.cleaned_data[relation]
+            if verb == "add":
+                count = bulk.add_related(f"{relation}s", ids, obj)
+                messages.success(self.request, f"Added {relation} \"{obj}\" to {count} newspapers.")
+            else:
+                count = bulk.remove_related(f"{relation}s", ids, obj)
+                messages.success(self.request, f"Removed {relation} \"{obj}\" from {count} newspapers.")
+        return redirect(self.get_success_url())
+
+    def form_invalid(self, form):
+        for errors in form.errors.values():
+            for error in errors:
+                messages.error(self.request, error)
+        return redirect(self.get_success_url())
+
+
+class NewspaperDetailView(LoginRequiredMixin, RowETagMixin, generic.DetailView):
     model = Newspaper
     template_name = "catalog/newspaper_detail.html"
     context_object_name = "newspaper"
 
+    def get_last_modified(self, request, *args, **kwargs):
+        # Topic and publisher names are shown too, renaming them changes the page.
+        times = Newspaper.objects.filter(pk=kwargs["pk"]).aggregate(
+            own=Max("updated_at"),
+            topics=Max("topics__updated_at"),
+            publishers=Max("publishers__updated_at"),
+        )
+        return max(filter(None, times.values()), default=None)
+
+    def get_object(self, queryset=None):
+        return archive.load(super(NewspaperDetailView, self).get_object(queryset))
+
+    def get_context_data(self, **kwargs):
+        context = super(NewspaperDetailView, self).get_context_data(**kwargs)
+        # Precomputed by catalog.related, one lookup on (newspaper, rank).
+        context["related_newspapers"] = [
+            neighbour.neighbour
+            for neighbour in self.object.neighbours.select_related("neighbour")
+            .only("neighbour__title", "neighbour__published_date")
+        ]
+        return context
+
 
 class NewspaperCreateView(LoginRequiredMixin, generic.CreateView):
     model = Newspaper
@@ -161,9 +386,48 @@ class NewspaperUpdateView(LoginRequiredMixin, generic.UpdateView):
     template_name = "catalog/newspaper_form.html"
     success_url = reverse_lazy("catalog:newspaper-list")
 
+    def get_object(self, queryset=None):
+        return archive.load(super(NewspaperUpdateView, self).get_object(queryset))
+
 
 class NewspaperDeleteView(LoginRequiredMixin, generic.DeleteView):
     model = Newspaper
     template_name = "catalog/newspaper_confirm_delete.html"
     success_url = reverse_lazy("catalog:newspaper-list")
-    
\ No newline at end of file
+
+
+class NewspaperRevisionListView(LoginRequiredMixin, generic.ListView):
+    model = NewspaperRevision
+    template_name = "catalog/newspaper_revision_list.html"
+    context_object_name = "revisions"
+    paginate_by = 15
+
+    def get_context_data(self, **kwargs):
+        context = super(NewspaperRevisionListView, self).get_context_data(**kwargs)
+        context["newspaper"] = self.newspaper
+        return context
+
+    def get_queryset(self):
+        self.newspaper = get_object_or_404(Newspaper.objects.only("title"), pk=self.kwargs["pk"])
+        return self.newspaper.revisions.defer("body").order_by("-number")
+
+
+class NewspaperRevisionDiffView(LoginRequiredMixin, generic.TemplateView):
+    template_name = "catalog/newspaper_revision_diff.html"
+
+    def get_context_data(self, **kwargs):
+        context = super(NewspaperRevisionDiffView, self).get_context_data(**kwargs)
+        newspaper = get_object_or_404(Newspaper.objects.only("title"), pk=self.kwargs["pk"])
+        numbers = set(newspaper.revisions.values_list("number", flat=True))
+        try:
+            to_number = int(self.request.GET.get("to", max(numbers, default=0)))
+            from_number = int(self.request.GET.get("from", to_number - 1))
+        except ValueError:
+            raise Http404("Invalid revision number.")
+        if from_number not in numbers or to_number not in numbers:
+            raise Http404("Revision not found.")
+        context["newspaper"] = newspaper
+        context["from_number"] = from_number
+        context["to_number"] = to_number
+        context["diff_lines"] = diff_revisions(newspaper.pk, from_number, to_number)
+        return context
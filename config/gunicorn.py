@@ -0,0 +1,70 @@
+"""
+Gunicorn configuration, used as ``gunicorn -c config/gunicorn.py``.
+
+GUNICORN_MODE picks the worker model, asgi by default:
+
+    sync     one request at a time per process; 2 * CPUs + 1 workers
+    gthread  GUNICORN_THREADS requests per process; CPUs + 1 workers
+    asgi     uvicorn workers serving config.asgi; CPUs + 1 workers, and
+             async views such as the event stream hold no thread while idle;
+             the WSGI modes answer the event stream with 204 instead
+
+WEB_CONCURRENCY overrides the worker count. The application is loaded once
+in the master and forked, so workers share its memory copy-on-write;
+``python manage.py loadtest`` compares the modes on the seeded dataset.
+"""
+
+import multiprocessing
+import os
+import shutil
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+MODES = ("sync", "gthread", "asgi")
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.prod")
+
+mode = os.environ.get("GUNICORN_MODE", "asgi")
+if mode not in MODES:
+    raise RuntimeError(f"GUNICORN_MODE must be one of {', '.join(MODES)}, not {mode!r}.")
+
+cpus = multiprocessing.cpu_count()
+workers = int(os.environ.get("WEB_CONCURRENCY", 2 * cpus + 1 if mode == "sync" else cpus + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 4)) if mode == "gthread" else 1
+worker_class = {"sync": "sync", "gthread": "gthread", "asgi": "uvicorn_worker.UvicornWorker"}[mode]
+wsgi_app = "config.asgi:application" if mode == "asgi" else "config.wsgi:application"
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+preload_app = True
+# Recycle workers now and then against slow leaks; the jitter keeps them
+# from all restarting at once.
+max_requests = 1000
+max_requests_jitter = 100
+timeout = 30
+graceful_timeout = 30
+keepalive = 5
+# Worker heartbeats on tmpfs, so a slow disk cannot get workers killed.
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG")
+errorlog = "-"
+
+# Metrics of all workers are summed up from mmap'ed files in this directory
+# (see catalog.metrics). It must be set before the application is loaded and
+# must not keep files of an earlier run.
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", str(BASE_DIR / "run" / "prometheus"))
+shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+os.makedirs(os.environ["PROMETHEUS_MULTIPROC_DIR"])
+
+
+def pre_fork(server, worker):
+    # Connections opened while preloading must not be inherited by workers.
+    from django.db import connections
+
+    connections.close_all()
+
+
+def child_exit(server, worker):
+    from catalog import metrics
+
+    metrics.mark_process_dead(worker.pid)
@@ -43,14 +43,19 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "catalog.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "catalog.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "catalog.ratelimit.RateLimitMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "catalog.profiling.TemplateProfilerMiddleware",
+    "catalog.request_profiling.RequestProfilerMiddleware",
 ]
 
 ROOT_URLCONF = "config.urls"
@@ -127,3 +132,168 @@ STATICFILES_DIRS = [
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+
+# Catalog
+
+# Longest chain of deltas between two full snapshots in the revision history
+CATALOG_REVISIONS_MAX_DELTAS = 10
+
+# Newspaper content of at least this many bytes is stored compressed
+CATALOG_COMPRESSION_THRESHOLD = 512
+
+# "zstd" when the zstandard package is installed, zlib otherwise
+CATALOG_COMPRESSION_CODEC = "zstd"
+
+# How post-write jobs run: "immediate" (after commit, in the request), "thread"
+# (in-process thread pool) or "db" (queued for `manage.py run_jobs` workers)
+CATALOG_JOBS_MODE = "immediate"
+CATALOG_JOBS_THREADS = 4
+CATALOG_JOBS_MAX_ATTEMPTS = 5
+# Seconds before the first retry of a failed job, doubled on every attempt
+CATALOG_JOBS_RETRY_DELAY = 10
+# Seconds failed jobs stay in the queue table for inspection; done jobs are
+# deleted as soon as they finish
+CATALOG_JOBS_FAILED_RETENTION = 60 * 60 * 24 * 7
+
+# Newspapers handled per statement by bulk list/admin actions
+CATALOG_BULK_BATCH_SIZE = 1000
+
+# Below this many rows paginators count exactly instead of using estimates
+CATALOG_EXACT_COUNT_THRESHOLD = 10000
+
+# Filtered paginated lists stop counting after this many rows
+CATALOG_COUNT_CAP = 10000
+
+# Deleted topics and redactors lose their newspaper links in batches of about
+# this many rows, each batch holding its locks at most this many seconds
+CATALOG_PURGE_BATCH_SIZE = 1000
+CATALOG_PURGE_MAX_LOCK_SECONDS = 1.0
+
+# Related newspapers shown on the detail page, scored by shared topics and
+# publishers with "jaccard" or "cosine" similarity. Newspapers are scored
+# CATALOG_RELATED_BATCH_SIZE at a time, lower it if refreshes use too much memory
+CATALOG_RELATED_COUNT = 6
+CATALOG_RELATED_METRIC = "jaccard"
+CATALOG_RELATED_BATCH_SIZE = 200
+
+# Days covered by the dashboard on the index page
+CATALOG_DASHBOARD_DAYS = 30
+
+# Content of newspapers older than this many days is moved to the archive
+# table (monthly partitions on PostgreSQL) by the archive_newspapers command
+CATALOG_ARCHIVE_AFTER_DAYS = 365
+CATALOG_ARCHIVE_BATCH_SIZE = 500
+
+# Server-sent events of catalog changes at /events/. The "local" backend only
+# reaches clients of the publishing process; with several workers use
+# "socket", which fans events out through unix sockets in
+# CATALOG_EVENTS_SOCKET_DIR. The stream is only served under ASGI, where idle
+# clients hold no thread; WSGI servers answer it with 204 and the list page
+# is then not live.
+CATALOG_EVENTS_BACKEND = "local"
+CATALOG_EVENTS_SOCKET_DIR = BASE_DIR / "run" / "events"
+CATALOG_EVENTS_HEARTBEAT = 15
+CATALOG_EVENTS_HISTORY = 200
+CATALOG_EVENTS_QUEUE_SIZE = 100
+
+# Syndication feeds keep their rendered XML in the cache until a newspaper
+# they list changes; the timeout only bounds how long unused feeds linger.
+# Feeds need a signed-in user unless CATALOG_FEEDS_PUBLIC is set
+CATALOG_FEEDS_PUBLIC = False
+CATALOG_FEED_ITEMS = 30
+CATALOG_FEED_CACHE_TIMEOUT = 60 * 60 * 24
+
+# NewspaperForm warns when the estimated Jaccard similarity of the content's
+# word shingles to an existing newspaper reaches this threshold
+CATALOG_DUPLICATE_THRESHOLD = 0.8
+CATALOG_DUPLICATE_BATCH_SIZE = 500
+
+# Prometheus metrics at /metrics. With a token, scrapers must send it as
+# "Authorization: Bearer <token>"; without one only staff sessions get the
+# metrics. Run gunicorn with PROMETHEUS_MULTIPROC_DIR
+# set to aggregate the workers' metrics
+CATALOG_METRICS = True
+CATALOG_METRICS_TOKEN = ""
+
+# Token buckets per URL name, refilled at (per minute, burst) for each
+# signed-in user and each client IP. "methods" and "params" restrict a rule
+# to those methods or to requests carrying one of those query parameters.
+# The "file" backend shares buckets between the workers of a host through
+# CATALOG_RATE_LIMIT_FILE; PROXY_COUNT is the number of reverse proxies
+# that append to X-Forwarded-For. The "local" backend keeps at most
+# LOCAL_SIZE buckets per process
+CATALOG_RATE_LIMITING = True
+CATALOG_RATE_LIMIT_BACKEND = "local"
+CATALOG_RATE_LIMIT_LOCAL_SIZE = 10000
+CATALOG_RATE_LIMIT_FILE = BASE_DIR / "run" / "ratelimit.bin"
+CATALOG_RATE_LIMIT_PROXY_COUNT = 0
+write_limit = {"methods": ["POST"], "user": (30, 10), "ip": (60, 20)}
+CATALOG_RATE_LIMITS = {
+    "catalog:newspaper-list": {"params": ["title"], "user": (60, 20), "ip": (240, 60)},
+    "catalog:topic-list": {"params": ["name"], "user": (60, 20), "ip": (240, 60)},
+    "catalog:redactor-list": {"params": ["username"], "user": (60, 20), "ip": (240, 60)},
+    "catalog:search": {"user": (60, 20), "ip": (240, 60)},
+    "catalog:newspaper-create": write_limit,
+    "catalog:newspaper-update": write_limit,
+    "catalog:newspaper-delete": write_limit,
+    "catalog:newspaper-bulk": write_limit,
+    "catalog:topic-create": write_limit,
+    "catalog:topic-update": write_limit,
+    "catalog:topic-delete": write_limit,
+    "catalog:redactor-create": write_limit,
+    "catalog:redactor-update": write_limit,
+    "catalog:redactor-delete": write_limit,
+}
+
+# Request profiles: staff add ?_profile to a URL, other clients send a
+# token from the /debug/profiles/ page in the X-Catalog-Profile header, and
+# this fraction of all other requests is sampled. Stacks are sampled every
+# INTERVAL seconds; stored profiles beyond MAX_FILES or older than MAX_AGE
+# seconds are dropped
+CATALOG_REQUEST_PROFILING_SAMPLE_RATE = 0.0
+CATALOG_REQUEST_PROFILING_INTERVAL = 0.002
+CATALOG_REQUEST_PROFILING_DIR = BASE_DIR / "run" / "profiles"
+CATALOG_REQUEST_PROFILING_MAX_FILES = 200
+CATALOG_REQUEST_PROFILING_MAX_AGE = 7 * 24 * 60 * 60
+CATALOG_REQUEST_PROFILING_TOKEN_MAX_AGE = 60 * 60
+
+# Response compression (brotli when the brotli package is installed, gzip
+# otherwise). Options can be overridden per namespaced URL name, False
+# turns compression off for that view
+CATALOG_RESPONSE_COMPRESSION = {"min_length": 200, "gzip_level": 6, "brotli_quality": 4}
+CATALOG_RESPONSE_COMPRESSION_VIEWS = {}
+
+# Record render time per template, block, include and tag of every request,
+# reported to staff at /debug/templates/. Adds overhead, keep it off in production
+CATALOG_TEMPLATE_PROFILING = False
+
+# The header search queries newspapers, topics and redactors in parallel,
+# SEARCH_CONCURRENCY searches at a time per process with a pool thread for
+# each of their sources; sources slower than SEARCH_TIMEOUT seconds are left
+# out of the SEARCH_RESULTS merged results
+CATALOG_SEARCH_TIMEOUT = 0.5
+CATALOG_SEARCH_CONCURRENCY = 2
+CATALOG_SEARCH_RESULTS = 10
+
+# Cached pages and search lists are computed by one caller at a time of all
+# the processes sharing the cache: the others get the previous value while
+# it is refreshed, and only wait up to SINGLE_FLIGHT_WAIT seconds for the
+# result when there is none. The index figures are fresh for
+# INDEX_CACHE_TIMEOUT seconds and then served stale for up to
+# INDEX_CACHE_STALE more while a pool thread recomputes them; any catalog
+# write has the next request recompute them
+CATALOG_SINGLE_FLIGHT_WAIT = 5
+CATALOG_SINGLE_FLIGHT_LOCK_TIMEOUT = 30
+CATALOG_SINGLE_FLIGHT_THREADS = 2
+CATALOG_INDEX_CACHE_TIMEOUT = 60
+CATALOG_INDEX_CACHE_STALE = 60 * 10
+
+# Newspaper list searches keep the ordered ids of up to MAX_IDS results per
+# normalized title query in the cache, for the SIZE most recently used
+# queries. Newspaper writes drop the lists of the queries found in their old
+# and new titles; the timeout bounds what a write racing a cache fill can
+# leave behind
+CATALOG_SEARCH_CACHE_SIZE = 200
+CATALOG_SEARCH_CACHE_MAX_IDS = 5000
+CATALOG_SEARCH_CACHE_TIMEOUT = 60 * 10
@@ -16,3 +16,8 @@ DATABASES = {
         "NAME": BASE_DIR / "db.sqlite3",
     }
 }
+
+CATALOG_JOBS_MODE = "thread"
+
+# The test suite and local clicking around come from one client in bursts.
+CATALOG_RATE_LIMITING = False
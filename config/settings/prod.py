@@ -26,5 +26,31 @@ DATABASES = {
         "OPTIONS": {
             "sslmode": "require",
         },
+        # Request and search pool threads keep their connections instead of
+        # opening one per request or search source.
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
+
+# Gunicorn workers must share the cache: the feed, search and index caches
+# are invalidated on writes, and single-flight locks only coalesce requests
+# of the processes that see them. Create the table with createcachetable.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+        "LOCATION": "catalog_cache",
+        "OPTIONS": {"MAX_ENTRIES": 20000},
+    }
+}
+
+CATALOG_JOBS_MODE = "db"
+
+# Events published by one gunicorn worker reach the clients of all of them.
+CATALOG_EVENTS_BACKEND = "socket"
+
+CATALOG_METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Gunicorn workers share the buckets; Render's proxy sets X-Forwarded-For.
+CATALOG_RATE_LIMIT_BACKEND = "file"
+CATALOG_RATE_LIMIT_PROXY_COUNT = 1
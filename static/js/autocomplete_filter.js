@@ -0,0 +1,15 @@
+'use strict';
+{
+    const $ = django.jQuery;
+
+    $(function() {
+        $('.autocomplete-filter select').on('change', function() {
+            const base = $(this).closest('ul').find('a[data-base-query]').data('base-query') || '?';
+            const params = new URLSearchParams(base.replace(/^\?/, ''));
+            if (this.value) {
+                params.set(this.dataset.lookupKwarg, this.value);
+            }
+            window.location.search = params.toString();
+        });
+    });
+}
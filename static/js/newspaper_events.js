@@ -0,0 +1,58 @@
+'use strict';
+{
+    // Patches the first page of the newspaper list from the catalog event
+    // stream instead of reloading it.
+    const cards = document.getElementById('newspaper-cards');
+
+    function parse(html) {
+        const template = document.createElement('template');
+        template.innerHTML = html.trim();
+        return template.content.firstElementChild;
+    }
+
+    function find(pk) {
+        return cards.querySelector(`[data-newspaper="${pk}"]`);
+    }
+
+    function showStale(count) {
+        let notice = document.getElementById('newspaper-cards-stale');
+        if (!notice) {
+            notice = document.createElement('div');
+            notice.id = 'newspaper-cards-stale';
+            notice.className = 'alert alert-info mx-2 mb-0';
+            cards.before(notice);
+        }
+        notice.dataset.count = Number(notice.dataset.count || 0) + count;
+        notice.innerHTML = `${notice.dataset.count} newspapers changed. <a href="">Reload</a>`;
+    }
+
+    function apply(event) {
+        if (event.action === 'deleted') {
+            event.pks.forEach((pk) => find(pk)?.remove());
+        } else if (event.action === 'changed') {
+            const shown = event.pks.filter((pk) => find(pk));
+            if (shown.length) {
+                showStale(shown.length);
+            }
+        } else if (event.html) {
+            const card = parse(event.html);
+            const current = find(event.pk);
+            if (current) {
+                current.replaceWith(card);
+            } else if (event.action === 'created') {
+                cards.querySelector(':scope > p')?.remove();
+                cards.prepend(card);
+                // Keep the page size of the first page.
+                const all = cards.querySelectorAll('[data-newspaper]');
+                if (all.length > Number(cards.dataset.pageSize)) {
+                    all[all.length - 1].remove();
+                }
+            }
+        }
+    }
+
+    if (cards && cards.dataset.live && window.EventSource) {
+        const source = new EventSource(cards.dataset.eventsUrl);
+        source.addEventListener('newspaper', (message) => apply(JSON.parse(message.data)));
+    }
+}